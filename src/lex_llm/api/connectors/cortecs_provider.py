@@ -10,7 +10,7 @@ from typing import AsyncGenerator, List
 
 from openai import AsyncOpenAI
 
-from .llm_provider import LLMProvider
+from .llm_provider import LLMProvider, close_completion_stream
 from ..event_models import ConversationMessage
 
 
@@ -55,10 +55,13 @@ class CortecsProvider(LLMProvider):
                 "reasoning_effort": self.reasoning_effort,
             },
         )
-        async for chunk in stream:  # type: ignore[union-attr]
-            content = chunk.choices[0].delta.content
-            if content:
-                yield content
+        try:
+            async for chunk in stream:  # type: ignore[union-attr]
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        finally:
+            await close_completion_stream(stream)
 
     async def generate(self, messages: List[ConversationMessage]) -> str:
         """Generates a response as a single text chunk."""
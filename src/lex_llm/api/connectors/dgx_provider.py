@@ -5,7 +5,7 @@ import os
 from typing import AsyncGenerator, List
 import litellm
 from ..event_models import ConversationMessage
-from .llm_provider import LLMProvider
+from .llm_provider import LLMProvider, close_completion_stream
 
 logger = logging.getLogger(__name__)
 
@@ -71,10 +71,13 @@ class DGXProvider(LLMProvider):
             custom_llm_provider="openai",
             extra_headers=extra_headers,
         )
-        async for chunk in stream:  # type: ignore
-            content = chunk.choices[0].delta.content
-            if content:
-                yield content
+        try:
+            async for chunk in stream:  # type: ignore
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        finally:
+            await close_completion_stream(stream)
 
     async def generate(self, messages: List[ConversationMessage]) -> str:
         out = ""
@@ -0,0 +1,123 @@
+"""In-process TTL/LRU cache of full article records fetched from LexDB.
+
+Search results only carry the chunks that happened to match, so source
+lists, ``used_sources`` and history rewriting sometimes lack a title or URL,
+and never have an article's full text. ``LexDBConnector.get_articles``
+hydrates article ids through ``/api/articles`` and keeps the records here.
+
+Articles change far less often than search rankings, so entries live for an
+hour by default. Ids LexDB did not return are cached as missing for a
+shorter time (negative caching), so a deleted article is not looked up again
+on every run.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .lex_db_connector import LexArticle
+
+
+class ArticleCache:
+    """Bounded, TTL-evicted LRU cache of articles by id.
+
+    Parameters
+    ----------
+    ttl:
+        Seconds a fetched article stays valid. Defaults to
+        ``LEXDB_ARTICLE_CACHE_TTL`` or 3600.
+    negative_ttl:
+        Seconds an id LexDB did not return is remembered as missing.
+        Defaults to ``LEXDB_ARTICLE_CACHE_NEGATIVE_TTL`` or 60.
+    max_entries:
+        Cap on cached ids (found or missing); least recently used entries
+        are evicted beyond it. Defaults to ``LEXDB_ARTICLE_CACHE_MAX`` or
+        10 000.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        negative_ttl: float | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self.ttl = (
+            ttl
+            if ttl is not None
+            else float(os.getenv("LEXDB_ARTICLE_CACHE_TTL", "3600"))
+        )
+        self.negative_ttl = (
+            negative_ttl
+            if negative_ttl is not None
+            else float(os.getenv("LEXDB_ARTICLE_CACHE_NEGATIVE_TTL", "60"))
+        )
+        self.max_entries = (
+            max_entries
+            if max_entries is not None
+            else int(os.getenv("LEXDB_ARTICLE_CACHE_MAX", "10000"))
+        )
+        # id -> (article or None when missing, expires_at)
+        self._entries: OrderedDict[int, tuple[LexArticle | None, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, article_id: int) -> bool:
+        entry = self._entries.get(article_id)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, article_id: int) -> LexArticle | None:
+        """Return the cached article, or ``None`` if missing or not cached.
+
+        Use ``in`` to tell a cached-as-missing id from a cache miss.
+        """
+        entry = self._entries.get(article_id)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[article_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(article_id)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, article: LexArticle) -> None:
+        """Store a fetched article."""
+        self._store(article.id, article, self.ttl)
+
+    def put_missing(self, article_id: int) -> None:
+        """Remember that LexDB has no article with ``article_id``."""
+        if self.negative_ttl > 0:
+            self._store(article_id, None, self.negative_ttl)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def _store(self, article_id: int, article: LexArticle | None, ttl: float) -> None:
+        self._entries.pop(article_id, None)
+        self._entries[article_id] = (article, time.monotonic() + ttl)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Module-level singleton shared by all LexDBConnector instances
+_cache: ArticleCache | None = None
+
+
+def get_article_cache() -> ArticleCache | None:
+    """Return the shared cache, or ``None`` when disabled (``LEXDB_ARTICLE_CACHE_TTL=0``)."""
+    global _cache
+    if _cache is None:
+        cache = ArticleCache()
+        if cache.ttl <= 0 or cache.max_entries <= 0:
+            return None
+        _cache = cache
+    return _cache
@@ -0,0 +1,185 @@
+"""Cross-request micro-batching of LexDB batch searches.
+
+Each run only batches its own handful of queries, so at high request rates
+LexDB embeds many tiny batches. :class:`MicroBatcher` collects the queries
+that concurrent runs send to the same batch endpoint for a short window (or
+until a size cap), sends them as one request, and hands each caller back
+the per-query results for its own queries.
+
+Callers may ask for different ``top_k``; the combined request uses the
+largest and each caller's results are cut to its own ``top_k``. That is exact
+because a ranking for a larger ``top_k`` starts with the smaller one.
+
+The combined request belongs to no single caller, so it is sent from an
+empty context: no caller's run deadline or step telemetry applies to it.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from ..observability.step_telemetry import increment_step_counter
+from .lex_db_chunk_batch import ChunkBatch
+
+_LOGGER = logging.getLogger(__name__)
+
+Q = TypeVar("Q", bound=Hashable)
+
+# send(queries, top_k) -> one ranked result batch per query
+SendBatch = Callable[[list[Q], int], Awaitable[list[ChunkBatch]]]
+
+
+def _consume_exception(future: "asyncio.Future[Any]") -> None:
+    # The caller may have been cancelled before the batch failed
+    if not future.cancelled():
+        future.exception()
+
+
+@dataclass
+class _Pending(Generic[Q]):
+    queries: list[Q]
+    top_k: int
+    future: "asyncio.Future[list[ChunkBatch]]"
+
+
+@dataclass
+class _Group(Generic[Q]):
+    send: SendBatch[Q]
+    pending: list[_Pending[Q]] = field(default_factory=list)
+    size: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class MicroBatcher:
+    """Coalesces concurrent batch searches per endpoint into one request.
+
+    Parameters
+    ----------
+    window:
+        Seconds to wait for more queries after the first one arrives.
+        Defaults to ``LEXDB_BATCH_WINDOW_MS`` / 1000.
+    max_queries:
+        Send as soon as this many queries are collected.
+        Defaults to ``LEXDB_BATCH_MAX_QUERIES`` or 64.
+    """
+
+    def __init__(
+        self, window: float | None = None, max_queries: int | None = None
+    ) -> None:
+        self.window = (
+            window
+            if window is not None
+            else float(os.getenv("LEXDB_BATCH_WINDOW_MS", "0")) / 1000
+        )
+        self.max_queries = (
+            max_queries
+            if max_queries is not None
+            else int(os.getenv("LEXDB_BATCH_MAX_QUERIES", "64"))
+        )
+        self._groups: dict[Hashable, _Group[Any]] = {}
+        # Strong references so in-flight batches are not garbage collected
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.batches = 0
+        self.queries = 0
+
+    async def submit(
+        self,
+        group_key: Hashable,
+        queries: list[Q],
+        top_k: int,
+        send: SendBatch[Q],
+    ) -> list[ChunkBatch]:
+        """Queue ``queries`` for the batch identified by ``group_key``.
+
+        ``send`` must be equivalent for every caller of the same
+        ``group_key`` (the first caller's is used). Returns one result batch
+        per query, each at most ``top_k`` rows long. ``send``'s exception is
+        raised to every caller in the batch.
+        """
+        loop = asyncio.get_running_loop()
+        group = self._groups.get(group_key)
+        if group is None:
+            group = _Group(send=send)
+            self._groups[group_key] = group
+            group.timer = loop.call_later(
+                self.window, self._flush, group_key, context=contextvars.Context()
+            )
+
+        future: asyncio.Future[list[ChunkBatch]] = loop.create_future()
+        future.add_done_callback(_consume_exception)
+        group.pending.append(_Pending(queries, top_k, future))
+        group.size += len(queries)
+        if group.size >= self.max_queries:
+            self._flush(group_key)
+
+        results = await future
+        increment_step_counter("lexdb_batcher", "queries", len(queries))
+        return results
+
+    def _flush(self, group_key: Hashable) -> None:
+        group = self._groups.pop(group_key, None)
+        if group is None:
+            return
+        if group.timer is not None:
+            group.timer.cancel()
+        # Also reached from submit() at the size cap, in that caller's context
+        task = contextvars.Context().run(asyncio.ensure_future, self._send(group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, group: _Group[Q]) -> None:
+        # Deduplicate across callers; identical queries are embedded once
+        positions: dict[Q, int] = {}
+        for item in group.pending:
+            for query in item.queries:
+                positions.setdefault(query, len(positions))
+        queries = list(positions)
+        top_k = max(item.top_k for item in group.pending)
+        self.batches += 1
+        self.queries += len(queries)
+        _LOGGER.debug(
+            "LexDB micro-batch: %d queries from %d callers",
+            len(queries),
+            len(group.pending),
+        )
+
+        try:
+            results = await group.send(queries, top_k)
+            if len(results) != len(queries):
+                raise ValueError(
+                    f"Expected {len(queries)} result lists, got {len(results)}"
+                )
+        except Exception as exc:
+            for item in group.pending:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+        except asyncio.CancelledError:
+            for item in group.pending:
+                item.future.cancel()
+            raise
+
+        for item in group.pending:
+            if not item.future.done():
+                item.future.set_result(
+                    [results[positions[q]][: item.top_k] for q in item.queries]
+                )
+
+
+# Module-level singleton shared by all LexDBConnector instances
+_batcher: MicroBatcher | None = None
+
+
+def get_micro_batcher() -> MicroBatcher | None:
+    """Return the shared batcher, or ``None`` unless ``LEXDB_BATCH_WINDOW_MS`` > 0."""
+    global _batcher
+    if _batcher is None:
+        batcher = MicroBatcher()
+        if batcher.window <= 0:
+            return None
+        _batcher = batcher
+    return _batcher
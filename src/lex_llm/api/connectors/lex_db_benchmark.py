@@ -0,0 +1,332 @@
+"""Latency benchmark for LexDB, measured from our side of the network.
+
+Replays a query file against every combination of endpoint, index, batch
+size and ``top_k`` at a fixed concurrency and reports throughput and
+p50/p95/p99 latency per combination. Requests go straight through a
+:class:`LexDBTransport`, bypassing the connector's cache, single-flight,
+hedging and circuit breakers, so the numbers are LexDB's own (plus the
+network). Point ``--host`` at a local stand-in to benchmark without a
+production LexDB.
+
+Usage::
+
+    python -m lex_llm.api.connectors.lex_db_benchmark queries.txt \\
+        --index article_embeddings_e5 --endpoint vector-batch --endpoint text-batch \\
+        --batch-size 1 --batch-size 8 --top-k 20 --top-k 50 --concurrency 8
+
+The query file holds one query per line (``.jsonl``: one object with a
+``query`` field per line).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Any
+
+import httpx
+
+from lex_db_api.models.batch_fulltext_search_request import BatchFulltextSearchRequest
+from lex_db_api.models.batch_vector_search_request import BatchVectorSearchRequest
+from lex_db_api.models.benchmark_embeddings_request import BenchmarkEmbeddingsRequest
+from lex_db_api.models.hybrid_search_request import HybridSearchRequest
+from lex_db_api.models.text_type import TextType
+from lex_db_api.models.vector_search_request import VectorSearchRequest
+
+from .lex_db_connector import _index_path
+from .lex_db_transport import LexDBTransport
+
+# Endpoints that take one query per request; batch sizes do not apply
+SINGLE_QUERY_ENDPOINTS = ("vector", "hybrid", "hyde")
+# Endpoints that take a list of queries per request
+BATCH_ENDPOINTS = ("vector-batch", "text-batch")
+# Server-side embedding benchmark; the batch size is its ``num_texts``
+EMBEDDINGS_ENDPOINT = "embeddings"
+ENDPOINTS = (*SINGLE_QUERY_ENDPOINTS, *BATCH_ENDPOINTS, EMBEDDINGS_ENDPOINT)
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One cell of the benchmark grid."""
+
+    endpoint: str
+    index: str | None
+    batch_size: int
+    top_k: int | None
+
+
+@dataclass
+class BenchmarkResult:
+    """Latencies (seconds) and errors measured for one :class:`BenchmarkCase`."""
+
+    case: BenchmarkCase
+    wall_seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    results: int = 0
+    errors: int = 0
+
+    def summary(self) -> dict[str, Any]:
+        """Throughput and latency percentiles (ms) as a flat dict."""
+        requests = len(self.latencies)
+        wall = self.wall_seconds or float("inf")
+        return {
+            "endpoint": self.case.endpoint,
+            "index": self.case.index,
+            "batch_size": self.case.batch_size,
+            "top_k": self.case.top_k,
+            "requests": requests,
+            "errors": self.errors,
+            "requests_per_s": round(requests / wall, 2),
+            "queries_per_s": round(requests * self.case.batch_size / wall, 2),
+            "avg_results": round(self.results / requests, 1) if requests else 0.0,
+            "p50_ms": _percentile_ms(self.latencies, 50),
+            "p95_ms": _percentile_ms(self.latencies, 95),
+            "p99_ms": _percentile_ms(self.latencies, 99),
+        }
+
+
+def _percentile_ms(latencies: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile in milliseconds, or ``None`` without samples."""
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[rank] * 1000, 2)
+
+
+def load_queries(path: str | os.PathLike[str]) -> list[str]:
+    """Read a query file: one query per line, or ``.jsonl`` with ``query`` fields."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if os.fspath(path).endswith(".jsonl"):
+        return [json.loads(line)["query"] for line in lines]
+    return lines
+
+
+def build_cases(
+    endpoints: Iterable[str],
+    indexes: Iterable[str],
+    batch_sizes: Iterable[int],
+    top_ks: Iterable[int],
+) -> list[BenchmarkCase]:
+    """Expand the benchmark grid, skipping dimensions an endpoint ignores."""
+    indexes, batch_sizes, top_ks = list(indexes), list(batch_sizes), list(top_ks)
+    cases: list[BenchmarkCase] = []
+    for endpoint in dict.fromkeys(endpoints):
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {endpoint!r}; choose from {ENDPOINTS}")
+        if endpoint == EMBEDDINGS_ENDPOINT:
+            cases += [BenchmarkCase(endpoint, None, n, None) for n in batch_sizes]
+            continue
+        sizes = [1] if endpoint in SINGLE_QUERY_ENDPOINTS else batch_sizes
+        cases += [
+            BenchmarkCase(endpoint, index, size, top_k)
+            for index, size, top_k in product(indexes, sizes, top_ks)
+        ]
+    return cases
+
+
+def _request(case: BenchmarkCase, queries: list[str]) -> tuple[str, dict[str, Any]]:
+    """Path and JSON body for one request of ``case``."""
+    index = case.index or ""
+    top_k = case.top_k or 10
+    if case.endpoint == "vector":
+        body = VectorSearchRequest(query_text=queries[0], top_k=top_k)
+        return _index_path("vector-search", index, "query"), body.to_dict()
+    if case.endpoint == "hyde":
+        body = VectorSearchRequest(query_text=queries[0], top_k=top_k)
+        return _index_path("hyde-search", index, "query"), body.to_dict()
+    if case.endpoint == "hybrid":
+        hybrid = HybridSearchRequest(
+            query_text=queries[0],
+            top_k=top_k,
+            top_k_semantic=top_k,
+            top_k_fts=top_k,
+        )
+        return _index_path("hybrid-search", index, "query"), hybrid.to_dict()
+    if case.endpoint == "vector-batch":
+        batch = BatchVectorSearchRequest(
+            queries=[[q, TextType.QUERY.value] for q in queries], top_k=top_k
+        )
+        return _index_path("vector-search", index, "batch"), batch.to_dict()
+    if case.endpoint == "text-batch":
+        fts = BatchFulltextSearchRequest(queries=queries, top_k=top_k)
+        return _index_path("text-search", index, "batch"), fts.to_dict()
+    embeddings = BenchmarkEmbeddingsRequest(num_texts=case.batch_size)
+    return "/api/benchmark/embeddings", embeddings.to_dict()
+
+
+def _count_results(body: Any) -> int:
+    """Result rows in a search response (nested per query for batch endpoints)."""
+    if isinstance(body, dict):
+        return len(body.get("results") or [])
+    if isinstance(body, list):
+        return sum(
+            len(item) if isinstance(item, list) else _count_results(item)
+            for item in body
+        )
+    return 0
+
+
+async def run_case(
+    transport: LexDBTransport,
+    case: BenchmarkCase,
+    queries: list[str],
+    concurrency: int = 1,
+    timeout: float | None = None,
+) -> BenchmarkResult:
+    """Send every query of ``queries`` once for ``case`` and time each request.
+
+    Queries are grouped into requests of ``case.batch_size``, and up to
+    ``concurrency`` requests are in flight at a time. The embeddings endpoint
+    ignores the query text but still gets one request per query, so its
+    percentiles have as many samples as the other endpoints'. Failed
+    requests count as errors and are left out of the latency percentiles.
+    """
+    size = case.batch_size if case.endpoint in BATCH_ENDPOINTS else 1
+    if case.endpoint == EMBEDDINGS_ENDPOINT:
+        requests = [_request(case, [])] * len(queries)
+    else:
+        requests = [
+            _request(case, queries[i : i + size]) for i in range(0, len(queries), size)
+        ]
+    result = BenchmarkResult(case)
+    pending = iter(requests)
+
+    async def _worker() -> None:
+        for path, body in pending:
+            t_start = time.perf_counter()
+            try:
+                response = await transport.post_json(path, body, timeout=timeout)
+            except httpx.HTTPError:
+                result.errors += 1
+                continue
+            result.latencies.append(time.perf_counter() - t_start)
+            result.results += _count_results(response)
+
+    t_start = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(max(1, concurrency))))
+    result.wall_seconds = time.perf_counter() - t_start
+    return result
+
+
+async def run_benchmark(
+    transport: LexDBTransport,
+    cases: list[BenchmarkCase],
+    queries: list[str],
+    concurrency: int = 1,
+    rounds: int = 1,
+    warmup: int = 0,
+    timeout: float | None = None,
+) -> list[BenchmarkResult]:
+    """Run every case in turn, replaying ``queries`` ``rounds`` times.
+
+    The first ``warmup`` queries are sent once per case beforehand and not
+    measured (to fill connection pools and server-side caches fairly).
+    """
+    results: list[BenchmarkResult] = []
+    for case in cases:
+        if warmup:
+            await run_case(transport, case, queries[:warmup], concurrency, timeout)
+        results.append(
+            await run_case(transport, case, queries * rounds, concurrency, timeout)
+        )
+    return results
+
+
+def format_report(results: list[BenchmarkResult]) -> str:
+    """Render results as a fixed-width table."""
+    columns = [
+        ("endpoint", 13),
+        ("index", 24),
+        ("batch_size", 6),
+        ("top_k", 6),
+        ("requests", 8),
+        ("errors", 6),
+        ("requests_per_s", 9),
+        ("queries_per_s", 9),
+        ("avg_results", 8),
+        ("p50_ms", 9),
+        ("p95_ms", 9),
+        ("p99_ms", 9),
+    ]
+    headers = {
+        "batch_size": "batch",
+        "requests": "reqs",
+        "requests_per_s": "req/s",
+        "queries_per_s": "q/s",
+        "avg_results": "results",
+    }
+    lines = [" ".join(headers.get(name, name).rjust(w) for name, w in columns)]
+    for result in results:
+        row = result.summary()
+        lines.append(
+            " ".join(
+                ("-" if row[name] is None else str(row[name])).rjust(w)
+                for name, w in columns
+            )
+        )
+    return "\n".join(lines)
+
+
+async def _main(args: argparse.Namespace) -> list[BenchmarkResult]:
+    queries = load_queries(args.queries)
+    if args.limit:
+        queries = queries[: args.limit]
+    cases = build_cases(
+        args.endpoint or ["vector-batch", "text-batch"],
+        args.index or ["article_embeddings_e5"],
+        args.batch_size or [1],
+        args.top_k or [50],
+    )
+    transport = LexDBTransport(args.host, max_connections=max(args.concurrency, 1))
+    try:
+        return await run_benchmark(
+            transport,
+            cases,
+            queries,
+            concurrency=args.concurrency,
+            rounds=args.rounds,
+            warmup=args.warmup,
+            timeout=args.timeout,
+        )
+    finally:
+        await transport.aclose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("queries", help="Query file (.txt or .jsonl)")
+    parser.add_argument("--host", help="LexDB base URL (defaults to DB_HOST)")
+    parser.add_argument("--index", action="append", help="Index (repeatable)")
+    parser.add_argument(
+        "--endpoint", action="append", choices=ENDPOINTS, help="Endpoint (repeatable)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, action="append", help="Batch size (repeatable)"
+    )
+    parser.add_argument("--top-k", type=int, action="append", help="top_k (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=1, help="Replays per case")
+    parser.add_argument("--warmup", type=int, default=0, help="Unmeasured queries")
+    parser.add_argument("--limit", type=int, help="Use only the first N queries")
+    parser.add_argument("--timeout", type=float, help="Per-request timeout (s)")
+    parser.add_argument("--json", action="store_true", help="Print JSON lines")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_main(args))
+    if args.json:
+        for result in results:
+            print(json.dumps(result.summary()))
+    else:
+        print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
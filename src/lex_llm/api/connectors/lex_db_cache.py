@@ -0,0 +1,185 @@
+"""In-process TTL/LRU cache for per-query LexDB search results.
+
+Popular questions hit LexDB with the same ``(index, query, text type, top_k)``
+over and over. The cache sits under ``LexDBConnector.batch_vector_search``
+and ``batch_fulltext_search`` and stores each query's ranked chunk list
+independently (as a columnar :class:`ChunkBatch`), so a batch can be
+answered partly from cache and partly from LexDB.
+
+A cached result for ``top_k=50`` also answers any request with
+``top_k <= 50`` (the ranking is a prefix of the larger one), and a result
+that came back shorter than its ``top_k`` is complete and answers any
+``top_k``.
+
+The per-query batches of one LexDB response share a :class:`StringTable`,
+which counts against ``max_bytes`` once, while any entry still uses it.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .lex_db_chunk_batch import ChunkBatch, StringTable
+
+# (index_name, text_type, query) — text_type is the TextType value for vector
+# search or "fulltext" for FTS, so the two never share entries.
+CacheKey = tuple[str, str, str]
+
+
+@dataclass
+class _Entry:
+    top_k: int
+    chunks: ChunkBatch
+    expires_at: float
+    nbytes: int
+
+    def covers(self, top_k: int) -> bool:
+        # A short result list means LexDB ran out of matches — it is complete.
+        return self.top_k >= top_k or len(self.chunks) < self.top_k
+
+
+@dataclass
+class _SharedStrings:
+    table: StringTable
+    nbytes: int
+    entries: int = 0
+
+
+class RetrievalCache:
+    """Bounded, TTL-evicted LRU cache of ranked chunk batches.
+
+    Parameters
+    ----------
+    ttl:
+        Seconds an entry stays valid. Defaults to ``LEXDB_CACHE_TTL`` or 300.
+    max_bytes:
+        Approximate memory budget for cached chunks; least recently used
+        entries are evicted beyond it. Defaults to ``LEXDB_CACHE_MAX_MB``
+        (64 MB).
+    max_entries:
+        Hard cap on the number of cached queries.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        max_entries: int = 20_000,
+    ) -> None:
+        self.ttl = (
+            ttl if ttl is not None else float(os.getenv("LEXDB_CACHE_TTL", "300"))
+        )
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else int(float(os.getenv("LEXDB_CACHE_MAX_MB", "64")) * 1024 * 1024)
+        )
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        # id(StringTable) -> the table, charged once for all entries using it
+        self._strings: dict[int, _SharedStrings] = {}
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by cached chunks."""
+        return self._nbytes
+
+    def get(self, key: CacheKey, top_k: int) -> ChunkBatch | None:
+        """Return the top ``top_k`` chunks for ``key``, or ``None`` on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None or not entry.covers(top_k):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.chunks[:top_k]
+
+    def put(self, key: CacheKey, top_k: int, chunks: ChunkBatch) -> None:
+        """Store the ranked ``chunks`` LexDB returned for ``key`` at ``top_k``.
+
+        A live entry fetched with a larger ``top_k`` is kept, since it already
+        answers this request.
+        """
+        now = time.monotonic()
+        existing = self._entries.get(key)
+        if existing is not None:
+            if existing.expires_at > now and existing.top_k > top_k:
+                return
+            self._remove(key)
+
+        entry = _Entry(
+            top_k=top_k,
+            chunks=chunks,
+            expires_at=now + self.ttl,
+            nbytes=chunks.column_nbytes,
+        )
+        shared = self._strings.get(id(chunks.strings))
+        if shared is None:
+            if chunks.nbytes > self.max_bytes:
+                return
+            shared = _SharedStrings(chunks.strings, chunks.strings.nbytes)
+            self._strings[id(chunks.strings)] = shared
+            self._nbytes += shared.nbytes
+        elif entry.nbytes > self.max_bytes:
+            return
+        shared.entries += 1
+        self._entries[key] = entry
+        self._nbytes += entry.nbytes
+        while self._entries and (
+            self._nbytes > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, index_name: str | None = None) -> None:
+        """Drop all entries, or only those for ``index_name``."""
+        if index_name is None:
+            self._entries.clear()
+            self._strings.clear()
+            self._nbytes = 0
+            return
+        for key in [k for k in self._entries if k[0] == index_name]:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        self.invalidate()
+        self.hits = self.misses = self.evictions = 0
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._nbytes -= entry.nbytes
+        shared = self._strings[id(entry.chunks.strings)]
+        shared.entries -= 1
+        if not shared.entries:
+            del self._strings[id(entry.chunks.strings)]
+            self._nbytes -= shared.nbytes
+
+
+# Module-level singleton shared by all LexDBConnector instances
+_cache: RetrievalCache | None = None
+
+
+def get_retrieval_cache() -> RetrievalCache | None:
+    """Return the shared cache, or ``None`` when disabled (``LEXDB_CACHE_TTL=0``)."""
+    global _cache
+    if _cache is None:
+        cache = RetrievalCache()
+        if cache.ttl <= 0 or cache.max_bytes <= 0:
+            return None
+        _cache = cache
+    return _cache
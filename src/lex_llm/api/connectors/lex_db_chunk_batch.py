@@ -0,0 +1,349 @@
+"""Columnar storage for ranked LexDB search results.
+
+A hybrid search can return a few hundred chunks per query, and building a
+pydantic ``LexChunk`` for each one (then walking them again in fusion,
+result building and grouping) dominates the retrieval hot path.
+:class:`ChunkBatch` keeps a ranked list of chunks column-wise instead:
+article ids and chunk sequence numbers in integer arrays, and titles and
+URLs as indexes into a :class:`StringTable` shared by every batch parsed
+from the same response (an article's title is stored once, however many of
+its chunks match). ``LexChunk`` objects are only built for the rows a caller
+actually reads, and are memoised per batch.
+
+Batches are treated as immutable once built; slicing and fusion return new
+batches that share string tables where possible. Fused batches also carry
+each row's fused score in :attr:`ChunkBatch.scores`.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any, overload
+
+if TYPE_CHECKING:
+    from .lex_db_connector import LexArticle, LexChunk
+
+# Row index meaning "no string" in the title/url columns
+_NONE = -1
+
+# chunk_seq occupies the low bits of a packed (article_id, chunk_seq) key
+_SEQ_BITS = 32
+
+
+def pack_key(article_id: int, chunk_seq: int) -> int:
+    """Pack ``(article_id, chunk_seq)`` into one int, e.g. for RRF lookups."""
+    return (article_id << _SEQ_BITS) | chunk_seq
+
+
+def unpack_key(key: int) -> tuple[int, int]:
+    """Inverse of :func:`pack_key`."""
+    return key >> _SEQ_BITS, key & ((1 << _SEQ_BITS) - 1)
+
+
+class StringTable:
+    """Append-only interned string storage shared by related batches."""
+
+    __slots__ = ("_strings", "_index")
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getitem__(self, i: int) -> str | None:
+        return None if i == _NONE else self._strings[i]
+
+    def intern(self, value: str | None) -> int:
+        """Return the index of ``value``, adding it on first sight."""
+        if value is None:
+            return _NONE
+        i = self._index.get(value)
+        if i is None:
+            i = len(self._strings)
+            self._strings.append(value)
+            self._index[value] = i
+        return i
+
+    @property
+    def nbytes(self) -> int:
+        return sum(sys.getsizeof(s) for s in self._strings)
+
+
+class ChunkBatch:
+    """A ranked list of chunks stored column-wise.
+
+    Supports ``len()``, iteration and indexing like a ``list[LexChunk]``
+    (rows are materialised on access), plus column access for code that
+    never needs the objects: :meth:`keys`, :meth:`fields` and
+    :meth:`to_articles`.
+
+    ``scores`` holds one score per row for batches produced by fusion, and
+    is empty otherwise.
+    """
+
+    __slots__ = (
+        "article_ids",
+        "chunk_seqs",
+        "texts",
+        "title_ids",
+        "url_ids",
+        "scores",
+        "strings",
+        "_views",
+    )
+
+    def __init__(self, strings: StringTable | None = None) -> None:
+        self.article_ids = array("q")
+        self.chunk_seqs = array("q")
+        self.texts: list[str] = []
+        self.title_ids = array("l")
+        self.url_ids = array("l")
+        self.scores = array("d")
+        self.strings = strings if strings is not None else StringTable()
+        self._views: dict[int, LexChunk] = {}
+
+    # ── construction ─────────────────────────────────────────────────
+
+    def append(
+        self,
+        article_id: int,
+        chunk_seq: int,
+        chunk_text: str,
+        title: str | None = None,
+        url: str | None = None,
+    ) -> None:
+        """Add a row.  Only for batches still being built."""
+        self.article_ids.append(article_id)
+        self.chunk_seqs.append(chunk_seq)
+        self.texts.append(chunk_text)
+        self.title_ids.append(self.strings.intern(title))
+        self.url_ids.append(self.strings.intern(url))
+
+    @classmethod
+    def from_vector_results(
+        cls, results: Iterable[dict[str, Any]], strings: StringTable | None = None
+    ) -> ChunkBatch:
+        """Build from ``VectorSearchResult`` JSON objects."""
+        batch = cls(strings)
+        for r in results:
+            batch.append(
+                int(r["source_article_id"]),
+                r["chunk_seq"],
+                r["chunk_text"],
+                r.get("title"),
+                r.get("url"),
+            )
+        return batch
+
+    @classmethod
+    def from_retrieval_results(
+        cls, results: Iterable[dict[str, Any]], strings: StringTable | None = None
+    ) -> ChunkBatch:
+        """Build from ``RetrievalResult`` JSON objects (FTS/hybrid)."""
+        batch = cls(strings)
+        for r in results:
+            batch.append(
+                int(r["article_id"]),
+                r["chunk_sequence"],
+                r["chunk_text"],
+                r.get("title"),
+                r.get("url"),
+            )
+        return batch
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[LexChunk]) -> ChunkBatch:
+        batch = cls()
+        for c in chunks:
+            batch.append(c.article_id, c.chunk_seq, c.chunk_text, c.title, c.url)
+        return batch
+
+    @classmethod
+    def gather(
+        cls, batches: Sequence[ChunkBatch], rows: Iterable[tuple[int, int]]
+    ) -> ChunkBatch:
+        """Build a batch from ``(batch_index, row)`` references into ``batches``.
+
+        Reuses the string table when all batches share one; otherwise
+        strings are re-interned into a fresh table. The result is unscored.
+        """
+        if not batches:
+            return cls()
+        tables = {id(b.strings) for b in batches}
+        shared = batches[0].strings if len(tables) == 1 else None
+        out = cls(shared)
+        for b_i, row in rows:
+            src = batches[b_i]
+            out.article_ids.append(src.article_ids[row])
+            out.chunk_seqs.append(src.chunk_seqs[row])
+            out.texts.append(src.texts[row])
+            if shared is not None:
+                out.title_ids.append(src.title_ids[row])
+                out.url_ids.append(src.url_ids[row])
+            else:
+                out.title_ids.append(out.strings.intern(src.title(row)))
+                out.url_ids.append(out.strings.intern(src.url(row)))
+        return out
+
+    @classmethod
+    def concat(cls, batches: Sequence[ChunkBatch]) -> ChunkBatch:
+        """Concatenate ranked lists (e.g. all per-query results of one side)."""
+        return cls.gather(
+            batches,
+            ((b_i, row) for b_i, b in enumerate(batches) for row in range(len(b))),
+        )
+
+    # ── list-like access ─────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.article_ids)
+
+    @overload
+    def __getitem__(self, i: int) -> LexChunk: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> ChunkBatch: ...
+
+    def __getitem__(self, i: int | slice) -> LexChunk | ChunkBatch:
+        if isinstance(i, slice):
+            out = ChunkBatch(self.strings)
+            out.article_ids = self.article_ids[i]
+            out.chunk_seqs = self.chunk_seqs[i]
+            out.texts = self.texts[i]
+            out.title_ids = self.title_ids[i]
+            out.url_ids = self.url_ids[i]
+            out.scores = self.scores[i]
+            return out
+        if i < 0:
+            i += len(self)
+        view = self._views.get(i)
+        if view is None:
+            from .lex_db_connector import LexChunk
+
+            view = LexChunk(
+                article_id=self.article_ids[i],
+                chunk_seq=self.chunk_seqs[i],
+                chunk_text=self.texts[i],
+                title=self.title(i),
+                url=self.url(i),
+            )
+            self._views[i] = view
+        return view
+
+    def __iter__(self) -> Iterator[LexChunk]:
+        return (self[i] for i in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChunkBatch):
+            return NotImplemented
+        return (
+            self.article_ids == other.article_ids
+            and self.chunk_seqs == other.chunk_seqs
+            and self.texts == other.texts
+            and [self.title(i) for i in range(len(self))]
+            == [other.title(i) for i in range(len(other))]
+            and [self.url(i) for i in range(len(self))]
+            == [other.url(i) for i in range(len(other))]
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ChunkBatch(rows={len(self)}, strings={len(self.strings)})"
+
+    def to_chunks(self) -> list[LexChunk]:
+        """Materialise every row as a ``LexChunk``."""
+        return list(self)
+
+    # ── column access ────────────────────────────────────────────────
+
+    def title(self, row: int) -> str | None:
+        return self.strings[self.title_ids[row]]
+
+    def url(self, row: int) -> str | None:
+        return self.strings[self.url_ids[row]]
+
+    def score(self, row: int) -> float | None:
+        """The row's fused score, or ``None`` for an unscored batch."""
+        return self.scores[row] if self.scores else None
+
+    def keys(self) -> Iterator[int]:
+        """Packed ``(article_id, chunk_seq)`` keys in rank order."""
+        return map(pack_key, self.article_ids, self.chunk_seqs)
+
+    def fields(self) -> Iterator[tuple[int, int, str | None, str | None]]:
+        """``(article_id, chunk_seq, title, url)`` per row, without chunk text."""
+        strings = self.strings
+        return (
+            (aid, seq, strings[t], strings[u])
+            for aid, seq, t, u in zip(
+                self.article_ids, self.chunk_seqs, self.title_ids, self.url_ids
+            )
+        )
+
+    def first_row_per_article(self) -> list[int]:
+        """Row of each article's best-ranked chunk, in rank order."""
+        seen: dict[int, int] = {}
+        for row, aid in enumerate(self.article_ids):
+            seen.setdefault(aid, row)
+        return list(seen.values())
+
+    def rows_by_article(self) -> dict[int, list[int]]:
+        """Rows of each article in rank order, articles by first appearance."""
+        grouped: dict[int, list[int]] = {}
+        for row, aid in enumerate(self.article_ids):
+            grouped.setdefault(aid, []).append(row)
+        return grouped
+
+    def to_articles(
+        self, grouped: dict[int, list[int]] | None = None
+    ) -> list[LexArticle]:
+        """Group rows into articles, like :func:`group_chunks_to_articles`.
+
+        ``grouped`` is a precomputed :meth:`rows_by_article`; it is not
+        modified.
+        """
+        from .lex_db_connector import LexArticle
+
+        if grouped is None:
+            grouped = self.rows_by_article()
+
+        articles: list[LexArticle] = []
+        for aid, ranked_rows in grouped.items():
+            # The highlight is the best-ranked chunk, before reordering by seq
+            highlight = next(
+                (self.texts[r] for r in ranked_rows if self.texts[r]), None
+            )
+            rows = sorted(ranked_rows, key=self.chunk_seqs.__getitem__)
+            title = next((t for r in rows if (t := self.title(r))), "")
+            url = next((u for r in rows if (u := self.url(r))), None)
+            articles.append(
+                LexArticle(
+                    id=aid,
+                    title=title,
+                    text="\n\n".join(self.texts[r] for r in rows),
+                    url=url,
+                    highlight=highlight,
+                )
+            )
+        return articles
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by this batch, counting shared strings once."""
+        return self.column_nbytes + self.strings.nbytes
+
+    @property
+    def column_nbytes(self) -> int:
+        """Approximate memory held by this batch's own columns, without its strings."""
+        return (
+            sys.getsizeof(self.texts)
+            + sum(sys.getsizeof(t) for t in self.texts)
+            + self.article_ids.itemsize * len(self) * 2
+            + self.title_ids.itemsize * len(self) * 2
+            + self.scores.itemsize * len(self.scores)
+        )
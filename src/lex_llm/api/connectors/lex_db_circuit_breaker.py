@@ -0,0 +1,146 @@
+"""Circuit breakers for LexDB endpoints.
+
+When LexDB (or one of its indexes) is down, every run would otherwise wait
+for its own timeout before giving up. A :class:`CircuitBreaker` per
+index/endpoint opens after ``failure_threshold`` consecutive failures and
+rejects calls immediately for ``reset_timeout`` seconds. It then goes
+half-open and lets a single probe through: success closes the circuit,
+failure re-opens it.
+"""
+
+import logging
+import os
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LexDBUnavailableError(Exception):
+    """Raised instead of calling LexDB when the call cannot succeed in time."""
+
+
+class CircuitOpenError(LexDBUnavailableError):
+    """Raised when a call is rejected by an open circuit."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing.
+
+    Parameters
+    ----------
+    name:
+        Label used in log messages (the LexDB endpoint path).
+    failure_threshold:
+        Consecutive failures that open the circuit.
+    reset_timeout:
+        Seconds the circuit stays open before allowing a probe.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 10.0
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed; claims the probe when half-open."""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            _LOGGER.info("LexDB circuit %s closed", self.name)
+        self.state = CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; return ``True`` if it opened the circuit.
+
+        A late failure while the circuit is already open (a request sent
+        before it opened) does not extend the open window.
+        """
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == OPEN:
+            return False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            _LOGGER.warning(
+                "LexDB circuit %s opened after %d failures",
+                self.name,
+                self.failures,
+            )
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without a verdict (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+
+class CircuitBreakers:
+    """Lazily created breakers keyed by LexDB endpoint path.
+
+    Defaults come from ``LEXDB_BREAKER_FAILURES`` (5) and
+    ``LEXDB_BREAKER_RESET_S`` (10 s).
+    """
+
+    def __init__(
+        self, failure_threshold: int | None = None, reset_timeout: float | None = None
+    ) -> None:
+        self.failure_threshold = (
+            failure_threshold
+            if failure_threshold is not None
+            else int(os.getenv("LEXDB_BREAKER_FAILURES", "5"))
+        )
+        self.reset_timeout = (
+            reset_timeout
+            if reset_timeout is not None
+            else float(os.getenv("LEXDB_BREAKER_RESET_S", "10"))
+        )
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+            self._breakers[name] = breaker
+        return breaker
+
+    def states(self) -> dict[str, str]:
+        """Current state of every breaker, for diagnostics."""
+        return {name: b.state for name, b in self._breakers.items()}
+
+
+# Module-level singleton shared by all LexDBConnector instances
+_breakers: CircuitBreakers | None = None
+
+
+def get_circuit_breakers() -> CircuitBreakers | None:
+    """Return the shared breakers, or ``None`` when ``LEXDB_BREAKER_FAILURES=0``."""
+    global _breakers
+    if _breakers is None:
+        breakers = CircuitBreakers()
+        if breakers.failure_threshold <= 0:
+            return None
+        _breakers = breakers
+    return _breakers
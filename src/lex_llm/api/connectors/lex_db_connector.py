@@ -1,11 +1,24 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from contextlib import contextmanager
+from typing import Any, TypeVar
+from urllib.parse import quote
+
 import httpx
-import os
 from typing_extensions import deprecated
 from pydantic import BaseModel
 
-from lex_db_api.api.lex_db_api import LexDbApi
-from lex_db_api.api_client import ApiClient
-from lex_db_api.configuration import Configuration
 from lex_db_api.models.search_method import SearchMethod
 from lex_db_api.models.text_type import TextType
 from lex_db_api.models.vector_search_request import VectorSearchRequest
@@ -13,10 +26,39 @@ from lex_db_api.models.hybrid_search_request import HybridSearchRequest
 from lex_db_api.models.batch_vector_search_request import BatchVectorSearchRequest
 from lex_db_api.models.batch_fulltext_search_request import BatchFulltextSearchRequest
 
-lexdb_client = ApiClient(
-    configuration=Configuration(host=os.getenv("DB_HOST", "http://localhost:8000"))
+from ..observability.step_telemetry import (
+    append_step_entry,
+    get_step_telemetry,
+    increment_step_counter,
+    set_step_telemetry,
+)
+from ..run_deadline import cap_timeout, remaining_run_time
+from .lex_db_article_cache import ArticleCache, get_article_cache
+from .lex_db_batcher import MicroBatcher, get_micro_batcher
+from .lex_db_cache import CacheKey, RetrievalCache, get_retrieval_cache
+from .lex_db_chunk_batch import ChunkBatch, StringTable
+from .lex_db_circuit_breaker import (
+    CircuitBreakers,
+    CircuitOpenError,
+    LexDBUnavailableError,
+    get_circuit_breakers,
+)
+from .lex_db_fallback_index import FallbackIndex, get_fallback_index
+from .lex_db_hedging import HedgingPolicy, get_hedging_policy
+from .lex_db_singleflight import SingleFlight
+from .lex_db_transport import LexDBTransport, get_lexdb_transport
+
+_LOGGER = logging.getLogger(__name__)
+
+Q = TypeVar("Q", bound=Hashable)
+
+# /api/articles returns at most this many articles per request
+ARTICLE_PAGE_SIZE = 100
+
+# Response sizes of the LexDB requests made for the call being recorded
+_response_sizes: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "_lexdb_response_sizes", default=None
 )
-lexdb_api = LexDbApi(api_client=lexdb_client)
 
 
 class LexChunk(BaseModel):
@@ -50,15 +92,52 @@ class LexArticle(BaseModel):
     )
 
 
-def group_chunks_to_articles(chunks: list[LexChunk]) -> list[LexArticle]:
+def group_chunks_to_articles(
+    chunks: list[LexChunk] | ChunkBatch,
+    hydrated: Mapping[int, LexArticle] | None = None,
+    full_text: bool = False,
+) -> list[LexArticle]:
     """Group chunks by article_id into LexArticle objects.
 
     Chunks within each article are sorted by chunk_seq to ensure
     correct text ordering. Articles are returned in the order of
-    first appearance of their chunks.
+    first appearance of their chunks. A :class:`ChunkBatch` is grouped
+    column-wise without materialising its chunks.
+
+    With ``hydrated`` (full records by id, see
+    :meth:`LexDBConnector.get_articles`), each article takes its title and
+    URL from its record, and with ``full_text`` also the full article text.
+    The highlight stays the best-ranked chunk.
     """
+    articles = _group_chunks(chunks)
+    if hydrated:
+        articles = [
+            _hydrate_article(article, hydrated.get(article.id), full_text)
+            for article in articles
+        ]
+    return articles
+
+
+def _hydrate_article(
+    article: LexArticle, record: LexArticle | None, full_text: bool
+) -> LexArticle:
+    if record is None:
+        return article
+    return article.model_copy(
+        update={
+            "title": record.title or article.title,
+            "url": record.url or article.url,
+            "text": record.text if full_text and record.text else article.text,
+        }
+    )
+
+
+def _group_chunks(chunks: list[LexChunk] | ChunkBatch) -> list[LexArticle]:
     from collections import OrderedDict
 
+    if isinstance(chunks, ChunkBatch):
+        return chunks.to_articles()
+
     grouped: OrderedDict[int, list[LexChunk]] = OrderedDict()
     for chunk in chunks:
         grouped.setdefault(chunk.article_id, []).append(chunk)
@@ -84,34 +163,245 @@ def group_chunks_to_articles(chunks: list[LexChunk]) -> list[LexArticle]:
     return articles
 
 
+def _chunk_from_vector_result(result: dict[str, Any]) -> LexChunk:
+    """Build a LexChunk from a ``VectorSearchResult`` JSON object."""
+    return LexChunk(
+        article_id=int(result["source_article_id"]),
+        chunk_seq=result["chunk_seq"],
+        chunk_text=result["chunk_text"],
+        title=result.get("title"),
+        url=result.get("url"),
+    )
+
+
+def _chunk_from_retrieval_result(result: dict[str, Any]) -> LexChunk:
+    """Build a LexChunk from a ``RetrievalResult`` JSON object (FTS/hybrid)."""
+    return LexChunk(
+        article_id=int(result["article_id"]),
+        chunk_seq=result["chunk_sequence"],
+        chunk_text=result["chunk_text"],
+        title=result.get("title"),
+        url=result.get("url"),
+    )
+
+
+def _article_from_search_result(result: dict[str, Any]) -> LexArticle:
+    """Build a LexArticle from a ``SearchResult`` JSON object (``/api/articles``)."""
+    return LexArticle(
+        id=int(result["id"]),
+        title=result.get("title") or "",
+        text=result.get("xhtml_md") or "",
+        url=result.get("url"),
+    )
+
+
+def _index_path(endpoint: str, index_name: str, action: str) -> str:
+    return f"/api/{endpoint}/indexes/{quote(index_name, safe='')}/{action}"
+
+
+@contextmanager
+def _record_call(
+    endpoint: str, index_name: str | None, queries: int, top_k: int | None
+) -> Iterator[dict[str, Any]]:
+    """Time a connector call and record it as a ``lexdb_calls`` step entry.
+
+    The caller fills in ``results``, the cache counters and ``error`` on the
+    yielded entry. Response bytes are summed over the requests this call
+    sent itself; a call that joined another run's request reports none.
+    """
+    entry: dict[str, Any] = {
+        "endpoint": endpoint,
+        "index": index_name,
+        "queries": queries,
+        "top_k": top_k,
+        "results": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+    sizes: list[int] = []
+    token = _response_sizes.set(sizes)
+    t_start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        _response_sizes.reset(token)
+        entry["latency_ms"] = round((time.perf_counter() - t_start) * 1000, 2)
+        entry["response_bytes"] = sum(sizes)
+        append_step_entry("lexdb_calls", entry)
+
+
+def _credit_to_caller() -> Callable[[], None]:
+    """Capture where the current call records its telemetry.
+
+    Shared fetches run in an empty context, without any run's deadline.
+    Calling the returned function inside one records its step telemetry and
+    response bytes for the call that started it.
+    """
+    telemetry = get_step_telemetry()
+    sizes = _response_sizes.get()
+
+    def restore() -> None:
+        set_step_telemetry(telemetry)
+        _response_sizes.set(sizes)
+
+    return restore
+
+
+def _check_run_deadline(what: str) -> None:
+    """Raise ``LexDBUnavailableError`` if the run deadline has passed."""
+    if remaining_run_time() == 0:
+        increment_step_counter("lexdb_deadline", "expired")
+        raise LexDBUnavailableError(f"Run deadline passed before {what}")
+
+
+def _is_server_failure(error: httpx.HTTPError) -> bool:
+    """Whether ``error`` says LexDB is unhealthy (vs. a bad request)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return True
+
+
 class LexDBConnector:
-    """Handles communication with the Lex DB service."""
+    """Handles communication with the Lex DB service.
+
+    All calls go through a shared :class:`LexDBTransport` (async, pooled
+    keep-alive connections), so awaiting a search never blocks the event
+    loop. Batch search results are cached per query in a shared
+    :class:`RetrievalCache`, and identical queries in flight from concurrent
+    runs are coalesced into one request. With micro-batching enabled, misses
+    from concurrent runs are also sent together as one batch, and with a
+    :class:`HedgingPolicy` configured, slow searches are hedged with a
+    duplicate request.
+
+    Every call is capped by the run deadline (see ``run_deadline``) and
+    guarded by a per-endpoint :class:`CircuitBreaker`, so a LexDB outage
+    costs a run a fast empty result instead of a full timeout. Failures are
+    logged and surface as empty results, except that full-text searches fail
+    over to the local :class:`FallbackIndex` when one is configured. Request
+    bodies are still built with the generated ``lex_db_api`` models to keep
+    them in sync with ``openapi/lex-db.yaml``.
+    """
+
+    # Identical queries in flight across all connector instances (and thus
+    # across concurrent workflow runs) share one upstream request.
+    _inflight: SingleFlight[tuple[CacheKey, int], ChunkBatch] = SingleFlight()
+    _article_inflight: SingleFlight[int, LexArticle | None] = SingleFlight()
+
+    def __init__(
+        self,
+        transport: LexDBTransport | None = None,
+        cache: RetrievalCache | None = None,
+        hedging: HedgingPolicy | None = None,
+        breakers: CircuitBreakers | None = None,
+        batcher: MicroBatcher | None = None,
+        fallback: FallbackIndex | None = None,
+        articles: ArticleCache | None = None,
+    ) -> None:
+        self.transport = transport or get_lexdb_transport()
+        # Shared per-process result cache (None when disabled via LEXDB_CACHE_TTL=0)
+        self.cache = cache if cache is not None else get_retrieval_cache()
+        # Shared hedging policy (None unless LEXDB_HEDGE_PERCENTILE is set)
+        self.hedging = hedging if hedging is not None else get_hedging_policy()
+        # Shared per-endpoint circuit breakers (None when LEXDB_BREAKER_FAILURES=0)
+        self.breakers = breakers if breakers is not None else get_circuit_breakers()
+        # Shared cross-run micro-batcher (None unless LEXDB_BATCH_WINDOW_MS > 0)
+        self.batcher = batcher if batcher is not None else get_micro_batcher()
+        # Shared local BM25 index (None unless LEXDB_FALLBACK_INDEX is set)
+        self.fallback = fallback if fallback is not None else get_fallback_index()
+        # Shared article record cache (None when LEXDB_ARTICLE_CACHE_TTL=0)
+        self.articles = articles if articles is not None else get_article_cache()
+
+    async def _post(self, path: str, payload: dict[str, Any]) -> Any:
+        """POST to LexDB within the run deadline, behind the endpoint's breaker."""
+        return await self._request(
+            path,
+            lambda timeout: self.transport.post_json(
+                path, payload, timeout=timeout, sizes=_response_sizes.get()
+            ),
+        )
+
+    async def _get(self, path: str, params: dict[str, Any]) -> Any:
+        """GET from LexDB within the run deadline, behind the endpoint's breaker."""
+        return await self._request(
+            path,
+            lambda timeout: self.transport.get_json(
+                path, params, timeout=timeout, sizes=_response_sizes.get()
+            ),
+        )
+
+    async def _request(self, path: str, send: Callable[[float], Awaitable[Any]]) -> Any:
+        """Call ``send(timeout)`` within the run deadline, behind the breaker.
+
+        Slow requests are hedged when hedging is enabled. Raises
+        ``LexDBUnavailableError`` without calling LexDB when the run deadline
+        has passed or the circuit is open, and ``httpx.HTTPError`` when the
+        request itself fails.
+        """
+        _check_run_deadline(path)
+        breaker = self.breakers.get(path) if self.breakers is not None else None
+        if breaker is not None and not breaker.allow():
+            increment_step_counter("lexdb_circuit", "rejected")
+            raise CircuitOpenError(f"LexDB circuit open for {path}")
+
+        capped = False
+
+        def _call() -> Awaitable[Any]:
+            nonlocal capped
+            # Re-read the deadline so a late hedge gets only the time left
+            timeout = cap_timeout(self.transport.timeout)
+            if timeout < self.transport.timeout:
+                capped = True
+                increment_step_counter("lexdb_deadline", "capped")
+            return send(timeout)
+
+        try:
+            if self.hedging is None:
+                result = await _call()
+            else:
+                result = await self.hedging.run(path, _call)
+        except httpx.HTTPError as e:
+            if breaker is not None:
+                if capped and isinstance(e, httpx.TimeoutException):
+                    # Timed out on this run's deadline, which says nothing
+                    # about LexDB's health
+                    breaker.release()
+                elif not _is_server_failure(e):
+                    breaker.record_success()
+                else:
+                    increment_step_counter("lexdb_circuit", "failures")
+                    if breaker.record_failure():
+                        increment_step_counter("lexdb_circuit", "opened")
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return result
 
     async def vector_search(
         self, query: str, top_k: int = 5, index_name: str = "small_003"
     ) -> list[LexChunk]:
         """Performs a vector search against the knowledge base."""
 
-        try:
-            vec_req = VectorSearchRequest(query_text=query, top_k=top_k)
-            vector_search_result = lexdb_api.vector_search(index_name, vec_req)
-            if vector_search_result.results:
-                return [
-                    LexChunk(
-                        article_id=int(result.source_article_id),
-                        chunk_seq=result.chunk_seq,
-                        chunk_text=result.chunk_text,
-                        title=result.title,
-                        url=result.url,
-                    )
-                    for result in vector_search_result.results
-                ]
-
-            return []
-        except httpx.RequestError as e:
-            print(f"Error connecting to LexDB: {e}")
-            # TODO: more robust error handling/logging
-            return []
+        with _record_call("vector-search/query", index_name, 1, top_k) as call:
+            try:
+                vec_req = VectorSearchRequest(query_text=query, top_k=top_k)
+                vector_search_result = await self._post(
+                    _index_path("vector-search", index_name, "query"),
+                    vec_req.to_dict(),
+                )
+            except (httpx.HTTPError, LexDBUnavailableError) as e:
+                _LOGGER.warning("LexDB vector search on %s failed: %s", index_name, e)
+                call["error"] = type(e).__name__
+                return []
+            chunks = [
+                _chunk_from_vector_result(result)
+                for result in vector_search_result.get("results") or []
+            ]
+            call["results"] = len(chunks)
+            return chunks
 
     @deprecated(
         "Orchestrate hybrid search as a separate step instead of within the connector"
@@ -127,34 +417,31 @@ class LexDBConnector:
         methods: list[SearchMethod] | None = None,
     ) -> list[LexChunk]:
         """Performs hybrid search using RRF fusion via the lex-db API."""
-        try:
-            hybrid_req = HybridSearchRequest(
-                query_text=query,
-                top_k=top_k,
-                top_k_semantic=top_k_semantic,
-                top_k_fts=top_k_fts,
-                rrf_k=rrf_k,
-                methods=methods,
-            )
+        with _record_call("hybrid-search/query", index_name, 1, top_k) as call:
+            try:
+                hybrid_req = HybridSearchRequest(
+                    query_text=query,
+                    top_k=top_k,
+                    top_k_semantic=top_k_semantic,
+                    top_k_fts=top_k_fts,
+                    rrf_k=rrf_k,
+                    methods=methods,
+                )
 
-            hybrid_search_result = lexdb_api.hybrid_search(index_name, hybrid_req)
-
-            if hybrid_search_result.results:
-                return [
-                    LexChunk(
-                        article_id=int(result.article_id),
-                        chunk_seq=result.chunk_sequence,
-                        chunk_text=result.chunk_text,
-                        title=result.title,
-                        url=result.url,
-                    )
-                    for result in hybrid_search_result.results
-                ]
-
-            return []
-        except httpx.RequestError as e:
-            print(f"Error connecting to LexDB: {e}")
-            return []
+                hybrid_search_result = await self._post(
+                    _index_path("hybrid-search", index_name, "query"),
+                    hybrid_req.to_dict(),
+                )
+            except (httpx.HTTPError, LexDBUnavailableError) as e:
+                _LOGGER.warning("LexDB hybrid search on %s failed: %s", index_name, e)
+                call["error"] = type(e).__name__
+                return []
+            chunks = [
+                _chunk_from_retrieval_result(result)
+                for result in hybrid_search_result.get("results") or []
+            ]
+            call["results"] = len(chunks)
+            return chunks
 
     @deprecated(
         "Orchestrate HyDE search as a separate step instead of within the connector"
@@ -164,25 +451,23 @@ class LexDBConnector:
     ) -> list[LexChunk]:
         """Performs HyDE (Hypothetical Document Embeddings) search against the knowledge base."""
 
-        try:
-            hyde_req = VectorSearchRequest(query_text=query, top_k=top_k)
-            hyde_search_result = lexdb_api.hyde_search(index_name, hyde_req)
-            if hyde_search_result.results:
-                return [
-                    LexChunk(
-                        article_id=int(result.source_article_id),
-                        chunk_seq=result.chunk_seq,
-                        chunk_text=result.chunk_text,
-                        title=result.title,
-                        url=result.url,
-                    )
-                    for result in hyde_search_result.results
-                ]
-
-            return []
-        except httpx.RequestError as e:
-            print(f"Error connecting to LexDB: {e}")
-            return []
+        with _record_call("hyde-search/query", index_name, 1, top_k) as call:
+            try:
+                hyde_req = VectorSearchRequest(query_text=query, top_k=top_k)
+                hyde_search_result = await self._post(
+                    _index_path("hyde-search", index_name, "query"),
+                    hyde_req.to_dict(),
+                )
+            except (httpx.HTTPError, LexDBUnavailableError) as e:
+                _LOGGER.warning("LexDB HyDE search on %s failed: %s", index_name, e)
+                call["error"] = type(e).__name__
+                return []
+            chunks = [
+                _chunk_from_vector_result(result)
+                for result in hyde_search_result.get("results") or []
+            ]
+            call["results"] = len(chunks)
+            return chunks
 
     async def batch_vector_search(
         self,
@@ -197,34 +482,49 @@ class LexDBConnector:
         short queries, TextType.PASSAGE for HyDE-style hypothetical documents).
         Results are returned as a list of lists — one inner list per query —
         preserving per-query ranking for downstream RRF fusion.
+
+        Queries already in the retrieval cache are answered locally; only the
+        misses are sent to LexDB.
         """
-        try:
+        batches = await self.batch_vector_search_columnar(queries, top_k, index_name)
+        return [batch.to_chunks() for batch in batches]
+
+    async def batch_vector_search_columnar(
+        self,
+        queries: list[tuple[str, TextType]],
+        top_k: int = 5,
+        index_name: str = "article_embeddings_e5",
+    ) -> list[ChunkBatch]:
+        """Like :meth:`batch_vector_search`, with one :class:`ChunkBatch` per query.
+
+        No ``LexChunk`` objects are built until a caller reads a row.
+        """
+
+        path = _index_path("vector-search", index_name, "batch")
+
+        async def _send(pairs: list[tuple[str, str]], k: int) -> list[ChunkBatch]:
             # BatchVectorSearchRequest expects queries as list of [query_text, TextType] pairs
-            query_pairs: list[list[str]] = [[text, tt.value] for text, tt in queries]
-            batch_req = BatchVectorSearchRequest(queries=query_pairs, top_k=top_k)
-            batch_results = lexdb_api.batch_vector_search(index_name, batch_req)
-
-            # batch_results is a list of VectorSearchResults (one per query)
-            per_query_chunks: list[list[LexChunk]] = []
-            for search_results in batch_results:
-                query_chunks: list[LexChunk] = []
-                if search_results.results:
-                    for result in search_results.results:
-                        query_chunks.append(
-                            LexChunk(
-                                article_id=int(result.source_article_id),
-                                chunk_seq=result.chunk_seq,
-                                chunk_text=result.chunk_text,
-                                title=result.title,
-                                url=result.url,
-                            )
-                        )
-                per_query_chunks.append(query_chunks)
-
-            return per_query_chunks
-        except httpx.RequestError as e:
-            print(f"Error connecting to LexDB: {e}")
-            return [[] for _ in queries]
+            query_pairs: list[list[str]] = [list(pair) for pair in pairs]
+            batch_req = BatchVectorSearchRequest(queries=query_pairs, top_k=k)
+            batch_results = await self._post(path, batch_req.to_dict())
+
+            # batch_results is a list of VectorSearchResults (one per query);
+            # all queries of one response share a string table
+            strings = StringTable()
+            return [
+                ChunkBatch.from_vector_results(
+                    search_results.get("results") or [], strings
+                )
+                for search_results in batch_results
+            ]
+
+        async def _fetch(keys: list[CacheKey]) -> list[ChunkBatch]:
+            return await self._batched(
+                path, [(text, tt) for _, tt, text in keys], top_k, _send
+            )
+
+        keys = [(index_name, tt.value, text) for text, tt in queries]
+        return await self._cached_batch("vector-search/batch", keys, top_k, _fetch)
 
     async def batch_fulltext_search(
         self,
@@ -236,28 +536,514 @@ class LexDBConnector:
 
         Results are returned as a list of lists — one inner list per query —
         preserving per-query ranking for downstream RRF fusion.
+
+        Queries already in the retrieval cache are answered locally; only the
+        misses are sent to LexDB. When LexDB fails, the misses are answered by
+        the local fallback index, if one is configured.
         """
-        try:
-            batch_req = BatchFulltextSearchRequest(queries=queries, top_k=top_k)
-            batch_results = lexdb_api.batch_fulltext_search(index_name, batch_req)
+        batches = await self.batch_fulltext_search_columnar(queries, top_k, index_name)
+        return [batch.to_chunks() for batch in batches]
+
+    async def batch_fulltext_search_columnar(
+        self,
+        queries: list[str],
+        top_k: int = 50,
+        index_name: str = "article_embeddings_e5",
+    ) -> list[ChunkBatch]:
+        """Like :meth:`batch_fulltext_search`, with one :class:`ChunkBatch` per query.
+
+        No ``LexChunk`` objects are built until a caller reads a row.
+        """
+
+        path = _index_path("text-search", index_name, "batch")
+
+        async def _send(texts: list[str], k: int) -> list[ChunkBatch]:
+            batch_req = BatchFulltextSearchRequest(queries=texts, top_k=k)
+            batch_results = await self._post(path, batch_req.to_dict())
 
             # batch_results is a list of lists of RetrievalResult (one inner list per query)
-            per_query_chunks: list[list[LexChunk]] = []
-            for query_results in batch_results:
-                query_chunks: list[LexChunk] = []
-                for result in query_results:
-                    query_chunks.append(
-                        LexChunk(
-                            article_id=int(result.article_id),
-                            chunk_seq=result.chunk_sequence,
-                            chunk_text=result.chunk_text,
-                            title=result.title,
-                            url=result.url,
-                        )
+            strings = StringTable()
+            return [
+                ChunkBatch.from_retrieval_results(query_results, strings)
+                for query_results in batch_results
+            ]
+
+        async def _fetch(keys: list[CacheKey]) -> list[ChunkBatch]:
+            return await self._batched(
+                path, [query for _, _, query in keys], top_k, _send
+            )
+
+        keys = [(index_name, "fulltext", query) for query in queries]
+        return await self._cached_batch(
+            "text-search/batch",
+            keys,
+            top_k,
+            _fetch,
+            fallback=lambda texts, k: self._fallback_search(index_name, texts, k),
+        )
+
+    async def batch_hybrid_search(
+        self,
+        semantic_queries: list[tuple[str, TextType]],
+        keyword_queries: list[str],
+        top_k_semantic: int = 50,
+        top_k_fts: int = 50,
+        index_name: str = "article_embeddings_e5",
+        timeout: float | None = None,
+    ) -> tuple[list[list[LexChunk]], list[list[LexChunk]]]:
+        """Runs batch vector search and batch fulltext search concurrently.
+
+        Both batches share one deadline (``timeout`` seconds, defaulting to
+        the transport timeout and capped by the run deadline), so a retrieval
+        round costs the slower of the two calls instead of their sum. If one
+        side misses the deadline it is cancelled and contributes empty
+        per-query lists, while the side that finished is still returned.
+
+        Returns:
+            A ``(semantic_chunks, fts_chunks)`` tuple, each a list of lists
+            with one inner list per query — the same shapes as
+            :meth:`batch_vector_search` and :meth:`batch_fulltext_search`.
+        """
+        semantic, fulltext = await self.batch_hybrid_search_columnar(
+            semantic_queries=semantic_queries,
+            keyword_queries=keyword_queries,
+            top_k_semantic=top_k_semantic,
+            top_k_fts=top_k_fts,
+            index_name=index_name,
+            timeout=timeout,
+        )
+        return (
+            [batch.to_chunks() for batch in semantic],
+            [batch.to_chunks() for batch in fulltext],
+        )
+
+    async def batch_hybrid_search_columnar(
+        self,
+        semantic_queries: list[tuple[str, TextType]],
+        keyword_queries: list[str],
+        top_k_semantic: int = 50,
+        top_k_fts: int = 50,
+        index_name: str = "article_embeddings_e5",
+        timeout: float | None = None,
+    ) -> tuple[list[ChunkBatch], list[ChunkBatch]]:
+        """Like :meth:`batch_hybrid_search`, with one :class:`ChunkBatch` per query."""
+        deadline = cap_timeout(self.transport.timeout if timeout is None else timeout)
+        tasks: dict[str, asyncio.Task[list[ChunkBatch]]] = {}
+        if semantic_queries:
+            tasks["semantic"] = asyncio.create_task(
+                self.batch_vector_search_columnar(
+                    queries=semantic_queries,
+                    top_k=top_k_semantic,
+                    index_name=index_name,
+                )
+            )
+        if keyword_queries:
+            tasks["fulltext"] = asyncio.create_task(
+                self.batch_fulltext_search_columnar(
+                    queries=keyword_queries,
+                    top_k=top_k_fts,
+                    index_name=index_name,
+                )
+            )
+
+        if tasks:
+            try:
+                _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+            except asyncio.CancelledError:
+                for task in tasks.values():
+                    task.cancel()
+                raise
+            for side, task in tasks.items():
+                if task in pending:
+                    _LOGGER.warning(
+                        "LexDB %s search on %s exceeded %.2fs deadline; "
+                        "returning partial hybrid results",
+                        side,
+                        index_name,
+                        deadline,
+                    )
+                    task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        def _result(side: str, n_queries: int) -> list[ChunkBatch]:
+            task = tasks.get(side)
+            if task is None or task.cancelled():
+                return [ChunkBatch() for _ in range(n_queries)]
+            return task.result()
+
+        fulltext = _result("fulltext", len(keyword_queries))
+        if "fulltext" in tasks and tasks["fulltext"].cancelled():
+            fulltext = (
+                await self._fallback_search(index_name, keyword_queries, top_k_fts)
+                or fulltext
+            )
+        return _result("semantic", len(semantic_queries)), fulltext
+
+    async def federated_hybrid_search_columnar(
+        self,
+        semantic_queries: list[tuple[str, TextType]],
+        keyword_queries: list[str],
+        index_names: list[str],
+        top_k_semantic: int = 50,
+        top_k_fts: int = 50,
+        quorum: int | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, tuple[list[ChunkBatch], list[ChunkBatch]]]:
+        """Runs :meth:`batch_hybrid_search_columnar` on several indexes at once.
+
+        Every index gets the same queries and all of them share one deadline
+        (as for :meth:`batch_hybrid_search`). With ``quorum``, this returns as
+        soon as that many indexes have answered with results and cancels the
+        slower ones, so a cheap index can run alongside an expensive one
+        without always waiting for both.
+
+        Returns:
+            ``(semantic, fulltext)`` per index name, in the order of
+            ``index_names``. Indexes that were cancelled are absent.
+        """
+        deadline = cap_timeout(self.transport.timeout if timeout is None else timeout)
+        tasks = {
+            name: asyncio.create_task(
+                self.batch_hybrid_search_columnar(
+                    semantic_queries=semantic_queries,
+                    keyword_queries=keyword_queries,
+                    top_k_semantic=top_k_semantic,
+                    top_k_fts=top_k_fts,
+                    index_name=name,
+                    timeout=deadline,
+                )
+            )
+            for name in dict.fromkeys(index_names)
+        }
+        needed = len(tasks) if quorum is None else max(1, min(quorum, len(tasks)))
+
+        expires_at = time.monotonic() + deadline
+        pending: set[asyncio.Task[tuple[list[ChunkBatch], list[ChunkBatch]]]] = set(
+            tasks.values()
+        )
+        answered = 0
+        try:
+            while pending and answered < needed:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, expires_at - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    _LOGGER.warning(
+                        "LexDB federated search exceeded %.2fs deadline "
+                        "with %d indexes outstanding",
+                        deadline,
+                        len(pending),
+                    )
+                    break
+                # An index that failed answers with empty lists; it does not
+                # count towards the quorum.
+                answered += sum(
+                    1
+                    for task in done
+                    if any(len(b) for side in task.result() for b in side)
+                )
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        increment_step_counter("lexdb_federation", "cancelled", len(pending))
+
+        return {
+            name: task.result()
+            for name, task in tasks.items()
+            if task.done() and not task.cancelled()
+        }
+
+    async def progressive_hybrid_search(
+        self,
+        semantic_queries: list[tuple[str, TextType]],
+        keyword_queries: list[str],
+        top_k_semantic: int = 50,
+        top_k_fts: int = 50,
+        index_name: str = "article_embeddings_e5",
+        shard_size: int = 1,
+        timeout: float | None = None,
+    ) -> AsyncGenerator[tuple[str, int, list[ChunkBatch]], None]:
+        """Yields hybrid search results shard by shard as they arrive.
+
+        Queries are split into shards of ``shard_size`` and every shard is
+        sent concurrently, so one slow query (e.g. a long HyDE passage) no
+        longer holds back the others. Each item is ``(side, start, batches)``
+        where ``side`` is ``"semantic"`` or ``"fulltext"`` and ``batches``
+        holds the results of ``queries[start:start + len(batches)]``.
+
+        Shards still outstanding at the deadline (as for
+        :meth:`batch_hybrid_search`) or when the consumer stops iterating
+        are cancelled. Use ``contextlib.aclosing`` when breaking out early.
+        """
+        deadline = cap_timeout(self.transport.timeout if timeout is None else timeout)
+        shard_size = max(1, shard_size)
+        shards: dict[asyncio.Task[list[ChunkBatch]], tuple[str, int]] = {}
+        for start in range(0, len(semantic_queries), shard_size):
+            task = asyncio.create_task(
+                self.batch_vector_search_columnar(
+                    queries=semantic_queries[start : start + shard_size],
+                    top_k=top_k_semantic,
+                    index_name=index_name,
+                )
+            )
+            shards[task] = ("semantic", start)
+        for start in range(0, len(keyword_queries), shard_size):
+            task = asyncio.create_task(
+                self.batch_fulltext_search_columnar(
+                    queries=keyword_queries[start : start + shard_size],
+                    top_k=top_k_fts,
+                    index_name=index_name,
+                )
+            )
+            shards[task] = ("fulltext", start)
+
+        expires_at = time.monotonic() + deadline
+        pending = set(shards)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, expires_at - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    _LOGGER.warning(
+                        "LexDB progressive search on %s exceeded %.2fs deadline "
+                        "with %d shards outstanding",
+                        index_name,
+                        deadline,
+                        len(pending),
                     )
-                per_query_chunks.append(query_chunks)
+                    return
+                for task in sorted(done, key=shards.__getitem__):
+                    side, start = shards[task]
+                    yield side, start, task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def get_articles(self, article_ids: Iterable[int]) -> dict[int, LexArticle]:
+        """Fetch full article records by id, answering from the article cache.
+
+        Uncached ids are requested from ``/api/articles`` in pages of
+        ``ARTICLE_PAGE_SIZE`` sent concurrently, and ids already being fetched
+        by a concurrent run are shared with it. Ids LexDB does not return are
+        cached as missing. Missing ids, and ids that could not be fetched
+        because of a LexDB error or the run deadline, are absent from the
+        result, which is keyed in the order of ``article_ids``.
+        """
+        ids = list(dict.fromkeys(article_ids))
+        with _record_call("articles", None, len(ids), None) as call:
+            found = await self._get_articles(ids, call)
+            call["results"] = len(found)
+            return found
+
+    async def _get_articles(
+        self, ids: list[int], call: dict[str, Any]
+    ) -> dict[int, LexArticle]:
+        found: dict[int, LexArticle] = {}
+        missing: list[int] = []
+        for aid in ids:
+            if self.articles is None or aid not in self.articles:
+                missing.append(aid)
+            elif (article := self.articles.get(aid)) is not None:
+                found[aid] = article
+        if self.articles is not None:
+            increment_step_counter("lexdb_articles", "hits", len(ids) - len(missing))
+            increment_step_counter("lexdb_articles", "misses", len(missing))
+            call["cache_hits"] = len(ids) - len(missing)
+            call["cache_misses"] = len(missing)
+
+        credit = _credit_to_caller()
+
+        async def _fetch(keys: list[int]) -> list[LexArticle | None]:
+            credit()
+            pages = [
+                keys[i : i + ARTICLE_PAGE_SIZE]
+                for i in range(0, len(keys), ARTICLE_PAGE_SIZE)
+            ]
+            bodies = await asyncio.gather(
+                *(
+                    self._get(
+                        "/api/articles",
+                        {"ids": ",".join(map(str, page)), "limit": len(page)},
+                    )
+                    for page in pages
+                )
+            )
+            by_id: dict[int, LexArticle] = {}
+            for body in bodies:
+                for entry in body.get("entries") or []:
+                    article = _article_from_search_result(entry)
+                    by_id[article.id] = article
+            records = [by_id.get(key) for key in keys]
+            if self.articles is not None:
+                for key, record in zip(keys, records):
+                    if record is None:
+                        self.articles.put_missing(key)
+                    else:
+                        self.articles.put(record)
+            return records
+
+        if missing:
+            try:
+                _check_run_deadline("article lookup")
+                records, joined = await asyncio.wait_for(
+                    self._article_inflight.run(missing, _fetch),
+                    timeout=remaining_run_time(),
+                )
+                increment_step_counter("lexdb_singleflight", "joined", joined)
+            except asyncio.TimeoutError:
+                increment_step_counter("lexdb_deadline", "expired")
+                _LOGGER.warning("LexDB article lookup hit the run deadline")
+                call["error"] = "deadline"
+                records = []
+            except (httpx.HTTPError, LexDBUnavailableError) as e:
+                _LOGGER.warning("LexDB article lookup failed: %s", e)
+                call["error"] = type(e).__name__
+                records = []
+            for aid, record in zip(missing, records):
+                if record is not None:
+                    found[aid] = record
+
+        return {aid: found[aid] for aid in ids if aid in found}
+
+    async def hydrate_articles(
+        self, chunks: list[LexChunk] | ChunkBatch, full_text: bool = False
+    ) -> list[LexArticle]:
+        """Group ``chunks`` into articles completed from their full records.
+
+        Costs at most one (mostly cached) :meth:`get_articles` call; see
+        :func:`group_chunks_to_articles` for how records are merged in.
+        """
+        if isinstance(chunks, ChunkBatch):
+            ids: Iterable[int] = chunks.article_ids
+        else:
+            ids = (chunk.article_id for chunk in chunks)
+        records = await self.get_articles(ids)
+        return group_chunks_to_articles(chunks, records, full_text=full_text)
+
+    async def _fallback_search(
+        self, index_name: str, queries: list[str], top_k: int
+    ) -> list[ChunkBatch]:
+        """Search the local fallback index in a worker thread.
+
+        Empty when none is configured or it does not serve ``index_name``.
+        """
+        if self.fallback is None or not queries or not self.fallback.serves(index_name):
+            return []
+        increment_step_counter("lexdb_fallback", "queries", len(queries))
+        return await asyncio.to_thread(self.fallback.batch_search, queries, top_k)
+
+    async def _batched(
+        self,
+        path: str,
+        queries: list[Q],
+        top_k: int,
+        send: Callable[[list[Q], int], Awaitable[list[ChunkBatch]]],
+    ) -> list[ChunkBatch]:
+        """Send ``queries`` to a batch endpoint, via the micro-batcher if enabled.
+
+        With micro-batching, queries for the same endpoint and index from
+        concurrent runs are combined into one LexDB request.
+        """
+        if self.batcher is None:
+            return await send(queries, top_k)
+        return await self.batcher.submit(path, queries, top_k, send)
+
+    async def _cached_batch(
+        self,
+        endpoint: str,
+        keys: list[CacheKey],
+        top_k: int,
+        fetch: Callable[[list[CacheKey]], Awaitable[list[ChunkBatch]]],
+        fallback: Callable[[list[str], int], Awaitable[list[ChunkBatch]]] | None = None,
+    ) -> list[ChunkBatch]:
+        """Answer a batch from the retrieval cache, fetching only the misses.
+
+        Misses are coalesced with identical queries (same key and ``top_k``)
+        already in flight from concurrent runs, so each distinct query is
+        sent to LexDB once. ``fetch`` receives the keys still to be fetched
+        and returns their result lists in the same order. On a LexDB error, an
+        open circuit or the run deadline, the misses are answered by
+        ``fallback`` (called with their query texts) or get empty lists, while
+        cache hits are still returned. Fallback results are never cached.
+
+        The call is recorded as a ``lexdb_calls`` entry for ``endpoint``.
+        """
+        if not keys:
+            return []
+        with _record_call(endpoint, keys[0][0], len(keys), top_k) as call:
+            results = await self._cached_batch_results(
+                keys, top_k, fetch, fallback, call
+            )
+            call["results"] = sum(len(chunks) for chunks in results)
+            return results
+
+    async def _cached_batch_results(
+        self,
+        keys: list[CacheKey],
+        top_k: int,
+        fetch: Callable[[list[CacheKey]], Awaitable[list[ChunkBatch]]],
+        fallback: Callable[[list[str], int], Awaitable[list[ChunkBatch]]] | None,
+        call: dict[str, Any],
+    ) -> list[ChunkBatch]:
+        results: list[ChunkBatch | None] = [None] * len(keys)
+        if self.cache is not None:
+            results = [self.cache.get(key, top_k) for key in keys]
+        missing = [i for i, chunks in enumerate(results) if chunks is None]
+        if self.cache is not None:
+            increment_step_counter("lexdb_cache", "hits", len(keys) - len(missing))
+            increment_step_counter("lexdb_cache", "misses", len(missing))
+            call["cache_hits"] = len(keys) - len(missing)
+            call["cache_misses"] = len(missing)
+
+        credit = _credit_to_caller()
+
+        async def _fetch_and_cache(
+            flight_keys: list[tuple[CacheKey, int]],
+        ) -> list[ChunkBatch]:
+            # Runs once per shared call, even if the caller that started it
+            # is cancelled, so the cache is filled for everyone.
+            credit()
+            cache_keys = [key for key, _ in flight_keys]
+            fetched = await fetch(cache_keys)
+            if self.cache is not None:
+                for key, chunks in zip(cache_keys, fetched):
+                    self.cache.put(key, top_k, chunks)
+            return fetched
+
+        if missing:
+            try:
+                # Waiting on a shared request must not outlive this run's
+                # deadline; the request itself keeps running for the others.
+                _check_run_deadline(f"batch on {keys[0][0]}")
+                fetched, joined = await asyncio.wait_for(
+                    self._inflight.run(
+                        [(keys[i], top_k) for i in missing], _fetch_and_cache
+                    ),
+                    timeout=remaining_run_time(),
+                )
+                increment_step_counter("lexdb_singleflight", "joined", joined)
+            except asyncio.TimeoutError:
+                increment_step_counter("lexdb_deadline", "expired")
+                _LOGGER.warning("LexDB batch on %s hit the run deadline", keys[0][0])
+                call["error"] = "deadline"
+                fetched = []
+            except (httpx.HTTPError, LexDBUnavailableError) as e:
+                _LOGGER.warning("LexDB batch search on %s failed: %s", keys[0][0], e)
+                call["error"] = type(e).__name__
+                fetched = []
+            if not fetched:
+                if fallback is not None:
+                    fetched = await fallback([keys[i][2] for i in missing], top_k)
+                    call["fallback"] = bool(fetched)
+                fetched = fetched or [ChunkBatch() for _ in missing]
+            for i, chunks in zip(missing, fetched):
+                results[i] = chunks
 
-            return per_query_chunks
-        except httpx.RequestError as e:
-            print(f"Error connecting to LexDB: {e}")
-            return [[] for _ in queries]
+        return [chunks if chunks is not None else ChunkBatch() for chunks in results]
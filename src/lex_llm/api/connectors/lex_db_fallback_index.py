@@ -0,0 +1,465 @@
+"""Local memory-mapped BM25 index used when LexDB full-text search fails.
+
+When LexDB is slow or down, every batch search returns empty lists and the
+workflows fall into deferral. A :class:`FallbackIndex` is a read-only BM25
+index over an article snapshot, built once (from the ``/api/articles``
+endpoint or from a dump file) and written to a single binary file.
+
+The file is opened with ``mmap`` and every column is read through
+``memoryview`` casts, so nothing is copied into the Python heap: all worker
+processes that open the same file share one copy in the OS page cache.
+BM25 scoring runs in numpy over the posting columns, zero-copy. Search
+results come back as :class:`ChunkBatch` objects, like LexDB's.
+
+An index holds one snapshot, so it answers for a single LexDB index: the
+one named by ``LEXDB_FALLBACK_INDEX_NAME``, or any index when that is unset.
+
+Build an index with::
+
+    python -m lex_llm.api.connectors.lex_db_fallback_index build index.bm25
+    python -m lex_llm.api.connectors.lex_db_fallback_index build index.bm25 \\
+        --dump articles.jsonl
+
+and point ``LEXDB_FALLBACK_INDEX`` at the file to enable failover in
+``LexDBConnector.batch_fulltext_search``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable, Iterator
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+from .lex_db_chunk_batch import ChunkBatch, StringTable
+from .lex_db_transport import LexDBTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"LXBM25v1"
+_ALIGN = 8
+_TOKEN_RE = re.compile(r"\w+")
+
+# Row index meaning "no string" in the title/url columns
+_NONE = -1
+
+# Array typecodes, which double as memoryview cast formats
+_Typecode = Literal["q", "i", "B"]
+
+# name -> array typecode, in file order
+_SECTIONS: dict[str, _Typecode] = {
+    "term_offsets": "q",
+    "term_blob": "B",
+    "posting_offsets": "q",
+    "posting_docs": "i",
+    "posting_tfs": "i",
+    "doc_article_ids": "q",
+    "doc_chunk_seqs": "i",
+    "doc_lengths": "i",
+    "doc_title_ids": "i",
+    "doc_url_ids": "i",
+    "doc_text_offsets": "q",
+    "text_blob": "B",
+    "string_offsets": "q",
+    "string_blob": "B",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased word tokens, as used for both indexing and queries."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def chunk_article(text: str, max_chars: int = 1200) -> list[str]:
+    """Split article markdown into chunks of whole paragraphs.
+
+    Paragraphs are packed greedily up to ``max_chars``; a longer paragraph
+    becomes a chunk on its own.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for paragraph in (p.strip() for p in text.split("\n\n")):
+        if not paragraph:
+            continue
+        if current and size + len(paragraph) > max_chars:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _blob(values: list[str]) -> tuple[array, bytearray]:
+    offsets = array("q", [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, blob
+
+
+def build_fallback_index(
+    articles: Iterable[dict[str, Any]],
+    path: str | os.PathLike[str],
+    *,
+    max_chars: int = 1200,
+    k1: float = 1.2,
+    b: float = 0.75,
+) -> int:
+    """Chunk ``articles`` and write a BM25 index file to ``path``.
+
+    Articles are ``SearchResult`` objects as returned by ``/api/articles``
+    (``id``, ``title``, ``url`` and ``xhtml_md``). The title is indexed with
+    an article's first chunk. Returns the number of chunks indexed.
+    """
+    strings = StringTable()
+    article_ids = array("q")
+    chunk_seqs = array("i")
+    lengths = array("i")
+    title_ids = array("i")
+    url_ids = array("i")
+    texts: list[str] = []
+    postings: dict[str, list[tuple[int, int]]] = {}
+
+    for article in articles:
+        title = article.get("title") or None
+        url = article.get("url")
+        for seq, text in enumerate(chunk_article(article["xhtml_md"], max_chars)):
+            doc = len(texts)
+            tokens = tokenize(f"{title}\n{text}" if seq == 0 and title else text)
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc, tf))
+            article_ids.append(int(article["id"]))
+            chunk_seqs.append(seq)
+            lengths.append(len(tokens))
+            title_ids.append(strings.intern(title))
+            url_ids.append(strings.intern(url))
+            texts.append(text)
+
+    # Terms are sorted by their UTF-8 bytes so lookups can compare raw bytes
+    terms = sorted(postings, key=lambda t: t.encode("utf-8"))
+    term_offsets, term_blob = _blob(terms)
+    posting_offsets = array("q", [0])
+    posting_docs = array("i")
+    posting_tfs = array("i")
+    for term in terms:
+        for doc, tf in postings[term]:
+            posting_docs.append(doc)
+            posting_tfs.append(tf)
+        posting_offsets.append(len(posting_docs))
+    text_offsets, text_blob = _blob(texts)
+    string_offsets, string_blob = _blob([strings[i] or "" for i in range(len(strings))])
+
+    columns: dict[str, array | bytearray] = {
+        "term_offsets": term_offsets,
+        "term_blob": term_blob,
+        "posting_offsets": posting_offsets,
+        "posting_docs": posting_docs,
+        "posting_tfs": posting_tfs,
+        "doc_article_ids": article_ids,
+        "doc_chunk_seqs": chunk_seqs,
+        "doc_lengths": lengths,
+        "doc_title_ids": title_ids,
+        "doc_url_ids": url_ids,
+        "doc_text_offsets": text_offsets,
+        "text_blob": text_blob,
+        "string_offsets": string_offsets,
+        "string_blob": string_blob,
+    }
+    header: dict[str, Any] = {
+        "byteorder": sys.byteorder,
+        "n_docs": len(texts),
+        "n_terms": len(terms),
+        "avgdl": sum(lengths) / len(lengths) if lengths else 0.0,
+        "k1": k1,
+        "b": b,
+        "sections": {},
+    }
+    # Section offsets depend on the header size, which depends on the
+    # offsets; reserve generous room for the header instead of iterating.
+    header_size = 4096
+    offset = len(_MAGIC) + 4 + header_size
+    for name in _SECTIONS:
+        nbytes = memoryview(columns[name]).nbytes
+        header["sections"][name] = [offset, nbytes]
+        offset += -(-nbytes // _ALIGN) * _ALIGN
+    encoded = json.dumps(header).encode("utf-8")
+    if len(encoded) > header_size:
+        raise ValueError("Fallback index header does not fit")
+
+    tmp = Path(f"{os.fspath(path)}.tmp")
+    with tmp.open("wb") as f:
+        f.write(_MAGIC)
+        f.write(len(encoded).to_bytes(4, "little"))
+        f.write(encoded.ljust(header_size, b" "))
+        for name in _SECTIONS:
+            start, nbytes = header["sections"][name]
+            f.seek(start)
+            f.write(columns[name])
+        # Pad the last section so every cast sees a whole word
+        f.write(b"\0" * (-f.tell() % _ALIGN))
+    # Atomic swap, so workers that already mapped the old file keep using it
+    os.replace(tmp, path)
+    return len(texts)
+
+
+class FallbackIndex:
+    """Read-only BM25 index over a memory-mapped index file.
+
+    Parameters
+    ----------
+    path:
+        File written by :func:`build_fallback_index`.
+    index_name:
+        The LexDB index the snapshot stands in for; ``None`` serves any.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], index_name: str | None = None
+    ) -> None:
+        self.path = os.fspath(path)
+        self.index_name = index_name
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        if buf[: len(_MAGIC)] != _MAGIC:
+            buf.release()
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a LexDB fallback index")
+        header_len = int.from_bytes(buf[len(_MAGIC) : len(_MAGIC) + 4], "little")
+        start = len(_MAGIC) + 4
+        header = json.loads(bytes(buf[start : start + header_len]))
+        if header["byteorder"] != sys.byteorder:
+            buf.release()
+            self._mmap.close()
+            raise ValueError(f"{self.path} was built on a different byte order")
+
+        self.n_docs: int = header["n_docs"]
+        self.n_terms: int = header["n_terms"]
+        self.avgdl: float = header["avgdl"] or 1.0
+        self.k1: float = header["k1"]
+        self.b: float = header["b"]
+        self._buf = buf
+        self._views: dict[str, memoryview] = {}
+        for name, typecode in _SECTIONS.items():
+            offset, nbytes = header["sections"][name]
+            self._views[name] = buf[offset : offset + nbytes].cast(typecode)
+        # Scoring columns as numpy arrays over the same memory
+        self._postings = {
+            name: np.frombuffer(self._views[name], dtype=_SECTIONS[name])
+            for name in ("posting_docs", "posting_tfs", "doc_lengths")
+        }
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def serves(self, index_name: str) -> bool:
+        """Whether this snapshot may answer searches on ``index_name``."""
+        return self.index_name is None or self.index_name == index_name
+
+    def close(self) -> None:
+        """Release the mapping.  The index cannot be searched afterwards."""
+        self._postings.clear()
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._buf.release()
+        self._mmap.close()
+
+    def search(self, query: str, top_k: int = 50) -> ChunkBatch:
+        """Rank chunks for ``query`` by BM25 and return the best ``top_k``."""
+        return self.batch_search([query], top_k)[0]
+
+    def batch_search(self, queries: list[str], top_k: int = 50) -> list[ChunkBatch]:
+        """Search each query; all batches share one string table.
+
+        CPU-bound; async callers should run it in a worker thread.
+        """
+        strings = StringTable()
+        return [self._search(query, top_k, strings) for query in queries]
+
+    # ── internals ────────────────────────────────────────────────────
+
+    def _search(self, query: str, top_k: int, strings: StringTable) -> ChunkBatch:
+        v = self._views
+        docs = self._postings["posting_docs"]
+        tfs = self._postings["posting_tfs"]
+        lengths = self._postings["doc_lengths"]
+        posting_offsets = v["posting_offsets"]
+        k1, b, avgdl = self.k1, self.b, self.avgdl
+        term_docs = []
+        term_scores = []
+        for term in set(tokenize(query)):
+            t = self._term_id(term.encode("utf-8"))
+            if t is None:
+                continue
+            lo, hi = posting_offsets[t], posting_offsets[t + 1]
+            df = hi - lo
+            idf = math.log(1.0 + (self.n_docs - df + 0.5) / (df + 0.5))
+            doc_ids = docs[lo:hi]
+            tf = tfs[lo:hi].astype(np.float64)
+            norm = k1 * (1.0 - b + b * lengths[doc_ids] / avgdl)
+            term_docs.append(doc_ids)
+            term_scores.append(idf * tf * (k1 + 1.0) / (tf + norm))
+
+        batch = ChunkBatch(strings)
+        if not term_docs:
+            return batch
+        candidates, inverse = np.unique(np.concatenate(term_docs), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(term_scores))
+        # Best score first; ties in document order
+        best = np.lexsort((candidates, -scores))[:top_k]
+        for doc in candidates[best].tolist():
+            batch.append(
+                v["doc_article_ids"][doc],
+                v["doc_chunk_seqs"][doc],
+                self._text(v["doc_text_offsets"], v["text_blob"], doc),
+                self._string(v["doc_title_ids"][doc]),
+                self._string(v["doc_url_ids"][doc]),
+            )
+        return batch
+
+    def _term_id(self, term: bytes) -> int | None:
+        offsets, blob = self._views["term_offsets"], self._views["term_blob"]
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = blob[offsets[mid] : offsets[mid + 1]].tobytes()
+            if candidate < term:
+                lo = mid + 1
+            elif candidate > term:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    @staticmethod
+    def _text(offsets: memoryview, blob: memoryview, i: int) -> str:
+        return str(blob[offsets[i] : offsets[i + 1]], "utf-8")
+
+    def _string(self, i: int) -> str | None:
+        if i == _NONE:
+            return None
+        return self._text(self._views["string_offsets"], self._views["string_blob"], i)
+
+
+# ── snapshots ────────────────────────────────────────────────────────
+
+
+def load_article_dump(path: str | os.PathLike[str]) -> Iterator[dict[str, Any]]:
+    """Read articles from a dump file.
+
+    ``.jsonl`` files hold one ``SearchResult`` per line; other files hold a
+    JSON list of them or a ``SearchResults`` object.
+    """
+    with open(path, encoding="utf-8") as f:
+        if os.fspath(path).endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(f)
+    yield from data["entries"] if isinstance(data, dict) else data
+
+
+async def fetch_article_snapshot(
+    transport: LexDBTransport,
+    *,
+    page_size: int = 100,
+    max_empty_pages: int = 20,
+) -> AsyncIterator[dict[str, Any]]:
+    """Page through ``/api/articles`` by id and yield every article.
+
+    Ids are requested ``page_size`` at a time (the endpoint's limit is 100).
+    Ids are not dense, so paging stops only after ``max_empty_pages``
+    consecutive pages without a single article.
+    """
+    start = 1
+    empty = 0
+    while empty < max_empty_pages:
+        ids = ",".join(str(i) for i in range(start, start + page_size))
+        body = await transport.get_json(
+            "/api/articles", params={"ids": ids, "limit": page_size}
+        )
+        entries = body.get("entries") or []
+        empty = 0 if entries else empty + 1
+        for entry in entries:
+            yield entry
+        start += page_size
+
+
+# Module-level singleton shared by all LexDBConnector instances
+_index: FallbackIndex | None = None
+
+
+def get_fallback_index() -> FallbackIndex | None:
+    """Return the shared index, or ``None`` unless ``LEXDB_FALLBACK_INDEX`` is set."""
+    global _index
+    if _index is None:
+        path = os.getenv("LEXDB_FALLBACK_INDEX")
+        if not path:
+            return None
+        try:
+            _index = FallbackIndex(path, os.getenv("LEXDB_FALLBACK_INDEX_NAME") or None)
+        except (OSError, ValueError) as e:
+            _LOGGER.warning("LexDB fallback index %s unavailable: %s", path, e)
+            return None
+        _LOGGER.info("LexDB fallback index loaded: %d chunks", len(_index))
+    return _index
+
+
+# ── CLI ──────────────────────────────────────────────────────────────
+
+
+async def _snapshot(args: argparse.Namespace) -> list[dict[str, Any]]:
+    transport = LexDBTransport(args.host)
+    try:
+        return [article async for article in fetch_article_snapshot(transport)]
+    finally:
+        await transport.aclose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Build an index file")
+    build.add_argument("output", help="Index file to write")
+    build.add_argument("--dump", help="Article dump (.json/.jsonl) instead of LexDB")
+    build.add_argument("--host", help="LexDB base URL (defaults to DB_HOST)")
+    build.add_argument("--max-chars", type=int, default=1200)
+    search = sub.add_parser("search", help="Query an index file")
+    search.add_argument("index", help="Index file to query")
+    search.add_argument("query")
+    search.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        articles = (
+            load_article_dump(args.dump) if args.dump else asyncio.run(_snapshot(args))
+        )
+        n = build_fallback_index(articles, args.output, max_chars=args.max_chars)
+        print(f"Indexed {n} chunks into {args.output}")
+    else:
+        index = FallbackIndex(args.index)
+        for chunk in index.search(args.query, args.top_k):
+            print(f"{chunk.article_id}/{chunk.chunk_seq}\t{chunk.title}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
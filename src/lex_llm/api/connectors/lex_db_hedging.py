@@ -0,0 +1,163 @@
+"""Hedged LexDB requests to cut retrieval tail latency.
+
+p99 retrieval latency is dominated by the occasional slow LexDB response.
+With hedging enabled, a search that has been outstanding longer than a
+rolling percentile of recent latencies for the same endpoint gets a
+duplicate request; whichever finishes first wins and the other is
+cancelled. LexDB search endpoints are read-only, so duplicates are safe.
+
+Hedges draw from a per-process token budget that refills by
+``budget_ratio`` tokens per request, so at most that fraction of extra
+load is ever sent.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from ...utils.latency_tracker import LatencyTracker
+from ..observability.step_telemetry import increment_step_counter
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """Decides when to send a duplicate LexDB request and runs the race.
+
+    Parameters
+    ----------
+    percentile:
+        Hedge once the primary has been outstanding longer than this
+        percentile of recent latencies for the same endpoint.
+    budget_ratio:
+        Hedge tokens earned per request; caps hedges at roughly this
+        fraction of requests.
+    max_burst:
+        Maximum number of saved-up hedge tokens.
+    min_samples:
+        Latency samples needed per endpoint before hedging starts.
+    min_delay:
+        Lower bound (seconds) on the hedge delay.
+    window:
+        Number of recent latencies kept per endpoint.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget_ratio: float = 0.1,
+        max_burst: float = 10.0,
+        min_samples: int = 20,
+        min_delay: float = 0.02,
+        window: int = 200,
+    ) -> None:
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.max_burst = max_burst
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._window = window
+        self._trackers: dict[str, LatencyTracker] = {}
+        self._tokens = 0.0
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def stats(self) -> dict[str, float]:
+        """Process-wide hedge rate (hedges / requests) and win rate."""
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            "hedge_win_rate": self.hedge_wins / self.hedges if self.hedges else 0.0,
+        }
+
+    def hedge_delay(self, endpoint: str) -> float | None:
+        """Seconds to wait before hedging, or ``None`` if not enough data."""
+        tracker = self._trackers.get(endpoint)
+        if tracker is None or len(tracker) < self.min_samples:
+            return None
+        delay = tracker.percentile(self.percentile)
+        return None if delay is None else max(delay, self.min_delay)
+
+    async def run(self, endpoint: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Await ``call()``, hedging with a second ``call()`` when it is slow."""
+        self.requests += 1
+        self._tokens = min(self.max_burst, self._tokens + self.budget_ratio)
+        increment_step_counter("lexdb_hedging", "requests")
+        tracker = self._trackers.setdefault(endpoint, LatencyTracker(self._window))
+        delay = self.hedge_delay(endpoint)
+
+        t_start = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        hedge: asyncio.Future[T] | None = None
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self.hedges += 1
+                    increment_step_counter("lexdb_hedging", "hedges")
+                    _LOGGER.debug("Hedging %s after %.3fs", endpoint, delay)
+                    hedge = asyncio.ensure_future(call())
+
+            if hedge is None:
+                result = await primary
+            else:
+                result, hedge_won = await self._race(primary, hedge)
+                if hedge_won:
+                    self.hedge_wins += 1
+                    increment_step_counter("lexdb_hedging", "hedge_wins")
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+        tracker.record(time.monotonic() - t_start)
+        return result
+
+    @staticmethod
+    async def _race(
+        primary: "asyncio.Future[T]", hedge: "asyncio.Future[T]"
+    ) -> tuple[T, bool]:
+        """Return ``(result, hedge_won)`` for the first successful request.
+
+        Raises the primary's error if both requests fail.
+        """
+        pending: set[asyncio.Future[T]] = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            # Prefer the primary when both land in the same tick
+            for task in (primary, hedge):
+                if task in done and task.exception() is None:
+                    return task.result(), task is hedge
+        return primary.result(), False
+
+
+# Module-level singleton — hedging is opt-in via LEXDB_HEDGE_PERCENTILE
+_policy: HedgingPolicy | None = None
+
+
+def get_hedging_policy() -> HedgingPolicy | None:
+    """Return the shared policy, or ``None`` unless hedging is enabled.
+
+    Enable by setting ``LEXDB_HEDGE_PERCENTILE`` (e.g. ``95``); the budget
+    defaults to 10 % extra requests (``LEXDB_HEDGE_BUDGET``).
+    """
+    global _policy
+    if _policy is None:
+        percentile = os.getenv("LEXDB_HEDGE_PERCENTILE")
+        if not percentile:
+            return None
+        _policy = HedgingPolicy(
+            percentile=float(percentile),
+            budget_ratio=float(os.getenv("LEXDB_HEDGE_BUDGET", "0.1")),
+        )
+    return _policy
@@ -0,0 +1,117 @@
+"""Single-flight coalescing of identical in-flight LexDB queries.
+
+When traffic spikes, many concurrent runs send the same keyword and subquery
+strings to LexDB within the same second. :class:`SingleFlight` lets the first
+caller for a key issue the upstream request and every concurrent caller with
+the same key await that result instead of sending its own.
+
+The upstream call runs in its own task and waiters only await shielded
+futures, so a waiter being cancelled (e.g. a client disconnecting) never
+cancels the shared call for the others. That task starts from an empty
+context, so it carries none of the leading caller's context variables (its
+run deadline, step telemetry); each waiter bounds its own wait instead.
+"""
+
+import asyncio
+import contextvars
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def _consume_exception(future: "asyncio.Future[Any]") -> None:
+    # Mark the exception as retrieved when every waiter has gone away, so
+    # asyncio does not log "Future exception was never retrieved".
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight(Generic[K, V]):
+    """Coalesces concurrent requests for the same keys into one upstream call.
+
+    Counters ``led`` and ``joined`` track how many keys were fetched by the
+    caller itself versus served by another caller's in-flight request.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[K, asyncio.Future[V]] = {}
+        # Strong references so shared calls are not garbage collected
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.led = 0
+        self.joined = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(
+        self,
+        keys: Sequence[K],
+        fetch: Callable[[list[K]], Awaitable[list[V]]],
+    ) -> tuple[list[V], int]:
+        """Return one value per key, fetching only keys nobody is fetching yet.
+
+        ``fetch`` receives the keys this caller leads (deduplicated, in order)
+        and must return their values in the same order. It runs in a separate
+        task with an empty context; its exception is raised to every caller
+        waiting on those keys.
+
+        Returns:
+            ``(values, joined)`` — values aligned with ``keys`` and the number
+            of keys served by a request that was already in flight.
+        """
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future[V]] = []
+        led: list[K] = []
+        joined = 0
+        for key in keys:
+            future = self._inflight.get(key)
+            if future is None:
+                future = loop.create_future()
+                future.add_done_callback(_consume_exception)
+                self._inflight[key] = future
+                led.append(key)
+            else:
+                joined += 1
+            futures.append(future)
+
+        self.led += len(led)
+        self.joined += joined
+        if led:
+            # Shared by every waiter, so not bound to this caller's context
+            task = contextvars.Context().run(
+                asyncio.create_task, self._lead(led, fetch)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        values = await asyncio.gather(*(asyncio.shield(f) for f in futures))
+        return list(values), joined
+
+    async def _lead(
+        self, keys: list[K], fetch: Callable[[list[K]], Awaitable[list[V]]]
+    ) -> None:
+        futures = [self._inflight[key] for key in keys]
+        try:
+            values = await fetch(keys)
+            if len(values) != len(keys):
+                raise ValueError(
+                    f"Expected {len(keys)} values from fetch, got {len(values)}"
+                )
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for future, value in zip(futures, values):
+                if not future.done():
+                    future.set_result(value)
+        finally:
+            for key, future in zip(keys, futures):
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
@@ -0,0 +1,552 @@
+"""Local stand-in for LexDB, for load tests and retrieval benchmarks.
+
+Serves the endpoints of ``openapi/lex-db.yaml`` (health, tables, vector
+search and batch vector search, batch full-text search, hybrid and HyDE
+search, articles, vector indexes and the embedding benchmark) over an
+in-memory corpus. Request bodies are validated with the models generated
+from that spec, and responses have the spec's shapes, so
+:class:`LexDBConnector` cannot tell the difference. The stand-in does not
+reproduce LexDB's ranking:
+
+- full-text search ranks chunks by BM25 over word tokens;
+- vector search ranks chunks by cosine similarity of character trigram
+  counts (no embedding model), and HyDE search does the same with the raw
+  query instead of a generated passage;
+- every index name in :attr:`StandInConfig.indexes` serves the same corpus.
+
+Latency, errors and result sizes are drawn from a :class:`StandInConfig`
+with a seeded RNG, so retrieval-path changes can be measured reproducibly
+on a laptop or in CI. Run it with::
+
+    python -m lex_llm.api.connectors.lex_db_standin --port 8000 \\
+        --latency-ms 40 --latency-sigma 0.5 --error-rate 0.01
+
+and point ``DB_HOST`` at it. In tests, mount :func:`create_app` on an
+``httpx.ASGITransport`` instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import FastAPI, HTTPException, Request
+
+from lex_db_api.models.batch_fulltext_search_request import BatchFulltextSearchRequest
+from lex_db_api.models.batch_vector_search_request import BatchVectorSearchRequest
+from lex_db_api.models.benchmark_embeddings_request import BenchmarkEmbeddingsRequest
+from lex_db_api.models.hybrid_search_request import HybridSearchRequest
+from lex_db_api.models.vector_search_request import VectorSearchRequest
+
+from .lex_db_fallback_index import chunk_article, load_article_dump, tokenize
+
+DEFAULT_INDEXES = ("article_embeddings_e5", "openai_large_3_sections", "e5_small")
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Log-normal request latency with an optional slow tail.
+
+    Parameters
+    ----------
+    median_ms:
+        Median latency of a single-query request.
+    sigma:
+        Log-normal shape; 0 makes every request take exactly the median.
+    per_query_ms:
+        Added for each query after the first in a batch request.
+    tail_rate:
+        Share of requests that take ``tail_ms`` extra (GC pauses, cold
+        caches, a slow replica).
+    tail_ms:
+        Extra latency of a tail request.
+    """
+
+    median_ms: float = 0.0
+    sigma: float = 0.0
+    per_query_ms: float = 0.0
+    tail_rate: float = 0.0
+    tail_ms: float = 0.0
+
+    def sample(self, rng: random.Random, queries: int = 1) -> float:
+        """Draw one request latency in seconds."""
+        ms = self.median_ms
+        if self.sigma:
+            ms *= math.exp(rng.gauss(0.0, self.sigma))
+        ms += self.per_query_ms * max(0, queries - 1)
+        if self.tail_rate and rng.random() < self.tail_rate:
+            ms += self.tail_ms
+        return ms / 1000
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of a stand-in server.
+
+    Parameters
+    ----------
+    latency:
+        Latency of every endpoint without an entry in ``endpoint_latency``.
+    endpoint_latency:
+        Per-endpoint latency, keyed like ``lexdb_calls`` entries
+        (``"vector-search/batch"``, ``"text-search/batch"``, ``"articles"``, ...).
+    error_rate:
+        Share of requests answered with ``error_status`` (after the
+        latency, like a backend that times out).
+    error_status:
+        HTTP status of injected errors.
+    max_results:
+        Cap on results per query, whatever ``top_k`` asks for.
+    indexes:
+        Vector index names served; searching any other index returns 404.
+    seed:
+        RNG seed for latencies and errors; ``None`` seeds from the OS.
+    """
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    endpoint_latency: Mapping[str, LatencyModel] = field(default_factory=dict)
+    error_rate: float = 0.0
+    error_status: int = 503
+    max_results: int | None = None
+    indexes: tuple[str, ...] = DEFAULT_INDEXES
+    seed: int | None = 0
+
+
+# ── corpus ───────────────────────────────────────────────────────────
+
+_WORDS = (
+    "kongen danmark krigen kirken byen landet havet øen slottet hæren "
+    "folketinget grundloven reformationen industrien landbruget jernbanen "
+    "universitetet maleren digteren komponisten filosoffen arkitekten "
+    "sproget litteraturen musikken kunsten videnskaben historien klimaet "
+    "vikingetiden middelalderen renæssancen oplysningstiden guldalderen "
+    "besættelsen velfærdsstaten demokratiet monarkiet handelen søfarten "
+    "fiskeriet skoven heden fjorden bakken mosen klinten stranden vejret "
+    "befolkningen økonomien regeringen domstolen valget partiet loven"
+).split()
+
+
+def synthetic_corpus(n_articles: int = 500, seed: int = 0) -> list[dict[str, Any]]:
+    """Generate ``SearchResult``-shaped articles of Danish-looking filler.
+
+    Each article repeats its title words in its text, so querying a title
+    finds it in both full-text and vector search.
+    """
+    rng = random.Random(seed)
+    articles: list[dict[str, Any]] = []
+    for article_id in range(1, n_articles + 1):
+        head = rng.sample(_WORDS, 2)
+        title = f"{head[0].capitalize()} {head[1]} {article_id}"
+        paragraphs = [
+            " ".join([*head, *rng.choices(_WORDS, k=rng.randint(40, 120))])
+            for _ in range(rng.randint(1, 6))
+        ]
+        articles.append(
+            {
+                "id": article_id,
+                "title": title,
+                "headword": title,
+                "url": f"https://lex.dk/{title.replace(' ', '_')}",
+                "xhtml_md": "\n\n".join(paragraphs),
+                "rank": 0.0,
+            }
+        )
+    return articles
+
+
+def _trigrams(text: str) -> Counter[str]:
+    padded = f" {' '.join(tokenize(text))} "
+    return Counter(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class StandInCorpus:
+    """Chunked articles with BM25 and trigram-cosine search."""
+
+    def __init__(
+        self,
+        articles: Iterable[dict[str, Any]],
+        max_chars: int = 1200,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.articles: dict[int, dict[str, Any]] = {}
+        self.chunks: list[dict[str, Any]] = []
+        self._tokens: list[Counter[str]] = []
+        self._trigrams: list[Counter[str]] = []
+        self._norms: list[float] = []
+        self._postings: dict[str, list[int]] = {}
+        for article in articles:
+            article_id = int(article["id"])
+            self.articles[article_id] = article
+            for seq, text in enumerate(
+                chunk_article(article.get("xhtml_md") or "", max_chars)
+            ):
+                # The title is indexed with the first chunk, as in FallbackIndex
+                indexed = text
+                if seq == 0:
+                    indexed = f"{article.get('title') or ''}\n\n{text}"
+                tokens = Counter(tokenize(indexed))
+                trigrams = _trigrams(indexed)
+                for term in tokens:
+                    self._postings.setdefault(term, []).append(len(self.chunks))
+                self.chunks.append(
+                    {
+                        "article_id": article_id,
+                        "chunk_seq": seq,
+                        "chunk_text": text,
+                        "title": article.get("title"),
+                        "url": article.get("url"),
+                    }
+                )
+                self._tokens.append(tokens)
+                self._trigrams.append(trigrams)
+                self._norms.append(math.sqrt(sum(c * c for c in trigrams.values())))
+        self.k1, self.b = k1, b
+        lengths = [sum(tokens.values()) for tokens in self._tokens]
+        self._lengths = lengths
+        self._avgdl = sum(lengths) / len(lengths) if lengths else 1.0
+
+    def fulltext(self, query: str, top_k: int) -> list[tuple[int, float]]:
+        """BM25-ranked ``(chunk, score)`` pairs; only chunks sharing a term."""
+        n = len(self.chunks)
+        k1, b, avgdl = self.k1, self.b, self._avgdl
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            docs = self._postings.get(term, [])
+            idf = math.log(1.0 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc in docs:
+                tf = self._tokens[doc][term]
+                norm = k1 * (1.0 - b + b * self._lengths[doc] / avgdl)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: -item[1])[:top_k]
+
+    def semantic(self, query: str, top_k: int) -> list[tuple[int, float]]:
+        """``(chunk, cosine similarity)`` pairs over character trigrams."""
+        q = _trigrams(query)
+        q_norm = math.sqrt(sum(c * c for c in q.values())) or 1.0
+        scores = [
+            (doc, sum(c * trigrams.get(g, 0) for g, c in q.items()) / (q_norm * norm))
+            for doc, (trigrams, norm) in enumerate(zip(self._trigrams, self._norms))
+            if norm
+        ]
+        return sorted(scores, key=lambda item: -item[1])[:top_k]
+
+    def search_articles(self, query: str, limit: int) -> list[tuple[int, float]]:
+        """``(article id, rank)`` pairs by each article's best chunk score."""
+        best: dict[int, float] = {}
+        for doc, score in self.fulltext(query, len(self.chunks)):
+            article_id = self.chunks[doc]["article_id"]
+            best.setdefault(article_id, score)
+        return list(best.items())[:limit]
+
+
+# ── responses ────────────────────────────────────────────────────────
+
+
+def _vector_result(
+    corpus: StandInCorpus, doc: int, similarity: float
+) -> dict[str, Any]:
+    chunk = corpus.chunks[doc]
+    return {
+        "id_in_index": doc,
+        "source_article_id": str(chunk["article_id"]),
+        "chunk_seq": chunk["chunk_seq"],
+        "chunk_text": chunk["chunk_text"],
+        "distance": 1.0 - similarity,
+        "url": chunk["url"],
+        "title": chunk["title"],
+        "changed_at": None,
+    }
+
+
+def _retrieval_result(corpus: StandInCorpus, doc: int, score: float) -> dict[str, Any]:
+    chunk = corpus.chunks[doc]
+    return {
+        "id": doc,
+        "article_id": chunk["article_id"],
+        "chunk_sequence": chunk["chunk_seq"],
+        "chunk_text": chunk["chunk_text"],
+        "score": score,
+        "url": chunk["url"],
+        "title": chunk["title"],
+        "changed_at": None,
+    }
+
+
+def _parse_ids(values: list[str]) -> list[int]:
+    """Article ids given comma-separated, as a JSON list, or repeated."""
+    ids: list[int] = []
+    for value in values:
+        value = value.strip()
+        if value.startswith("["):
+            ids.extend(int(v) for v in json.loads(value))
+        else:
+            ids.extend(int(v) for v in value.split(",") if v.strip())
+    return ids
+
+
+# ── app ──────────────────────────────────────────────────────────────
+
+
+def create_app(
+    articles: Iterable[dict[str, Any]] | None = None,
+    config: StandInConfig | None = None,
+    max_chars: int = 1200,
+) -> FastAPI:
+    """Build the stand-in ASGI app.
+
+    ``articles`` are ``SearchResult`` objects (as in an article dump) and
+    default to :func:`synthetic_corpus`. ``max_chars`` sets the chunk size,
+    and with it the size of every search result.
+    """
+    config = config or StandInConfig()
+    corpus = StandInCorpus(
+        synthetic_corpus() if articles is None else articles, max_chars
+    )
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Lex DB API (stand-in)", version="0.1.0")
+    app.state.corpus = corpus
+    app.state.config = config
+
+    async def _simulate(endpoint: str, queries: int = 1) -> None:
+        model = config.endpoint_latency.get(endpoint, config.latency)
+        delay = model.sample(rng, queries)
+        failed = config.error_rate > 0 and rng.random() < config.error_rate
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            raise HTTPException(config.error_status, "Injected stand-in error")
+
+    def _check_index(index_name: str) -> None:
+        if index_name not in config.indexes:
+            raise HTTPException(404, f"Vector index '{index_name}' not found")
+
+    def _k(top_k: int | None, default: int) -> int:
+        k = default if top_k is None else top_k
+        return k if config.max_results is None else min(k, config.max_results)
+
+    def _index_metadata(name: str) -> dict[str, Any]:
+        return {
+            "index_name": name,
+            "source_table": "articles",
+            "embedding_model": "stand-in-trigram",
+            "chunk_size": max_chars,
+            "row_count": len(corpus.chunks),
+        }
+
+    @app.get("/", tags=["Health"])
+    async def health_check() -> dict[str, Any]:
+        return {"status": "ok", "stand_in": True, "chunks": len(corpus.chunks)}
+
+    @app.get("/api/tables")
+    async def get_tables() -> dict[str, list[str]]:
+        return {"tables": ["articles", *config.indexes]}
+
+    @app.post("/api/vector-search/indexes/{index_name}/query")
+    async def vector_search(
+        index_name: str, request: VectorSearchRequest
+    ) -> dict[str, Any]:
+        _check_index(index_name)
+        await _simulate("vector-search/query")
+        hits = corpus.semantic(request.query_text, _k(request.top_k, 5))
+        return {"results": [_vector_result(corpus, d, s) for d, s in hits]}
+
+    @app.post("/api/vector-search/indexes/{index_name}/batch")
+    async def batch_vector_search(
+        index_name: str, request: BatchVectorSearchRequest
+    ) -> list[dict[str, Any]]:
+        _check_index(index_name)
+        await _simulate("vector-search/batch", len(request.queries))
+        k = _k(request.top_k, 5)
+        return [
+            {
+                "results": [
+                    _vector_result(corpus, d, s)
+                    for d, s in corpus.semantic(str(query[0]), k)
+                ]
+            }
+            for query in request.queries
+        ]
+
+    @app.post("/api/hybrid-search/indexes/{index_name}/query")
+    async def hybrid_search(
+        index_name: str, request: HybridSearchRequest
+    ) -> dict[str, Any]:
+        _check_index(index_name)
+        await _simulate("hybrid-search/query")
+        methods = {str(getattr(m, "value", m)) for m in request.methods or []}
+        methods = methods or {"SEMANTIC", "FULLTEXT"}
+        rrf_k = request.rrf_k or 60
+        lists: list[list[tuple[int, float]]] = []
+        if "SEMANTIC" in methods or "HYDE" in methods:
+            k = request.top_k_semantic or 50
+            lists.append(corpus.semantic(request.query_text, k))
+        if "FULLTEXT" in methods:
+            lists.append(corpus.fulltext(request.query_text, request.top_k_fts or 50))
+        fused: dict[int, float] = {}
+        for hits in lists:
+            for rank, (doc, _) in enumerate(hits):
+                fused[doc] = fused.get(doc, 0.0) + 1.0 / (rrf_k + rank + 1)
+        top = sorted(fused.items(), key=lambda item: -item[1])
+        top = top[: _k(request.top_k, 10)]
+        return {"results": [_retrieval_result(corpus, d, s) for d, s in top]}
+
+    @app.post("/api/hyde-search/indexes/{index_name}/query")
+    async def hyde_search(
+        index_name: str, request: VectorSearchRequest
+    ) -> dict[str, Any]:
+        _check_index(index_name)
+        await _simulate("hyde-search/query")
+        hits = corpus.semantic(request.query_text, _k(request.top_k, 5))
+        return {"results": [_vector_result(corpus, d, s) for d, s in hits]}
+
+    @app.post("/api/text-search/indexes/{index_name}/batch")
+    async def batch_fulltext_search(
+        index_name: str, request: BatchFulltextSearchRequest
+    ) -> list[list[dict[str, Any]]]:
+        _check_index(index_name)
+        await _simulate("text-search/batch", len(request.queries))
+        k = _k(request.top_k, 50)
+        return [
+            [_retrieval_result(corpus, d, s) for d, s in corpus.fulltext(query, k)]
+            for query in request.queries
+        ]
+
+    @app.get("/api/articles")
+    async def get_articles(
+        request: Request, query: str | None = None, limit: int = 50
+    ) -> dict[str, Any]:
+        if not 1 <= limit <= 100:
+            raise HTTPException(422, "limit must be between 1 and 100")
+        try:
+            ids = _parse_ids(request.query_params.getlist("ids"))
+        except ValueError as e:
+            raise HTTPException(422, f"Invalid ids: {e}") from e
+        await _simulate("articles", max(1, len(ids)))
+        if ids:
+            ranked = [(aid, 0.0) for aid in ids if aid in corpus.articles]
+        elif query:
+            ranked = corpus.search_articles(query, limit)
+        else:
+            ranked = [(aid, 0.0) for aid in corpus.articles]
+        entries = [
+            {**corpus.articles[aid], "id": aid, "rank": rank}
+            for aid, rank in ranked[:limit]
+        ]
+        return {"entries": entries, "total": len(ranked), "limit": limit}
+
+    @app.get("/api/vector-search/indexes")
+    async def list_vector_indexes() -> list[dict[str, Any]]:
+        await _simulate("indexes")
+        return [_index_metadata(name) for name in config.indexes]
+
+    @app.get("/api/vector-search/indexes/{index_name}")
+    async def get_vector_index(index_name: str) -> dict[str, Any]:
+        _check_index(index_name)
+        await _simulate("indexes")
+        return _index_metadata(index_name)
+
+    @app.post("/api/benchmark/embeddings")
+    async def benchmark_embeddings(
+        request: BenchmarkEmbeddingsRequest | None = None,
+    ) -> dict[str, Any]:
+        request = request or BenchmarkEmbeddingsRequest()
+        num_texts = request.num_texts or 50
+        text_length = request.text_length or 200
+        t_start = time.perf_counter()
+        # "Embed" num_texts texts of about text_length characters each
+        for i in range(num_texts):
+            words = (_WORDS[(i + j) % len(_WORDS)] for j in range(text_length // 8))
+            _trigrams(" ".join(words))
+        await _simulate("benchmark/embeddings", num_texts)
+        total = time.perf_counter() - t_start
+        return {
+            "num_texts": num_texts,
+            "avg_text_length": text_length,
+            "total_time_seconds": total,
+            "texts_per_second": num_texts / total if total else 0.0,
+            "ms_per_text": total * 1000 / num_texts if num_texts else 0.0,
+            "embedding_dimension": 0,
+        }
+
+    return app
+
+
+# ── CLI ──────────────────────────────────────────────────────────────
+
+
+def main(argv: list[str] | None = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--corpus", help="Article dump (.json/.jsonl)")
+    parser.add_argument(
+        "--articles", type=int, default=500, help="Synthetic articles without --corpus"
+    )
+    parser.add_argument("--chunk-chars", type=int, default=1200)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.0)
+    parser.add_argument("--per-query-ms", type=float, default=0.0)
+    parser.add_argument("--tail-rate", type=float, default=0.0)
+    parser.add_argument("--tail-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--endpoint-latency-ms",
+        action="append",
+        default=[],
+        metavar="ENDPOINT=MS",
+        help="Median latency for one endpoint (repeatable)",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--max-results", type=int)
+    parser.add_argument("--index", action="append", help="Index name (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    latency = LatencyModel(
+        median_ms=args.latency_ms,
+        sigma=args.latency_sigma,
+        per_query_ms=args.per_query_ms,
+        tail_rate=args.tail_rate,
+        tail_ms=args.tail_ms,
+    )
+    endpoint_latency: dict[str, LatencyModel] = {}
+    for spec in args.endpoint_latency_ms:
+        endpoint, _, ms = spec.partition("=")
+        endpoint_latency[endpoint] = LatencyModel(
+            median_ms=float(ms),
+            sigma=args.latency_sigma,
+            per_query_ms=args.per_query_ms,
+            tail_rate=args.tail_rate,
+            tail_ms=args.tail_ms,
+        )
+    config = StandInConfig(
+        latency=latency,
+        endpoint_latency=endpoint_latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        max_results=args.max_results,
+        indexes=tuple(args.index or DEFAULT_INDEXES),
+        seed=args.seed,
+    )
+    articles = (
+        list(load_article_dump(args.corpus))
+        if args.corpus
+        else synthetic_corpus(args.articles, args.seed)
+    )
+    app = create_app(articles, config, max_chars=args.chunk_chars)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Async HTTP transport for the LexDB REST API.
+
+The generated ``lex_db_api`` client is synchronous (urllib3), so calling it
+from an ``async def`` blocks the event loop for the whole round trip and
+stalls token streaming for every other in-flight run. This transport talks
+to the same endpoints through one shared ``httpx.AsyncClient`` with a
+bounded keep-alive connection pool.
+"""
+
+import logging
+import os
+from typing import Any
+
+import httpx
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+class LexDBTransport:
+    """Shared async client for LexDB with pooled keep-alive connections.
+
+    The underlying ``httpx.AsyncClient`` is created lazily on first use so
+    that constructing a transport at import time never touches the event
+    loop.
+
+    Parameters
+    ----------
+    base_url:
+        LexDB host, e.g. ``http://localhost:8000``.  Defaults to ``DB_HOST``.
+    timeout:
+        Default read, write and pool timeout (seconds), each applied per
+        phase of a request rather than as a limit on its total time.
+        Defaults to ``LEXDB_TIMEOUT`` or 10 s.
+    connect_timeout:
+        Timeout for establishing a new connection.
+        Defaults to ``LEXDB_CONNECT_TIMEOUT`` or 2 s.
+    max_connections:
+        Upper bound on concurrent connections to LexDB.
+        Defaults to ``LEXDB_MAX_CONNECTIONS`` or 50.
+    max_keepalive_connections:
+        Idle connections kept open for reuse.
+        Defaults to ``LEXDB_MAX_KEEPALIVE`` or 20.
+    keepalive_expiry:
+        Seconds an idle connection is kept before being closed.
+    transport:
+        Optional ``httpx`` transport, mainly for tests
+        (e.g. ``httpx.MockTransport`` or ``httpx.ASGITransport``).
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        timeout: float | None = None,
+        connect_timeout: float | None = None,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.base_url = (
+            base_url or os.getenv("DB_HOST") or "http://localhost:8000"
+        ).rstrip("/")
+        self.timeout = (
+            timeout if timeout is not None else _env_float("LEXDB_TIMEOUT", 10.0)
+        )
+        self._connect_timeout = (
+            connect_timeout
+            if connect_timeout is not None
+            else _env_float("LEXDB_CONNECT_TIMEOUT", 2.0)
+        )
+        self._limits = httpx.Limits(
+            max_connections=max_connections or _env_int("LEXDB_MAX_CONNECTIONS", 50),
+            max_keepalive_connections=max_keepalive_connections
+            or _env_int("LEXDB_MAX_KEEPALIVE", 20),
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    # ── lifecycle ────────────────────────────────────────────────────
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled ``httpx.AsyncClient``, created on first access."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self._timeout_for(None),
+                limits=self._limits,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections.  Safe to call more than once."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    # ── requests ─────────────────────────────────────────────────────
+
+    async def post_json(
+        self,
+        path: str,
+        payload: Any,
+        *,
+        timeout: float | None = None,
+        sizes: list[int] | None = None,
+    ) -> Any:
+        """POST ``payload`` as JSON and return the decoded response body.
+
+        The size of the response body in bytes is appended to ``sizes`` when
+        given. Raises ``httpx.HTTPError`` on transport errors and non-2xx
+        responses.
+        """
+        response = await self.client.post(
+            path, json=payload, timeout=self._timeout_for(timeout)
+        )
+        return self._decode(response, sizes)
+
+    async def get_json(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        *,
+        timeout: float | None = None,
+        sizes: list[int] | None = None,
+    ) -> Any:
+        """GET ``path`` and return the decoded response body.
+
+        The size of the response body in bytes is appended to ``sizes`` when
+        given. Raises ``httpx.HTTPError`` on transport errors and non-2xx
+        responses.
+        """
+        response = await self.client.get(
+            path, params=params, timeout=self._timeout_for(timeout)
+        )
+        return self._decode(response, sizes)
+
+    # ── internals ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _decode(response: httpx.Response, sizes: list[int] | None) -> Any:
+        response.raise_for_status()
+        if sizes is not None:
+            sizes.append(len(response.content))
+        return response.json()
+
+    def _timeout_for(self, timeout: float | None) -> httpx.Timeout:
+        total = self.timeout if timeout is None else timeout
+        return httpx.Timeout(total, connect=min(self._connect_timeout, total))
+
+
+# Module-level singleton — closed by routes.py lifespan
+_transport: LexDBTransport | None = None
+
+
+def get_lexdb_transport() -> LexDBTransport:
+    global _transport
+    if _transport is None:
+        _transport = LexDBTransport()
+        _LOGGER.info("LexDB transport created for %s", _transport.base_url)
+    return _transport
+
+
+async def close_lexdb_transport() -> None:
+    """Close the shared transport's connection pool (called on shutdown)."""
+    global _transport
+    if _transport is not None:
+        await _transport.aclose()
+        _transport = None
@@ -1,3 +1,4 @@
+import inspect
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
@@ -54,3 +55,17 @@ class LLMProvider(ABC):
         Override in RoutingLLMProvider to capture routing decisions.
         """
         yield
+
+
+async def close_completion_stream(stream: Any) -> None:
+    """Close a streamed completion so its HTTP response is released.
+
+    litellm's stream wrapper has ``aclose()``, the openai SDK's ``AsyncStream``
+    an async ``close()``. Providers call this when their consumer stops
+    reading early, so the backend stops generating.
+    """
+    close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+    if close is not None:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
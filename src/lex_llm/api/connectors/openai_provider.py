@@ -1,7 +1,7 @@
 from typing import AsyncGenerator, List
 import litellm
 
-from lex_llm.api.connectors.llm_provider import LLMProvider
+from lex_llm.api.connectors.llm_provider import LLMProvider, close_completion_stream
 from ..event_models import ConversationMessage
 
 
@@ -15,10 +15,13 @@ class OpenAIProvider(LLMProvider):
         stream = await litellm.acompletion(
             model="gpt-4.1", messages=messages, stream=True
         )
-        async for chunk in stream:  # type: ignore
-            content = chunk.choices[0].delta.content
-            if content:
-                yield content
+        try:
+            async for chunk in stream:  # type: ignore
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        finally:
+            await close_completion_stream(stream)
 
     async def generate(self, messages: List[ConversationMessage]) -> str:
         """Generates a response as a single text chunk."""
@@ -1,6 +1,7 @@
 from typing import AsyncGenerator, List, Optional
 import litellm
 from ..event_models import ConversationMessage
+from .llm_provider import close_completion_stream
 from .openai_provider import LLMProvider
 
 
@@ -64,10 +65,13 @@ class OpenRouterProvider(LLMProvider):
             stream=True,
             extra_body=extra_body if extra_body else None,
         )
-        async for chunk in stream:  # type: ignore
-            content = chunk.choices[0].delta.content
-            if content:
-                yield content
+        try:
+            async for chunk in stream:  # type: ignore
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        finally:
+            await close_completion_stream(stream)
 
     async def generate(self, messages: List[ConversationMessage]) -> str:
         """Generates a response as a single text chunk."""
@@ -1,7 +1,7 @@
 # llm/routing_provider.py
 import contextvars
 import logging
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
 from typing import Any, AsyncGenerator, Callable, List
 from ..event_models import ConversationMessage
 from .llm_provider import LLMProvider, RouteDecision
@@ -143,12 +143,9 @@ class RoutingLLMProvider(LLMProvider):
                 model=getattr(self.fallback, "model", ""),
             )
             logger.info("Routing to fallback: %s", reason)
-            output_chars = 0
-            async for chunk in self.fallback.generate_stream(messages):
-                output_chars += len(chunk)
-                yield chunk
-            if entry is not None:
-                entry["output_chars"] = output_chars
+            async with aclosing(self._stream_fallback(messages, entry)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
             return
 
         stream = self.primary.generate_stream(messages)
@@ -167,12 +164,9 @@ class RoutingLLMProvider(LLMProvider):
                 reason=str(exc),
                 model=getattr(self.fallback, "model", ""),
             )
-            output_chars = 0
-            async for chunk in self.fallback.generate_stream(messages):
-                output_chars += len(chunk)
-                yield chunk
-            if entry is not None:
-                entry["output_chars"] = output_chars
+            async with aclosing(self._stream_fallback(messages, entry)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
             return
 
         # Primary succeeded — yield the first chunk, then the rest.
@@ -183,12 +177,32 @@ class RoutingLLMProvider(LLMProvider):
             model=getattr(self.primary, "model", ""),
         )
         output_chars = len(first)
-        yield first
-        async for chunk in stream:
-            output_chars += len(chunk)
-            yield chunk
-        if entry is not None:
-            entry["output_chars"] = output_chars
+        try:
+            yield first
+            async for chunk in stream:
+                output_chars += len(chunk)
+                yield chunk
+        finally:
+            # Also runs when the caller stops reading early: close the primary
+            # stream now so its generation is cancelled, and count what it sent
+            await stream.aclose()
+            if entry is not None:
+                entry["output_chars"] = output_chars
+
+    async def _stream_fallback(
+        self, messages: List[ConversationMessage], entry: dict[str, Any] | None
+    ) -> AsyncGenerator[str, None]:
+        """Stream from the fallback, closed and counted even on an early stop."""
+        stream = self.fallback.generate_stream(messages)
+        output_chars = 0
+        try:
+            async for chunk in stream:
+                output_chars += len(chunk)
+                yield chunk
+        finally:
+            await stream.aclose()
+            if entry is not None:
+                entry["output_chars"] = output_chars
 
     async def generate(self, messages: List[ConversationMessage]) -> str:
         # generate_stream does the counting; we just need to make sure
@@ -1,6 +1,6 @@
 import litellm
 from ..event_models import ConversationMessage
-from .llm_provider import LLMProvider
+from .llm_provider import LLMProvider, close_completion_stream
 import os
 from typing import AsyncGenerator
 
@@ -24,10 +24,13 @@ class ScalewayProvider(LLMProvider):
         stream = await litellm.acompletion(
             model="openai/" + self.model, messages=messages_dicts, stream=True
         )
-        async for chunk in stream:  # type: ignore
-            content = chunk.choices[0].delta.content
-            if content:
-                yield content
+        try:
+            async for chunk in stream:  # type: ignore
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        finally:
+            await close_completion_stream(stream)
 
     async def generate(self, messages: list[ConversationMessage]) -> str:
         """Generates a response as a single text chunk."""
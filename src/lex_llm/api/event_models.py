@@ -71,6 +71,7 @@ class WorkflowMetricsData(BaseModel):
     ttft_any_ms: float | None = None
     ttft_answer_ms: float | None = None
     backend_summary: Dict[str, int] = Field(default_factory=dict)
+    lexdb_summary: Dict[str, Any] = Field(default_factory=dict)
     step_count: int = 0
     outcome: Literal["ok", "error", "deferral"] = "ok"
 
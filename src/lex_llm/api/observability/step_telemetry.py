@@ -0,0 +1,48 @@
+"""Per-step telemetry sink for code that never sees the workflow context.
+
+The orchestrator allocates a telemetry dict for every step and exposes it as
+``context["_current_step_telemetry"]``. LLM steps pass that dict to
+``llm_provider.observe()``; connectors such as ``LexDBConnector`` are called
+deep inside tools without the context, so the orchestrator also binds the
+dict to a context variable and they record into it through these helpers.
+"""
+
+import contextvars
+from typing import Any
+
+_step_telemetry: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "_step_telemetry", default=None
+)
+
+
+def set_step_telemetry(telemetry: dict[str, Any] | None) -> None:
+    """Bind the telemetry dict of the running step (``None`` to unbind)."""
+    _step_telemetry.set(telemetry)
+
+
+def get_step_telemetry() -> dict[str, Any] | None:
+    """Return the telemetry dict of the running step, if any."""
+    return _step_telemetry.get()
+
+
+def increment_step_counter(section: str, name: str, amount: int = 1) -> None:
+    """Add ``amount`` to ``telemetry[section][name]`` for the running step.
+
+    No-op outside an orchestrated step.
+    """
+    telemetry = _step_telemetry.get()
+    if telemetry is None or amount == 0:
+        return
+    counters = telemetry.setdefault(section, {})
+    counters[name] = counters.get(name, 0) + amount
+
+
+def append_step_entry(section: str, entry: dict[str, Any]) -> None:
+    """Append ``entry`` to the list ``telemetry[section]`` for the running step.
+
+    No-op outside an orchestrated step.
+    """
+    telemetry = _step_telemetry.get()
+    if telemetry is None:
+        return
+    telemetry.setdefault(section, []).append(entry)
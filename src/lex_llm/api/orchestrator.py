@@ -11,6 +11,8 @@ from .event_models import (
     WorkflowMetricsData,
 )
 from .observability.run_recorder import get_recorder
+from .observability.step_telemetry import set_step_telemetry
+from .run_deadline import default_run_deadline, set_run_deadline
 
 StepFunc = Callable[
     [dict[str, Any], EventEmitter],
@@ -40,11 +42,16 @@ class Orchestrator:
         context: dict[str, Any] = {},
         workflow_id: str = "",
         use_clean_history: bool = False,
+        run_deadline: float | None = None,
     ):
         self.request = request
         self.steps = steps
         self.workflow_id = workflow_id
         self.use_clean_history = use_clean_history
+        # Seconds the run may spend before LexDB calls give up (RUN_DEADLINE_S)
+        self.run_deadline = (
+            run_deadline if run_deadline is not None else default_run_deadline()
+        )
         self.emitter = EventEmitter(conversation_id=request.conversation_id)
         # A simple dictionary to pass state between steps
         self.context: dict[str, Any] = {**context, **request.model_dump()}
@@ -71,6 +78,15 @@ class Orchestrator:
         # Allocate per-step telemetry so LLM steps can record backend info
         step_telemetry: dict[str, Any] = {}
         self.context["_current_step_telemetry"] = step_telemetry
+        # Lets long-running steps emit in_progress workflow_step updates
+        self.context["_current_step"] = WorkflowStepData(
+            step_id=step_id,
+            name=step_name,
+            status="in_progress",
+            description=step_description,
+        )
+        # Connectors without access to the context record into the same dict
+        set_step_telemetry(step_telemetry)
 
         t_start = time_module.perf_counter()
         try:
@@ -93,6 +109,8 @@ class Orchestrator:
             raise
         finally:
             self.context.pop("_current_step_telemetry", None)
+            self.context.pop("_current_step", None)
+            set_step_telemetry(None)
 
         duration_ms = (time_module.perf_counter() - t_start) * 1000
         self._step_telemetries.append(step_telemetry)
@@ -176,6 +194,8 @@ class Orchestrator:
         """Executes the workflow steps and yields NDJSON events."""
         # Propagate run ID to DGXProvider for nginx trace correlation
         set_run_id(self.emitter.run_id)
+        # Connectors cap their timeouts to the time left in this run
+        set_run_deadline(self.run_deadline)
 
         yield self.emitter.stream_start(
             conversation_history=self.request.conversation_history
@@ -305,6 +325,7 @@ class Orchestrator:
                 ttft_any_ms=ttft_any_ms,
                 ttft_answer_ms=ttft_answer_ms,
                 backend_summary=backend_counts,
+                lexdb_summary=self._build_lexdb_summary(),
                 step_count=step_count,
                 outcome=outcome,  # type: ignore[arg-type]
             )
@@ -319,6 +340,43 @@ class Orchestrator:
                 counts[b] = counts.get(b, 0) + 1
         return counts
 
+    def _build_lexdb_summary(self) -> dict[str, Any]:
+        """Aggregate ``lexdb_calls`` entries across all completed steps.
+
+        Totals latency, bytes, results and cache counters, and breaks calls
+        and latency down per endpoint, so a slow run can be attributed to
+        LexDB or to the model (``llm_calls``).
+        """
+        summary: dict[str, Any] = {
+            "calls": 0,
+            "errors": 0,
+            "latency_ms": 0.0,
+            "max_latency_ms": 0.0,
+            "response_bytes": 0,
+            "results": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "endpoints": {},
+        }
+        for tel in self._step_telemetries:
+            for call in tel.get("lexdb_calls") or []:
+                latency = call.get("latency_ms", 0.0)
+                summary["calls"] += 1
+                summary["errors"] += 1 if call.get("error") else 0
+                summary["latency_ms"] += latency
+                summary["max_latency_ms"] = max(summary["max_latency_ms"], latency)
+                for key in ("response_bytes", "results", "cache_hits", "cache_misses"):
+                    summary[key] += call.get(key, 0)
+                endpoint = summary["endpoints"].setdefault(
+                    call.get("endpoint", "unknown"), {"calls": 0, "latency_ms": 0.0}
+                )
+                endpoint["calls"] += 1
+                endpoint["latency_ms"] += latency
+        summary["latency_ms"] = round(summary["latency_ms"], 2)
+        for endpoint in summary["endpoints"].values():
+            endpoint["latency_ms"] = round(endpoint["latency_ms"], 2)
+        return summary
+
     async def _submit_recorder_row(self, t_start: float, outcome: str) -> None:
         """Submit one telemetry row to the JSONL recorder."""
         e = self.emitter
@@ -343,6 +401,13 @@ class Orchestrator:
             ),
             "step_count": len(self.steps),
             "backend_summary": self._build_backend_summary(),
+            "lexdb_summary": self._build_lexdb_summary(),
+            # Seeds AdaptiveDepth.from_entries when read back
+            "survivor_depth": [
+                entry
+                for tel in self._step_telemetries
+                for entry in tel.get("survivor_depth") or []
+            ],
         }
         try:
             await get_recorder().submit(row)
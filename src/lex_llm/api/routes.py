@@ -9,6 +9,7 @@ from .workflow_utils import (
     get_all_workflow_metadata,
 )
 from .observability.run_recorder import get_recorder
+from .connectors.lex_db_transport import close_lexdb_transport
 
 router = APIRouter()
 
@@ -38,11 +39,12 @@ async def run_workflow(
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Start the RunRecorder on boot, drain on shutdown."""
+    """Start the RunRecorder on boot; drain it and close LexDB on shutdown."""
     recorder = get_recorder()
     await recorder.start()
     yield
     await recorder.stop()
+    await close_lexdb_transport()
 
 
 @router.get("/workflows/metadata")
@@ -0,0 +1,41 @@
+"""Per-run deadline shared by everything a workflow run awaits.
+
+The orchestrator sets an absolute deadline when a run starts; connectors
+read the remaining time to cap their own timeouts, so a slow dependency
+cannot hold a run longer than its budget. The deadline lives in a context
+variable (like the DGX run ID), so it follows the run into the tasks it
+spawns without being threaded through every call.
+"""
+
+import contextvars
+import os
+import time
+
+_run_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "_run_deadline", default=None
+)
+
+
+def default_run_deadline() -> float | None:
+    """Run budget in seconds from ``RUN_DEADLINE_S`` (default 90, ``0`` disables)."""
+    seconds = float(os.getenv("RUN_DEADLINE_S", "90"))
+    return seconds if seconds > 0 else None
+
+
+def set_run_deadline(seconds: float | None) -> None:
+    """Give the current run ``seconds`` from now (``None`` clears the deadline)."""
+    _run_deadline.set(None if seconds is None else time.monotonic() + seconds)
+
+
+def remaining_run_time() -> float | None:
+    """Seconds left before the run deadline (never negative), or ``None``."""
+    deadline = _run_deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def cap_timeout(timeout: float) -> float:
+    """Return ``timeout`` shortened to the time left in the current run."""
+    remaining = remaining_run_time()
+    return timeout if remaining is None else min(timeout, remaining)
@@ -0,0 +1,95 @@
+"""Hybrid retrieval fanned out over several LexDB indexes.
+
+Each index is searched with the same semantic and keyword queries through
+:meth:`LexDBConnector.federated_hybrid_search_columnar` (concurrently, under
+one deadline), and every index's per-query result lists are fused in a
+single weighted RRF pass. An index's weight scales all of its lists, so a
+cheap index can contribute without outranking a better one.
+
+Indexes chunk articles differently, so the same ``(article_id, chunk_seq)``
+may name different passages in two indexes; such chunks are fused as one.
+Downstream steps work at the article level, where this does not matter.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from lex_db_api.models.text_type import TextType
+
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
+from ..api.connectors.lex_db_connector import LexDBConnector
+from ..utils.rrf import reciprocal_rank_fusion_batches
+
+
+@dataclass
+class FederatedResult:
+    """Outcome of a federated retrieval round.
+
+    ``lists`` and ``weights`` are the exact inputs to fusion, one weight
+    per list.
+    """
+
+    semantic: list[ChunkBatch]
+    fulltext: list[ChunkBatch]
+    fused: ChunkBatch
+    indexes: list[str]
+    lists: list[ChunkBatch] = field(default_factory=list)
+    weights: list[float] = field(default_factory=list)
+
+
+def index_names(index_name: str | list[str]) -> list[str]:
+    """Normalise a tool's ``index_name`` argument to a list of indexes."""
+    return [index_name] if isinstance(index_name, str) else list(index_name)
+
+
+async def federated_hybrid_retrieval(
+    connector: LexDBConnector,
+    semantic_queries: list[tuple[str, TextType]],
+    keyword_queries: list[str],
+    index_names: list[str],
+    *,
+    index_weights: Mapping[str, float] | None = None,
+    quorum: int | None = None,
+    top_k: int = 10,
+    top_k_semantic: int = 50,
+    top_k_fts: int = 50,
+    rrf_k: int = 60,
+) -> FederatedResult:
+    """Search every index and fuse all result lists into the top ``top_k``.
+
+    ``index_weights`` defaults to 1.0 per index. With ``quorum``, fusion
+    uses the first ``quorum`` indexes to answer (see
+    :meth:`LexDBConnector.federated_hybrid_search_columnar`);
+    ``FederatedResult.indexes`` lists the ones that did.
+    """
+    results = await connector.federated_hybrid_search_columnar(
+        semantic_queries=semantic_queries,
+        keyword_queries=keyword_queries,
+        index_names=index_names,
+        top_k_semantic=top_k_semantic,
+        top_k_fts=top_k_fts,
+        quorum=quorum,
+    )
+
+    semantic: list[ChunkBatch] = []
+    fulltext: list[ChunkBatch] = []
+    lists: list[ChunkBatch] = []
+    weights: list[float] = []
+    for name, (index_semantic, index_fulltext) in results.items():
+        weight = 1.0 if index_weights is None else index_weights.get(name, 1.0)
+        semantic.extend(index_semantic)
+        fulltext.extend(index_fulltext)
+        lists.extend([*index_semantic, *index_fulltext])
+        weights.extend([weight] * (len(index_semantic) + len(index_fulltext)))
+
+    fused = reciprocal_rank_fusion_batches(
+        *lists, k=rrf_k, weights=weights, top_k=top_k
+    )
+    return FederatedResult(
+        semantic=semantic,
+        fulltext=fulltext,
+        fused=fused,
+        indexes=list(results),
+        lists=lists,
+        weights=weights,
+    )
@@ -17,6 +17,7 @@ from ..api.connectors.lex_db_connector import (
     LexChunk,
 )
 from ..api.event_models import ConversationMessage
+from ..utils.retrieval_helpers import context_fused_result
 from ..prompts_search_synthesis import (
     get_insufficient_context_deferral_prompt,
 )
@@ -90,7 +91,8 @@ def generate_lead_and_body_v2(
         # --- Build user message with sources and date ---
         user_message_with_sources = build_user_message_with_sources(
             user_input=user_input,
-            retrieved_chunks=retrieved_chunks,
+            retrieved_chunks=context_fused_result(context, retrieved_chunks)
+            or retrieved_chunks,
             current_date=current_date,
         )
 
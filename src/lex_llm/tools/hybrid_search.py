@@ -9,31 +9,32 @@ Results are deduplicated at the article level with the most relevant
 chunk as a highlight.
 """
 
-from collections.abc import AsyncGenerator, Callable
+from collections.abc import AsyncGenerator, Callable, Mapping
 from typing import Any
 
 from lex_db_api.models.text_type import TextType
 
 from ..api.event_emitter import EventEmitter
-from ..api.connectors.lex_db_connector import (
-    LexDBConnector,
-    group_chunks_to_articles,
-)
-from ..utils.rrf import reciprocal_rank_fusion
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
+from ..api.connectors.lex_db_connector import LexDBConnector
 from ..utils.retrieval_helpers import (
+    FusedResult,
     build_search_result,
-    deduplicate_chunks_to_sources,
+    set_retrieval_context,
 )
 from ..utils.descriptions import build_search_description
+from .federated_retrieval import federated_hybrid_retrieval, index_names
 
 
 def hybrid_search(
-    index_name: str = "article_embeddings_e5",
+    index_name: str | list[str] = "article_embeddings_e5",
     top_k: int = 10,
     top_k_semantic: int = 50,
     top_k_fts: int = 50,
     rrf_k: int = 60,
     output_sources: bool = False,
+    index_weights: Mapping[str, float] | None = None,
+    quorum: int | None = None,
 ) -> tuple[
     Callable[[dict[str, Any], EventEmitter], AsyncGenerator[str | None, None]], str
 ]:
@@ -46,11 +47,18 @@ def hybrid_search(
 
     No LLM calls are made — only the LexDB search API is contacted.
 
+    ``index_name`` may list several indexes: all are searched concurrently
+    and fused in one RRF pass, with each index's lists scaled by
+    ``index_weights``. With ``quorum``, the step uses the first ``quorum``
+    indexes to answer (see ``federated_retrieval``).
+
     Sets context keys:
         - retrieved_chunks: list[LexChunk] — fused chunks, sorted by RRF score
         - retrieved_docs: list[LexArticle] — chunks grouped into articles
         - search_results: list[Source] — deduplicated article-level results
+        - fused_result: FusedResult — memoised views of the fused chunks
     """
+    indexes = index_names(index_name)
 
     async def _hybrid_search(
         context: dict[str, Any], emitter: EventEmitter
@@ -79,39 +87,39 @@ def hybrid_search(
             ),
         )
 
-        semantic_chunks = await connector.batch_vector_search(
-            queries=[(q, TextType.QUERY) for q in queries],
-            top_k=top_k_semantic,
-            index_name=index_name,
-        )
-        fts_chunks = await connector.batch_fulltext_search(
-            queries=keywords,
-            top_k=top_k_fts,
-            index_name=index_name,
+        # Fuse column-wise; only the top_k fused chunks become LexChunks
+        result = await federated_hybrid_retrieval(
+            connector,
+            semantic_queries=[(q, TextType.QUERY) for q in queries],
+            keyword_queries=keywords,
+            index_names=indexes,
+            index_weights=index_weights,
+            quorum=quorum,
+            top_k=top_k,
+            top_k_semantic=top_k_semantic,
+            top_k_fts=top_k_fts,
+            rrf_k=rrf_k,
         )
-        fused_chunks = reciprocal_rank_fusion(
-            *semantic_chunks,
-            *fts_chunks,
-            k=rrf_k,
-        )[:top_k]
-
-        yield emitter.tool_result(
-            name="hybrid_search",
-            result_data=build_search_result(
-                [c for qs in semantic_chunks for c in qs],
-                [c for qs in fts_chunks for c in qs],
-                fused_chunks,
-                rrf_k,
-            ),
+        # Every view below (telemetry, chunks, articles, sources) shares
+        # one grouping pass over the fused batch
+        fused = FusedResult(result.fused, rrf_k)
+
+        result_data = build_search_result(
+            ChunkBatch.concat(result.semantic),
+            ChunkBatch.concat(result.fulltext),
+            fused,
+            rrf_k,
         )
+        if len(indexes) > 1:
+            result_data["indexes"] = result.indexes
+        yield emitter.tool_result(name="hybrid_search", result_data=result_data)
 
         # ------------------------------------------------------------------ #
         # Deduplicate and write results to context                           #
         # ------------------------------------------------------------------ #
-        sources = deduplicate_chunks_to_sources(fused_chunks)
+        sources = fused.sources
 
-        context["retrieved_chunks"] = fused_chunks
-        context["retrieved_docs"] = group_chunks_to_articles(fused_chunks)
+        set_retrieval_context(context, fused)
         context["search_results"] = sources
 
         # Emit the deduplicated source list as a stream event
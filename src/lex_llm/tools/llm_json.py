@@ -1,6 +1,7 @@
 """Shared utilities for LLM-based tools."""
 
 import json
+from collections.abc import AsyncGenerator, Callable
 from typing import Any
 
 
@@ -51,3 +52,133 @@ def parse_json_response(raw: str) -> dict[str, Any]:
             pass
 
     raise ValueError(f"Failed to parse LLM response as JSON: {raw[:200]}...")
+
+
+class StreamingJSONObject:
+    """Parses the top-level members of a JSON object as its text streams in.
+
+    Text before the opening ``{`` (e.g. a markdown fence) is skipped. A
+    member becomes available in :attr:`fields` as soon as the ``,`` or ``}``
+    that ends it arrives, so a verdict emitted first can be acted on while
+    the model is still writing the rest. Elements of a member's array are
+    returned by :meth:`feed` one by one as they close, before the array does.
+    """
+
+    def __init__(self) -> None:
+        self.fields: dict[str, Any] = {}
+        self.text = ""
+        self.complete = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start: int | None = None
+        self._array_key: str | None = None
+        self._element_start = 0
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Consume the next piece of streamed text.
+
+        Returns the ``(member, element)`` pairs of top-level array members
+        whose elements closed in this piece.
+        """
+        self.text += chunk
+        text = self.text
+        elements: list[tuple[str, Any]] = []
+        for i in range(self._pos, len(text)):
+            if self.complete:
+                break
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._member_start is None:
+                # Still looking for the object's opening brace
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = i + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2:
+                    self._start_array(i)
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._array_key is not None:
+                    self._end_element(i, elements)
+                    self._array_key = None
+                elif self._depth == 0:
+                    self._end_member(i)
+                    self.complete = True
+            elif char == "," and self._depth == 1:
+                self._end_member(i)
+            elif char == "," and self._depth == 2 and self._array_key is not None:
+                self._end_element(i, elements)
+        self._pos = len(text)
+        return elements
+
+    def _start_array(self, start: int) -> None:
+        assert self._member_start is not None
+        key = self.text[self._member_start : start].strip().rstrip(":").strip()
+        try:
+            self._array_key = json.loads(key)
+        except json.JSONDecodeError:
+            return
+        self._element_start = start + 1
+
+    def _end_element(self, end: int, elements: list[tuple[str, Any]]) -> None:
+        assert self._array_key is not None
+        element = self.text[self._element_start : end].strip()
+        self._element_start = end + 1
+        if not element:
+            return
+        try:
+            elements.append((self._array_key, json.loads(element)))
+        except json.JSONDecodeError:
+            pass
+
+    def _end_member(self, end: int) -> None:
+        assert self._member_start is not None
+        member = self.text[self._member_start : end].strip()
+        self._member_start = end + 1
+        if not member:
+            return
+        try:
+            self.fields.update(json.loads("{" + member + "}"))
+        except json.JSONDecodeError:
+            pass
+
+
+async def read_json_fields(
+    stream: AsyncGenerator[str, None],
+    enough: Callable[[dict[str, Any]], bool],
+) -> tuple[dict[str, Any], bool]:
+    """Read a streamed JSON object until ``enough(fields)`` holds.
+
+    Stops consuming ``stream`` and closes it as soon as the members parsed so
+    far satisfy ``enough``, which ends the generation on the provider's side.
+    Returns the fields and whether the stream was cut short. If the stream
+    ends without a well-formed object, the whole text is handed to
+    :func:`parse_json_response`.
+
+    Raises:
+        ValueError: If the response cannot be parsed as JSON.
+    """
+    reader = StreamingJSONObject()
+    try:
+        async for chunk in stream:
+            reader.feed(chunk)
+            if reader.fields and enough(reader.fields):
+                return reader.fields, not reader.complete
+            if reader.complete:
+                break
+    finally:
+        await stream.aclose()
+    if reader.complete:
+        return reader.fields, False
+    return parse_json_response(reader.text), False
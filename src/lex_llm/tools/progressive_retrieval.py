@@ -0,0 +1,351 @@
+"""Progressive hybrid retrieval with incremental RRF fusion.
+
+A batch search returns nothing until its slowest query is embedded. In
+progressive mode every query (or small shard of queries) is sent on its own
+via :meth:`LexDBConnector.progressive_hybrid_search`; each result list is
+folded into the running RRF scores as soon as it arrives, and an
+in-progress ``tool_result`` (plus a ``workflow_step`` with status
+``in_progress``) is emitted for it.
+
+Retrieval stops waiting once enough evidence is in:
+
+* always, when the top-k set can no longer change — each outstanding list
+  can add at most ``1 / (rrf_k + 1)`` to any chunk's score, so once the
+  k-th score leads the (k+1)-th by more than that bound times the number of
+  outstanding lists, the remaining lists cannot change which chunks are in
+  the top k;
+* optionally, once ``early_stop_fraction`` of the lists are in and the
+  latest list did not change the top-k set.
+"""
+
+import asyncio
+import math
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Any
+
+from lex_db_api.models.text_type import TextType
+
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
+from ..api.connectors.lex_db_connector import LexDBConnector
+from ..api.event_emitter import EventEmitter
+from ..api.event_models import WorkflowStepData
+from ..utils.retrieval_helpers import (
+    absorb_stage,
+    build_partial_retrieval_result,
+    build_retrieval_result,
+)
+from ..utils.rrf import RRFAccumulator
+from .llm_json import StreamingJSONObject
+
+
+@dataclass
+class ProgressiveResult:
+    """Outcome of a progressive retrieval round."""
+
+    semantic: list[ChunkBatch]
+    fulltext: list[ChunkBatch]
+    fused: ChunkBatch
+    lists_received: int
+    lists_total: int
+    stopped_early: bool = False
+
+
+async def progressive_hybrid_retrieval(
+    connector: LexDBConnector,
+    emitter: EventEmitter,
+    context: dict[str, Any],
+    name: str,
+    semantic_queries: list[tuple[str, TextType]],
+    keyword_queries: list[str],
+    *,
+    top_k: int,
+    top_k_semantic: int,
+    top_k_fts: int,
+    rrf_k: int,
+    index_name: str,
+    shard_size: int = 1,
+    early_stop_fraction: float | None = None,
+    cumulative: RRFAccumulator | None = None,
+) -> AsyncGenerator[str | ProgressiveResult, None]:
+    """Run one progressive retrieval round, yielding events as lists arrive.
+
+    Yields in-progress ``tool_result`` / ``workflow_step`` event strings,
+    then the final ``tool_result`` (same shape as the batch path, plus
+    progress fields) and finally a :class:`ProgressiveResult`. The round's
+    lists are also added to ``cumulative`` when given (see
+    :func:`absorb_stage`).
+    """
+    n_semantic = len(semantic_queries)
+    lists_total = n_semantic + len(keyword_queries)
+    fusion = RRFAccumulator(rrf_k)
+    semantic: list[ChunkBatch] = [ChunkBatch() for _ in semantic_queries]
+    fulltext: list[ChunkBatch] = [ChunkBatch() for _ in keyword_queries]
+    received = 0
+    stopped_early = False
+    top_keys: list[int] = []
+    step: WorkflowStepData | None = context.get("_current_step")
+
+    async with aclosing(
+        connector.progressive_hybrid_search(
+            semantic_queries=semantic_queries,
+            keyword_queries=keyword_queries,
+            top_k_semantic=top_k_semantic,
+            top_k_fts=top_k_fts,
+            index_name=index_name,
+            shard_size=shard_size,
+        )
+    ) as shards:
+        async for side, start, batches in shards:
+            for offset, batch in enumerate(batches):
+                i = start + offset
+                if side == "semantic":
+                    semantic[i] = batch
+                    fusion.add(batch, list_index=i)
+                else:
+                    fulltext[i] = batch
+                    fusion.add(batch, list_index=n_semantic + i)
+            received += len(batches)
+
+            previous_top, top_keys = top_keys, fusion.top_keys(top_k)
+            outstanding = lists_total - received
+            if outstanding == 0:
+                break
+
+            yield emitter.tool_result(
+                name=name,
+                result_data=build_partial_retrieval_result(
+                    fusion.fused(top_keys), rrf_k, received, lists_total
+                ),
+            )
+            if step is not None:
+                yield emitter.workflow_step(
+                    step.model_copy(
+                        update={
+                            "output": {
+                                "lists_received": received,
+                                "lists_total": lists_total,
+                            }
+                        }
+                    )
+                )
+
+            if fusion.top_k_settled(top_k, outstanding) or (
+                early_stop_fraction is not None
+                and received >= math.ceil(early_stop_fraction * lists_total)
+                and set(top_keys) == set(previous_top)
+            ):
+                stopped_early = True
+                break
+
+    fused = fusion.fused(top_keys)
+    result_data = build_retrieval_result(
+        ChunkBatch.concat(semantic), ChunkBatch.concat(fulltext), fused, rrf_k
+    )
+    result_data.update(
+        lists_received=received, lists_total=lists_total, stopped_early=stopped_early
+    )
+    if cumulative is not None:
+        result_data["cumulative"] = absorb_stage(
+            cumulative, [*semantic, *fulltext], top_k=top_k
+        )
+    yield emitter.tool_result(name=name, result_data=result_data)
+    yield ProgressiveResult(
+        semantic=semantic,
+        fulltext=fulltext,
+        fused=fused,
+        lists_received=received,
+        lists_total=lists_total,
+        stopped_early=stopped_early,
+    )
+
+
+@dataclass
+class PipelinedResult(ProgressiveResult):
+    """Outcome of a pipelined expansion round, with the queries it searched."""
+
+    semantic_queries: list[str] = field(default_factory=list)
+    keyword_queries: list[str] = field(default_factory=list)
+    dispatched_while_generating: int = 0
+
+
+# List indexes of full-text results start here, so fusion ranks ties as the
+# batch path does (every semantic list before every full-text list)
+_FULLTEXT_LIST_BASE = 1 << 20
+
+
+async def pipelined_expansion_retrieval(
+    connector: LexDBConnector,
+    emitter: EventEmitter,
+    context: dict[str, Any],
+    name: str,
+    expansion: AsyncGenerator[str, None],
+    *,
+    semantic_field: str,
+    keyword_field: str,
+    text_type: TextType,
+    fallback_semantic: list[str],
+    fallback_keywords: list[str],
+    top_k: int,
+    top_k_semantic: int,
+    top_k_fts: int,
+    rrf_k: int,
+    index_name: str,
+    cumulative: RRFAccumulator | None = None,
+) -> AsyncGenerator[str | PipelinedResult, None]:
+    """Search each query of a streamed expansion as soon as it is generated.
+
+    ``expansion`` is the streamed JSON reply of a query-expansion LLM call.
+    Every string element of its ``semantic_field`` and ``keyword_field``
+    arrays is sent to LexDB the moment the element closes, so embedding and
+    search overlap the rest of the generation, and each result list is
+    fused on arrival. The fallback queries are searched when the reply
+    yields none for a side (e.g. malformed JSON).
+
+    Yields events like :func:`progressive_hybrid_retrieval` (with
+    ``lists_total`` counting the lists dispatched so far) and finally a
+    :class:`PipelinedResult`. Once the generation has ended, retrieval stops
+    waiting as soon as the top-k set is settled.
+    """
+    reader = StreamingJSONObject()
+    fusion = RRFAccumulator(rrf_k)
+    semantic_queries: list[str] = []
+    keyword_queries: list[str] = []
+    semantic: list[ChunkBatch] = []
+    fulltext: list[ChunkBatch] = []
+    searches: dict[asyncio.Task[list[ChunkBatch]], tuple[str, int]] = {}
+    received = 0
+    stopped_early = False
+    top_keys: list[int] = []
+    step: WorkflowStepData | None = context.get("_current_step")
+
+    def _dispatch(side: str, query: str) -> None:
+        if side == "semantic":
+            semantic_queries.append(query)
+            semantic.append(ChunkBatch())
+            search = connector.batch_vector_search_columnar(
+                queries=[(query, text_type)],
+                top_k=top_k_semantic,
+                index_name=index_name,
+            )
+            searches[asyncio.create_task(search)] = (side, len(semantic) - 1)
+        else:
+            keyword_queries.append(query)
+            fulltext.append(ChunkBatch())
+            search = connector.batch_fulltext_search_columnar(
+                queries=[query], top_k=top_k_fts, index_name=index_name
+            )
+            searches[asyncio.create_task(search)] = (side, len(fulltext) - 1)
+
+    async def _generate() -> None:
+        sides = {semantic_field: "semantic", keyword_field: "fulltext"}
+        async with aclosing(expansion) as chunks:
+            async for chunk in chunks:
+                for member, element in reader.feed(chunk):
+                    if member in sides and isinstance(element, str) and element:
+                        _dispatch(sides[member], element)
+
+    generation = asyncio.create_task(_generate())
+    consumed: set[asyncio.Task[list[ChunkBatch]]] = set()
+    dispatched_while_generating = 0
+    try:
+        while True:
+            waiting: set[asyncio.Future[Any]] = {
+                task for task in searches if task not in consumed
+            }
+            if not generation.done():
+                waiting.add(generation)
+            elif not waiting:
+                break
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if generation in done:
+                generation.result()
+                dispatched_while_generating = len(searches)
+                if not semantic_queries:
+                    for query in fallback_semantic:
+                        _dispatch("semantic", query)
+                if not keyword_queries:
+                    for query in fallback_keywords:
+                        _dispatch("fulltext", query)
+
+            arrived = sorted(
+                (task for task in done if task is not generation),
+                key=searches.__getitem__,
+            )
+            if not arrived:
+                continue
+            for task in arrived:
+                consumed.add(task)
+                side, i = searches[task]
+                batch = next(iter(task.result()), ChunkBatch())
+                if side == "semantic":
+                    semantic[i] = batch
+                    fusion.add(batch, list_index=i)
+                else:
+                    fulltext[i] = batch
+                    fusion.add(batch, list_index=_FULLTEXT_LIST_BASE + i)
+            received += len(arrived)
+
+            top_keys = fusion.top_keys(top_k)
+            outstanding = len(searches) - received
+            if generation.done() and outstanding == 0:
+                break
+
+            yield emitter.tool_result(
+                name=name,
+                result_data=build_partial_retrieval_result(
+                    fusion.fused(top_keys), rrf_k, received, len(searches)
+                ),
+            )
+            if step is not None:
+                yield emitter.workflow_step(
+                    step.model_copy(
+                        update={
+                            "output": {
+                                "lists_received": received,
+                                "lists_total": len(searches),
+                            }
+                        }
+                    )
+                )
+
+            # Only once generation has ended is the number of lists known
+            if generation.done() and fusion.top_k_settled(top_k, outstanding):
+                stopped_early = True
+                break
+    finally:
+        unfinished = [generation, *(t for t in searches if t not in consumed)]
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+
+    fused = fusion.fused(top_keys) if top_keys else ChunkBatch()
+    result_data = build_retrieval_result(
+        ChunkBatch.concat(semantic), ChunkBatch.concat(fulltext), fused, rrf_k
+    )
+    result_data.update(
+        semantic_queries=semantic_queries,
+        keyword_queries=keyword_queries,
+        lists_received=received,
+        lists_total=len(searches),
+        dispatched_while_generating=dispatched_while_generating,
+        stopped_early=stopped_early,
+    )
+    if cumulative is not None:
+        result_data["cumulative"] = absorb_stage(
+            cumulative, [*semantic, *fulltext], top_k=top_k
+        )
+    yield emitter.tool_result(name=name, result_data=result_data)
+    yield PipelinedResult(
+        semantic=semantic,
+        fulltext=fulltext,
+        fused=fused,
+        lists_received=received,
+        lists_total=len(searches),
+        stopped_early=stopped_early,
+        semantic_queries=semantic_queries,
+        keyword_queries=keyword_queries,
+        dispatched_while_generating=dispatched_while_generating,
+    )
@@ -8,37 +8,67 @@ The three stages escalate in compute cost:
 Each stage evaluates relevance before escalating to the next.
 """
 
-from collections.abc import AsyncGenerator, Callable
+import time
+from collections.abc import AsyncGenerator, Callable, Mapping
+from contextlib import nullcontext
 from typing import Any
 
 from lex_db_api.models.text_type import TextType
 
 from ..api.event_emitter import EventEmitter
 from ..api.connectors.openai_provider import LLMProvider
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
 from ..api.connectors.lex_db_connector import (
+    LexArticle,
     LexDBConnector,
     LexChunk,
     group_chunks_to_articles,
 )
 from ..api.event_models import ConversationMessage
+from ..api.observability.step_telemetry import increment_step_counter
 from ..prompts_search_synthesis import (
     get_relevance_evaluation_prompt,
     get_intermediate_expansion_prompt,
     get_advanced_expansion_prompt,
+    get_wide_expansion_prompt,
 )
-from ..utils.rrf import reciprocal_rank_fusion
-from ..utils.retrieval_helpers import build_retrieval_result
+from ..utils.retrieval_helpers import (
+    FusedResult,
+    absorb_stage,
+    build_retrieval_result,
+    set_retrieval_context,
+)
+from ..utils.rrf import RRFAccumulator
 from ..utils.descriptions import build_search_description
-from .llm_json import parse_json_response
+from ..utils.adaptive_depth import AdaptiveDepth, label_lists
+from ..utils.latency_budget import LatencyBudget, shared_cost_model
+from ..utils.relevance_gate import RelevanceGate, query_terms, record_gate_decision
+from ..utils.speculation import Speculation
+from .federated_retrieval import (
+    FederatedResult,
+    federated_hybrid_retrieval,
+    index_names,
+)
+from .llm_json import parse_json_response, read_json_fields
+from .progressive_retrieval import (
+    PipelinedResult,
+    ProgressiveResult,
+    pipelined_expansion_retrieval,
+    progressive_hybrid_retrieval,
+)
 
 
-def _format_docs(chunks: list[LexChunk]) -> str:
+def _format_docs(chunks: list[LexChunk] | FusedResult) -> str:
     """Format retrieved chunks as a summary for the LLM.
 
     Chunks are grouped by article_id and each article gets its ID, title,
-    and a truncated excerpt from the combined chunk text.
+    and a truncated excerpt from the combined chunk text. A FusedResult's
+    memoised articles are reused.
     """
-    articles = group_chunks_to_articles(chunks)
+    if isinstance(chunks, FusedResult):
+        articles = chunks.articles
+    else:
+        articles = group_chunks_to_articles(chunks)
     lines = []
     for doc in articles:
         lines.append(f"*ID:* {doc.id} | *Titel:* {doc.title}\n*Tekst:* {doc.text}\n")
@@ -47,11 +77,24 @@ def _format_docs(chunks: list[LexChunk]) -> str:
 
 def retrieval_cascade(
     llm_provider: LLMProvider,
-    index_name: str = "article_embeddings_e5",
+    index_name: str | list[str] = "article_embeddings_e5",
     top_k: int = 10,
     top_k_semantic: int = 50,
     top_k_fts: int = 50,
     rrf_k: int = 60,
+    progressive: bool = False,
+    shard_size: int = 1,
+    early_stop_fraction: float | None = None,
+    hydrate: bool = False,
+    index_weights: Mapping[str, float] | None = None,
+    quorum: int | None = None,
+    speculative: bool = False,
+    speculative_search: bool = False,
+    relevance_gate: RelevanceGate | None = None,
+    pipelined_hyde: bool = False,
+    latency_budget: LatencyBudget | None = None,
+    wide: bool = False,
+    adaptive_depth: AdaptiveDepth | None = None,
 ) -> tuple[
     Callable[[dict[str, Any], EventEmitter], AsyncGenerator[str | None, None]], str
 ]:
@@ -66,12 +109,92 @@ def retrieval_cascade(
     3. advanced_retrieval — HyDE passages + broadened keyword queries, both generated
        in a single LLM call informed by the stage-2 relevance feedback.
 
+    With ``progressive=True`` each stage sends its queries in shards of
+    ``shard_size`` instead of one batch, fuses results as they arrive and
+    emits in-progress ``tool_result`` events; a stage stops waiting once the
+    top-k set is settled or, with ``early_stop_fraction``, once that share
+    of the result lists is in and the top-k set has stopped changing (see
+    ``progressive_retrieval``).
+
+    ``index_name`` may list several indexes, searched concurrently and fused
+    in one weighted RRF pass (``index_weights``, ``quorum``; see
+    ``federated_retrieval``). Progressive mode supports a single index.
+
+    Every stage's result lists are also folded into one cumulative RRF
+    fusion; each stage's ``tool_result`` reports under ``cumulative`` which
+    chunks it moved into or out of that fusion's top k. When all stages
+    fail, the cumulative top k is returned as the best effort.
+
+    With ``speculative=True`` the stage-2 query expansion starts alongside
+    the stage-1 relevance evaluation instead of after it, without the
+    stage-1 feedback, and ``speculative_search=True`` also runs its
+    searches ahead (not in progressive mode). The speculative work is
+    cancelled as soon as stage 1 is judged relevant; step telemetry reports
+    it under ``speculation`` (see ``utils/speculation.py``), including the
+    share of speculative time wasted.
+
+    With a ``relevance_gate``, each stage is first judged from retrieval
+    signals (agreement between semantic and full-text results, fused-score
+    lead, query terms in titles); the LLM relevance evaluation runs only
+    when the gate is unsure (see ``utils/relevance_gate.py``).
+
+    With ``pipelined_hyde=True`` the stage-3 expansion is streamed and each
+    HyDE passage and keyword query is searched as soon as the LLM has
+    written it, fusing results as they arrive instead of waiting for the
+    whole reply (single index only, see
+    ``progressive_retrieval.pipelined_expansion_retrieval``).
+
+    With a ``latency_budget``, stages 2 and 3 run only if their estimated
+    cost (rolling percentiles of recent expansion, search and relevance
+    times) fits in what is left of the budget. Otherwise the step returns
+    the cumulative top k, as an answer or as insufficient context depending
+    on ``LatencyBudget.on_exhausted``. Each decision is emitted as a
+    ``latency_budget`` tool_result with its accounting (see
+    ``utils/latency_budget.py``).
+
+    With ``hydrate=True`` the final ``retrieved_docs`` take their titles and
+    URLs from the full article records (one cached ``get_articles`` call per
+    run, see ``LexDBConnector.hydrate_articles``).
+
+    With ``wide=True`` the step makes a single round instead: one LLM call
+    generates subqueries, keyword queries and HyDE passages together, all of
+    them (plus the raw queries) are searched concurrently and fused once, and
+    one relevance evaluation decides between success and insufficient
+    context. This bounds the sequential LLM round trips at two, at the cost
+    of searching for every query even on easy inputs. Speculation,
+    pipelined HyDE and ``latency_budget`` do not apply and are rejected.
+
+    With ``adaptive_depth``, searches request only as many rows per list as
+    recent runs needed to fill the fused top k (plus a margin), with
+    ``top_k_semantic`` and ``top_k_fts`` as the ceiling, and are run again
+    at the ceiling when the results look thin (see
+    ``utils/adaptive_depth.py``). Not in progressive mode.
+
     Sets context keys:
         - retrieved_chunks: list[LexChunk] — the final fused chunks, sorted by RRF score
         - retrieved_docs: list[LexArticle] — chunks grouped into articles for downstream
+        - fused_result: FusedResult — memoised views of the final fused chunks
         - insufficient_context: bool — True if all three stages failed to find relevant results
         - insufficient_context_reason: str — reason for insufficient context (if applicable)
     """
+    indexes = index_names(index_name)
+    if progressive and len(indexes) > 1:
+        raise ValueError("Progressive retrieval supports a single index")
+    if progressive and speculative_search:
+        raise ValueError("Speculative search is not supported in progressive mode")
+    if pipelined_hyde and len(indexes) > 1:
+        raise ValueError("Pipelined HyDE supports a single index")
+    if wide and (speculative or pipelined_hyde):
+        raise ValueError("Wide retrieval does not support speculative or pipelined")
+    if wide and latency_budget is not None:
+        raise ValueError("Wide retrieval has no later stages to skip for a budget")
+    if progressive and adaptive_depth is not None:
+        raise ValueError("Adaptive depth is not supported in progressive mode")
+    costs = shared_cost_model(
+        getattr(llm_provider, "model", type(llm_provider).__name__)
+    )
+    if latency_budget is not None and latency_budget.costs is not None:
+        costs = latency_budget.costs
 
     async def _retrieval_cascade(
         context: dict[str, Any], emitter: EventEmitter
@@ -80,15 +203,276 @@ def retrieval_cascade(
         if context.get("_workflow_done"):
             return
 
+        started = time.perf_counter()
         user_input: str = context.get("user_input", "")
         interpretation: str = context.get("query_interpretation", user_input)
         keywords: list[str] = context.get("keywords", [user_input])
         queries: list[str] = context.get("subqueries", [user_input])
 
         connector = LexDBConnector()
-        best_chunks: list[LexChunk] = []
+        # Every stage's lists, fused across stages
+        cumulative = RRFAccumulator(rrf_k)
         best_relevance_reason = ""
 
+        async def _hydrated(fused: FusedResult) -> list[LexArticle] | None:
+            """Hydrated articles for ``fused``, or ``None`` unless ``hydrate``."""
+            return await connector.hydrate_articles(fused.batch) if hydrate else None
+
+        # Each stage's semantic and full-text lists and fusion weights (None
+        # when unweighted), for the relevance gate
+        stage_lists: dict[
+            str, tuple[list[ChunkBatch], list[ChunkBatch], list[float] | None]
+        ] = {}
+        gate_terms = query_terms([user_input, *keywords])
+
+        async def _evaluate(
+            name: str, fused: FusedResult
+        ) -> AsyncGenerator[dict[str, Any] | str, None]:
+            """Judge a stage's results: by the gate if it is sure, else the LLM.
+
+            Yields events, then the ``relevance_evaluation`` result dict.
+            """
+            decision = None
+            if relevance_gate is not None and fused:
+                semantic, fulltext, list_weights = stage_lists.get(name, ([], [], None))
+                decision = relevance_gate.decide(
+                    fused, semantic, fulltext, gate_terms, list_weights
+                )
+                if decision.verdict != "uncertain" and not relevance_gate.shadow:
+                    record_gate_decision(name, decision, llm_verdict=None)
+                    accepted = decision.verdict == "accept"
+                    result_data = {
+                        "is_relevant": accepted,
+                        "reason": "" if accepted else _GATE_REJECT_REASON,
+                        "suggested_query_refinement": "",
+                        "gate": decision.to_dict(),
+                    }
+                    yield emitter.tool_call(
+                        name="relevance_evaluation",
+                        input_data={
+                            "user_input": user_input,
+                            "interpretation": interpretation,
+                            "method": "gate",
+                        },
+                        description="Vurderer om resultaterne er relevante",
+                    )
+                    yield emitter.tool_result(
+                        name="relevance_evaluation", result_data=result_data
+                    )
+                    yield result_data
+                    return
+
+            # Only the LLM check is a relevance cost; a gate verdict is free
+            with costs.timed(name, "relevance"):
+                async for result in _run_relevance_evaluation(
+                    llm_provider=llm_provider,
+                    user_input=user_input,
+                    interpretation=interpretation,
+                    fused_chunks=fused,
+                    emitter=emitter,
+                ):
+                    if isinstance(result, dict) and decision is not None:
+                        record_gate_decision(name, decision, result["is_relevant"])
+                    yield result
+
+        async def _over_budget(
+            name: str, phases: tuple[str, ...]
+        ) -> AsyncGenerator[str | bool, None]:
+            """Skip stage ``name`` if it does not fit in the latency budget.
+
+            Yields events, then whether the stage was skipped; if it was, the
+            best result so far has been written to the context.
+            """
+            if latency_budget is None:
+                yield False
+                return
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            decision = latency_budget.decide(name, phases, elapsed_ms, costs)
+            yield emitter.tool_call(
+                name="latency_budget",
+                input_data={"next_stage": name, "budget_ms": latency_budget.budget_ms},
+                description="Vurderer om der er tid til en søgning mere",
+            )
+            yield emitter.tool_result(
+                name="latency_budget", result_data=decision.to_dict()
+            )
+            if decision.proceed:
+                yield False
+                return
+
+            best = FusedResult(cumulative.top_k(top_k), rrf_k)
+            docs = await _hydrated(best)
+            if latency_budget.on_exhausted == "best_so_far" and best:
+                _set_context_success(context, best, docs)
+            else:
+                set_retrieval_context(context, best, docs)
+                context["insufficient_context"] = True
+                context["insufficient_context_reason"] = (
+                    best_relevance_reason or _BUDGET_REASON
+                )
+            yield True
+
+        async def _federated(
+            semantic_queries: list[tuple[str, TextType]],
+            keyword_queries: list[str],
+            depths: tuple[int, int],
+        ) -> FederatedResult:
+            return await federated_hybrid_retrieval(
+                connector,
+                semantic_queries=semantic_queries,
+                keyword_queries=keyword_queries,
+                index_names=indexes,
+                index_weights=index_weights,
+                quorum=quorum,
+                top_k=top_k,
+                top_k_semantic=depths[0],
+                top_k_fts=depths[1],
+                rrf_k=rrf_k,
+            )
+
+        async def _search(
+            semantic_queries: list[tuple[str, TextType]],
+            keyword_queries: list[str],
+        ) -> FederatedResult:
+            ceiling = (top_k_semantic, top_k_fts)
+            if adaptive_depth is None:
+                return await _federated(semantic_queries, keyword_queries, ceiling)
+
+            depths = adaptive_depth.depths(semantic_queries, indexes, *ceiling)
+            result = await _federated(semantic_queries, keyword_queries, depths)
+            lists = label_lists(
+                semantic_queries,
+                len(keyword_queries),
+                result.indexes,
+                result.lists,
+                *depths,
+            )
+            widened = depths != ceiling and adaptive_depth.is_thin(
+                lists, result.fused, top_k
+            )
+            if widened:
+                result = await _federated(semantic_queries, keyword_queries, ceiling)
+                lists = label_lists(
+                    semantic_queries,
+                    len(keyword_queries),
+                    result.indexes,
+                    result.lists,
+                    *ceiling,
+                )
+            adaptive_depth.observe(lists, result.fused, widened)
+            return result
+
+        async def _retrieve(
+            name: str,
+            semantic_queries: list[tuple[str, TextType]],
+            keyword_queries: list[str],
+            prefetched: FederatedResult | None = None,
+        ) -> AsyncGenerator[str | FusedResult, None]:
+            """Search and fuse one stage; yields events, then the fused result.
+
+            ``prefetched`` is the stage's search, already run speculatively.
+            """
+            if progressive:
+                async for item in progressive_hybrid_retrieval(
+                    connector,
+                    emitter,
+                    context,
+                    name,
+                    semantic_queries,
+                    keyword_queries,
+                    top_k=top_k,
+                    top_k_semantic=top_k_semantic,
+                    top_k_fts=top_k_fts,
+                    rrf_k=rrf_k,
+                    index_name=indexes[0],
+                    shard_size=shard_size,
+                    early_stop_fraction=early_stop_fraction,
+                    cumulative=cumulative,
+                ):
+                    if isinstance(item, ProgressiveResult):
+                        stage_lists[name] = (item.semantic, item.fulltext, None)
+                        yield FusedResult(item.fused, rrf_k)
+                    else:
+                        yield item
+                return
+
+            result = prefetched or await _search(semantic_queries, keyword_queries)
+            stage_lists[name] = (result.semantic, result.fulltext, result.weights)
+
+            fused = FusedResult(result.fused, rrf_k)
+            result_data = build_retrieval_result(
+                ChunkBatch.concat(result.semantic),
+                ChunkBatch.concat(result.fulltext),
+                fused,
+                rrf_k,
+            )
+            if len(indexes) > 1:
+                result_data["indexes"] = result.indexes
+            result_data["cumulative"] = absorb_stage(
+                cumulative, result.lists, result.weights, top_k=top_k
+            )
+            yield emitter.tool_result(name=name, result_data=result_data)
+            yield fused
+
+        if wide:
+            # ------------------------------------------------------------ #
+            # wide_retrieval — one expansion call, one search round, one   #
+            # relevance decision.                                          #
+            # ------------------------------------------------------------ #
+            wide_queries, wide_keywords, passages = await _wide_expansion(
+                llm_provider=llm_provider,
+                user_input=user_input,
+                interpretation=interpretation,
+            )
+            short_queries = list(dict.fromkeys([*queries, *wide_queries]))
+            keyword_queries = list(dict.fromkeys([*keywords, *wide_keywords]))
+
+            yield emitter.tool_call(
+                name="wide_retrieval",
+                input_data={
+                    "semantic_queries": short_queries,
+                    "keyword_queries": keyword_queries,
+                    "passages": passages,
+                },
+                description=build_search_description(
+                    keywords=keyword_queries,
+                    queries=short_queries,
+                ),
+            )
+
+            stage = "wide_retrieval"
+            fused_chunks = FusedResult(ChunkBatch(), rrf_k)
+            async for item in _retrieve(
+                stage,
+                [(q, TextType.QUERY) for q in short_queries]
+                + [(p, TextType.PASSAGE) for p in passages],
+                keyword_queries,
+            ):
+                if isinstance(item, FusedResult):
+                    fused_chunks = item
+                else:
+                    yield item
+
+            is_relevant = False
+            reason = ""
+            async for result in _evaluate(stage, fused_chunks):
+                if isinstance(result, dict):
+                    is_relevant = result["is_relevant"]
+                    reason = result["reason"]
+                else:
+                    yield result
+
+            docs = await _hydrated(fused_chunks)
+            if is_relevant:
+                _set_context_success(context, fused_chunks, docs)
+                return
+            set_retrieval_context(context, fused_chunks, docs)
+            context["insufficient_context"] = True
+            context["insufficient_context_reason"] = (
+                reason or "Søgningen fandt ikke tilstrækkeligt relevante artikler"
+            )
+            return
+
         # ------------------------------------------------------------------ #
         # Stage 1 — simple_retrieval                                          #
         # Raw user query used directly for both semantic and FTS search.      #
@@ -105,72 +489,109 @@ def retrieval_cascade(
             ),
         )
 
-        semantic_chunks = await connector.batch_vector_search(
-            queries=[(q, TextType.QUERY) for q in queries],
-            top_k=top_k_semantic,
-            index_name=index_name,
-        )
-        fts_chunks = await connector.batch_fulltext_search(
-            queries=keywords,
-            top_k=top_k_fts,
-            index_name=index_name,
-        )
-        fused_chunks = reciprocal_rank_fusion(
-            *semantic_chunks,
-            *fts_chunks,
-            k=rrf_k,
-        )[:top_k]
-
-        yield emitter.tool_result(
-            name="simple_retrieval",
-            result_data=build_retrieval_result(
-                [c for qs in semantic_chunks for c in qs],
-                [c for qs in fts_chunks for c in qs],
-                fused_chunks,
-                rrf_k,
-            ),
+        stage = "simple_retrieval"
+        fused_chunks = FusedResult(ChunkBatch(), rrf_k)
+        with costs.timed(stage, "search"):
+            async for item in _retrieve(
+                stage,
+                [(q, TextType.QUERY) for q in queries],
+                keywords,
+            ):
+                if isinstance(item, FusedResult):
+                    fused_chunks = item
+                else:
+                    yield item
+
+        async def _speculative_stage2() -> tuple[
+            list[str], list[str], FederatedResult | None
+        ]:
+            """Stage-2 expansion (and searches) run before stage 1 is judged.
+
+            Each phase records its own cost as it completes.
+            """
+            with costs.timed("intermediate_retrieval", "expansion"):
+                semantic, keyword = await _intermediate_expansion(
+                    llm_provider=llm_provider,
+                    user_input=user_input,
+                    interpretation=interpretation,
+                    relevance_feedback=_SPECULATIVE_FEEDBACK,
+                )
+            if not speculative_search:
+                return semantic, keyword, None
+            with costs.timed("intermediate_retrieval", "search"):
+                prefetched = await _search(
+                    [(q, TextType.QUERY) for q in semantic], keyword
+                )
+            return semantic, keyword, prefetched
+
+        # Overlaps the stage-1 relevance evaluation's LLM round trip
+        speculation = (
+            Speculation(_speculative_stage2(), "intermediate_retrieval")
+            if speculative and fused_chunks
+            else None
         )
 
-        if fused_chunks:
-            best_chunks = fused_chunks
-
-        is_relevant: bool = False
-        reason: str = ""
+        is_relevant = False
+        reason = ""
         refinement: str = ""
-        async for result in _run_relevance_evaluation(
-            llm_provider=llm_provider,
-            user_input=user_input,
-            interpretation=interpretation,
-            fused_chunks=fused_chunks,
-            emitter=emitter,
-        ):
-            if isinstance(result, dict):
-                is_relevant = result["is_relevant"]
-                reason = result["reason"]
-                refinement = result["suggested_query_refinement"]
+        prefetched: FederatedResult | None = None
+        # Until its result is claimed, the speculation is cancelled on every
+        # way out: stage 1 sufficed, the stage was skipped or the consumer
+        # closed the step at one of the yields below.
+        try:
+            async for result in _evaluate(stage, fused_chunks):
+                if isinstance(result, dict):
+                    is_relevant = result["is_relevant"]
+                    reason = result["reason"]
+                    refinement = result["suggested_query_refinement"]
+                else:
+                    yield result
+
+            if is_relevant:
+                if speculation is not None:
+                    speculation.cancel()
+                _set_context_success(
+                    context, fused_chunks, await _hydrated(fused_chunks)
+                )
+                return
+
+            best_relevance_reason = reason
+
+            # -------------------------------------------------------------- #
+            # Stage 2 — intermediate_retrieval                                #
+            # Short semantic subqueries + expanded keyword queries, both from #
+            # a single LLM call informed by stage-1 relevance feedback.       #
+            # -------------------------------------------------------------- #
+            stage = "intermediate_retrieval"
+            skipped = False
+            async for budget_event in _over_budget(stage, _STAGE_PHASES):
+                if isinstance(budget_event, bool):
+                    skipped = budget_event
+                else:
+                    yield budget_event
+            if skipped:
+                return
+
+            if speculation is not None:
+                (
+                    intermediate_semantic_queries,
+                    expanded_keyword_queries,
+                    prefetched,
+                ) = await speculation.result()
             else:
-                yield result
-
-        if is_relevant:
-            _set_context_success(context, fused_chunks)
-            return
-
-        best_relevance_reason = reason
-
-        # ------------------------------------------------------------------ #
-        # Stage 2 — intermediate_retrieval                                    #
-        # Short semantic subqueries + expanded keyword queries, both from     #
-        # a single LLM call informed by stage-1 relevance feedback.           #
-        # ------------------------------------------------------------------ #
-        (
-            intermediate_semantic_queries,
-            expanded_keyword_queries,
-        ) = await _intermediate_expansion(
-            llm_provider=llm_provider,
-            user_input=user_input,
-            interpretation=interpretation,
-            relevance_feedback=reason,
-        )
+                with costs.timed(stage, "expansion"):
+                    (
+                        intermediate_semantic_queries,
+                        expanded_keyword_queries,
+                    ) = await _intermediate_expansion(
+                        llm_provider=llm_provider,
+                        user_input=user_input,
+                        interpretation=interpretation,
+                        relevance_feedback=reason,
+                    )
+        finally:
+            if speculation is not None:
+                speculation.cancel()
 
         yield emitter.tool_call(
             name="intermediate_retrieval",
@@ -178,6 +599,7 @@ def retrieval_cascade(
                 "semantic_queries": intermediate_semantic_queries,
                 "keyword_queries": expanded_keyword_queries,
                 "relevance_feedback": reason,
+                "speculative": speculation is not None,
             },
             description=build_search_description(
                 keywords=expanded_keyword_queries,
@@ -185,42 +607,20 @@ def retrieval_cascade(
             ),
         )
 
-        semantic_chunks = await connector.batch_vector_search(
-            queries=[(q, TextType.QUERY) for q in intermediate_semantic_queries],
-            top_k=top_k_semantic,
-            index_name=index_name,
-        )
-        fts_chunks = await connector.batch_fulltext_search(
-            queries=expanded_keyword_queries,
-            top_k=top_k_fts,
-            index_name=index_name,
-        )
-        fused_chunks = reciprocal_rank_fusion(
-            *semantic_chunks,
-            *fts_chunks,
-            k=rrf_k,
-        )[:top_k]
-
-        yield emitter.tool_result(
-            name="intermediate_retrieval",
-            result_data=build_retrieval_result(
-                [c for qs in semantic_chunks for c in qs],
-                [c for qs in fts_chunks for c in qs],
-                fused_chunks,
-                rrf_k,
-            ),
-        )
-
-        if len(fused_chunks) > len(best_chunks):
-            best_chunks = fused_chunks
-
-        async for result in _run_relevance_evaluation(
-            llm_provider=llm_provider,
-            user_input=user_input,
-            interpretation=interpretation,
-            fused_chunks=fused_chunks,
-            emitter=emitter,
-        ):
+        # A prefetched search was timed as the speculation ran
+        with costs.timed(stage, "search") if prefetched is None else nullcontext():
+            async for item in _retrieve(
+                stage,
+                [(q, TextType.QUERY) for q in intermediate_semantic_queries],
+                expanded_keyword_queries,
+                prefetched,
+            ):
+                if isinstance(item, FusedResult):
+                    fused_chunks = item
+                else:
+                    yield item
+
+        async for result in _evaluate(stage, fused_chunks):
             if isinstance(result, dict):
                 is_relevant = result["is_relevant"]
                 reason = result["reason"]
@@ -229,7 +629,7 @@ def retrieval_cascade(
                 yield result
 
         if is_relevant:
-            _set_context_success(context, fused_chunks)
+            _set_context_success(context, fused_chunks, await _hydrated(fused_chunks))
             return
 
         best_relevance_reason = reason
@@ -239,64 +639,92 @@ def retrieval_cascade(
         # HyDE passages + broadened keyword queries, both from a single LLM   #
         # call informed by stage-2 relevance feedback.                        #
         # ------------------------------------------------------------------ #
-        hyde_passages, broadened_keyword_queries = await _advanced_expansion(
-            llm_provider=llm_provider,
-            user_input=user_input,
-            interpretation=interpretation,
-            previous_semantic_queries=intermediate_semantic_queries,
-            previous_keyword_queries=expanded_keyword_queries,
-            refinement_suggestion=refinement or reason,
-        )
-
-        yield emitter.tool_call(
-            name="advanced_retrieval",
-            input_data={
-                "semantic_queries": hyde_passages,
-                "keyword_queries": broadened_keyword_queries,
-                "relevance_feedback": reason,
-            },
-            description=build_search_description(
-                keywords=broadened_keyword_queries,
-                queries=hyde_passages,
-            ),
-        )
-
-        semantic_chunks = await connector.batch_vector_search(
-            queries=[(p, TextType.PASSAGE) for p in hyde_passages],
-            top_k=top_k_semantic,
-            index_name=index_name,
-        )
-        fts_chunks = await connector.batch_fulltext_search(
-            queries=broadened_keyword_queries,
-            top_k=top_k_fts,
-            index_name=index_name,
-        )
-        fused_chunks = reciprocal_rank_fusion(
-            *semantic_chunks,
-            *fts_chunks,
-            k=rrf_k,
-        )[:top_k]
-
-        yield emitter.tool_result(
-            name="advanced_retrieval",
-            result_data=build_retrieval_result(
-                [c for qs in semantic_chunks for c in qs],
-                [c for qs in fts_chunks for c in qs],
-                fused_chunks,
-                rrf_k,
-            ),
-        )
-
-        if len(fused_chunks) > len(best_chunks):
-            best_chunks = fused_chunks
+        stage = "advanced_retrieval"
+        skipped = False
+        phases = _PIPELINED_STAGE_PHASES if pipelined_hyde else _STAGE_PHASES
+        async for budget_event in _over_budget(stage, phases):
+            if isinstance(budget_event, bool):
+                skipped = budget_event
+            else:
+                yield budget_event
+        if skipped:
+            return
 
-        async for result in _run_relevance_evaluation(
-            llm_provider=llm_provider,
-            user_input=user_input,
-            interpretation=interpretation,
-            fused_chunks=fused_chunks,
-            emitter=emitter,
-        ):
+        if pipelined_hyde:
+            yield emitter.tool_call(
+                name=stage,
+                input_data={"relevance_feedback": reason, "pipelined": True},
+                description="Skriver hypotetiske afsnit og søger efter hvert af dem",
+            )
+            expansion = llm_provider.generate_stream(
+                _advanced_expansion_messages(
+                    user_input=user_input,
+                    interpretation=interpretation,
+                    previous_semantic_queries=intermediate_semantic_queries,
+                    previous_keyword_queries=expanded_keyword_queries,
+                    refinement_suggestion=refinement or reason,
+                )
+            )
+            with costs.timed(stage, "pipelined_search"):
+                async for update in pipelined_expansion_retrieval(
+                    connector,
+                    emitter,
+                    context,
+                    stage,
+                    expansion,
+                    semantic_field="passages",
+                    keyword_field="keyword_queries",
+                    text_type=TextType.PASSAGE,
+                    fallback_semantic=[interpretation],
+                    fallback_keywords=expanded_keyword_queries,
+                    top_k=top_k,
+                    top_k_semantic=top_k_semantic,
+                    top_k_fts=top_k_fts,
+                    rrf_k=rrf_k,
+                    index_name=indexes[0],
+                    cumulative=cumulative,
+                ):
+                    if isinstance(update, PipelinedResult):
+                        stage_lists[stage] = (update.semantic, update.fulltext, None)
+                        fused_chunks = FusedResult(update.fused, rrf_k)
+                    else:
+                        yield update
+        else:
+            with costs.timed(stage, "expansion"):
+                hyde_passages, broadened_keyword_queries = await _advanced_expansion(
+                    llm_provider=llm_provider,
+                    user_input=user_input,
+                    interpretation=interpretation,
+                    previous_semantic_queries=intermediate_semantic_queries,
+                    previous_keyword_queries=expanded_keyword_queries,
+                    refinement_suggestion=refinement or reason,
+                )
+
+            yield emitter.tool_call(
+                name=stage,
+                input_data={
+                    "semantic_queries": hyde_passages,
+                    "keyword_queries": broadened_keyword_queries,
+                    "relevance_feedback": reason,
+                },
+                description=build_search_description(
+                    keywords=broadened_keyword_queries,
+                    queries=hyde_passages,
+                ),
+            )
+
+            with costs.timed(stage, "search"):
+                async for item in _retrieve(
+                    stage,
+                    [(p, TextType.PASSAGE) for p in hyde_passages],
+                    broadened_keyword_queries,
+                ):
+                    if isinstance(item, FusedResult):
+                        fused_chunks = item
+                    else:
+                        yield item
+
+        async for result in _evaluate(stage, fused_chunks):
             if isinstance(result, dict):
                 is_relevant = result["is_relevant"]
                 reason = result["reason"]
@@ -305,14 +733,14 @@ def retrieval_cascade(
                 yield result
 
         if is_relevant:
-            _set_context_success(context, fused_chunks)
+            _set_context_success(context, fused_chunks, await _hydrated(fused_chunks))
             return
 
         best_relevance_reason = reason or best_relevance_reason
 
-        # --- All stages exhausted ---
-        context["retrieved_chunks"] = best_chunks
-        context["retrieved_docs"] = group_chunks_to_articles(best_chunks)
+        # --- All stages exhausted: fall back to the cross-stage fusion ---
+        best = FusedResult(cumulative.top_k(top_k), rrf_k)
+        set_retrieval_context(context, best, await _hydrated(best))
         context["insufficient_context"] = True
         context["insufficient_context_reason"] = (
             best_relevance_reason
@@ -327,10 +755,47 @@ def retrieval_cascade(
 # ---------------------------------------------------------------------------
 
 
-def _set_context_success(context: dict[str, Any], chunks: list[LexChunk]) -> None:
-    """Write successful retrieval results into the workflow context."""
-    context["retrieved_chunks"] = chunks
-    context["retrieved_docs"] = group_chunks_to_articles(chunks)
+def _verdict_is_relevant(fields: dict[str, Any]) -> bool:
+    """Whether a partly streamed verdict already settles relevance."""
+    return fields.get("is_relevant") is True
+
+
+# Phases whose costs make up a stage's estimate (see utils/latency_budget.py)
+_STAGE_PHASES = ("expansion", "search", "relevance")
+_PIPELINED_STAGE_PHASES = ("pipelined_search", "relevance")
+
+# Insufficient-context reason when the budget ran out before a relevant stage
+_BUDGET_REASON = (
+    "Der var ikke tid til flere søgninger, og de hidtidige resultater blev "
+    "ikke vurderet som relevante"
+)
+
+# Relevance feedback for the next stage when the gate rejects a stage
+_GATE_REJECT_REASON = (
+    "Semantisk søgning og fritekstsøgning fandt ikke de samme artikler, og "
+    "titlerne nævner ikke emnet"
+)
+
+# Stands in for the stage-1 relevance feedback when stage 2 is expanded
+# before stage 1 has been judged
+_SPECULATIVE_FEEDBACK = (
+    "Den første søgning med brugerens input er endnu ikke vurderet. Foreslå "
+    "underspørgsmål og nøgleord, der dækker andre formuleringer, synonymer og "
+    "vinkler på emnet end det oprindelige input."
+)
+
+
+def _set_context_success(
+    context: dict[str, Any],
+    fused: FusedResult,
+    docs: list[LexArticle] | None = None,
+) -> None:
+    """Write successful retrieval results into the workflow context.
+
+    ``docs`` (e.g. hydrated articles) replaces the articles grouped from
+    ``fused``.
+    """
+    set_retrieval_context(context, fused, docs)
     context["insufficient_context"] = False
 
 
@@ -338,7 +803,7 @@ async def _run_relevance_evaluation(
     llm_provider: LLMProvider,
     user_input: str,
     interpretation: str,
-    fused_chunks: list[LexChunk],
+    fused_chunks: list[LexChunk] | FusedResult,
     emitter: EventEmitter,
 ) -> AsyncGenerator[dict[str, Any] | str, None]:
     """Call the LLM to evaluate relevance and yield events in real-time.
@@ -348,6 +813,11 @@ async def _run_relevance_evaluation(
     immediately. The final yield is the ``result_data`` dict containing
     ``is_relevant``, ``reason``, and ``suggested_query_refinement``.
 
+    The verdict is read from the streamed completion; once ``is_relevant``
+    arrives as true the generation is cancelled, since the reason and
+    refinement only matter on a miss. Step telemetry counts such early
+    stops under ``llm_early_stop``.
+
     Yields a result dict with ``is_relevant=False`` when there are no chunks
     to avoid infinite escalation.
     """
@@ -380,10 +850,13 @@ async def _run_relevance_evaluation(
         ConversationMessage(role=m["role"], content=m["content"])  # type: ignore
         for m in eval_messages
     ]
-    eval_response = await llm_provider.generate(llm_eval_messages)
-
     try:
-        eval_result = parse_json_response(eval_response)
+        # A positive verdict is final; stop generating the unused reason
+        eval_result, stopped_early = await read_json_fields(
+            llm_provider.generate_stream(llm_eval_messages), _verdict_is_relevant
+        )
+        increment_step_counter("llm_early_stop", "calls")
+        increment_step_counter("llm_early_stop", "stopped", int(stopped_early))
         is_relevant: bool = eval_result.get("is_relevant", False)
         reason: str = eval_result.get("reason", "")
         refinement: str = eval_result.get("suggested_query_refinement", "")
@@ -449,17 +922,13 @@ async def _advanced_expansion(
 
     HyDE passages are longer hypothetical encyclopedia paragraphs used for semantic search.
     """
-    messages = get_advanced_expansion_prompt(
+    llm_messages = _advanced_expansion_messages(
         user_input=user_input,
         interpretation=interpretation,
         previous_semantic_queries=previous_semantic_queries,
         previous_keyword_queries=previous_keyword_queries,
         refinement_suggestion=refinement_suggestion,
     )
-    llm_messages = [
-        ConversationMessage(role=m["role"], content=m["content"])  # type: ignore
-        for m in messages
-    ]
     response = await llm_provider.generate(llm_messages)
     response = response.strip()
     try:
@@ -472,3 +941,52 @@ async def _advanced_expansion(
         passages = [interpretation]
         keyword_queries = previous_keyword_queries
     return passages, keyword_queries
+
+
+async def _wide_expansion(
+    llm_provider: LLMProvider,
+    user_input: str,
+    interpretation: str,
+) -> tuple[list[str], list[str], list[str]]:
+    """Single LLM call that returns (semantic_subqueries, keyword_queries, hyde_passages).
+
+    On a malformed reply the raw queries alone are searched.
+    """
+    messages = get_wide_expansion_prompt(
+        user_input=user_input,
+        interpretation=interpretation,
+    )
+    llm_messages = [
+        ConversationMessage(role=m["role"], content=m["content"])  # type: ignore
+        for m in messages
+    ]
+    response = await llm_provider.generate(llm_messages)
+    try:
+        result = parse_json_response(response)
+        semantic_queries: list[str] = result.get("semantic_queries", [])
+        keyword_queries: list[str] = result.get("keyword_queries", [])
+        passages: list[str] = result.get("passages", [])
+    except ValueError:
+        return [], [], []
+    return semantic_queries, keyword_queries, passages
+
+
+def _advanced_expansion_messages(
+    user_input: str,
+    interpretation: str,
+    previous_semantic_queries: list[str],
+    previous_keyword_queries: list[str],
+    refinement_suggestion: str,
+) -> list[ConversationMessage]:
+    """The stage-3 expansion prompt as conversation messages."""
+    messages = get_advanced_expansion_prompt(
+        user_input=user_input,
+        interpretation=interpretation,
+        previous_semantic_queries=previous_semantic_queries,
+        previous_keyword_queries=previous_keyword_queries,
+        refinement_suggestion=refinement_suggestion,
+    )
+    return [
+        ConversationMessage(role=m["role"], content=m["content"])  # type: ignore
+        for m in messages
+    ]
@@ -9,8 +9,9 @@ Stages:
 2. corrective intermediate — only when stage 1 fails; driven by expansion
    queries returned from the merged eval+expand call
 
-A cumulative chunk pool across all stages is RRF-fused at the end, so chunks
-appearing in both stages get reinforced.
+Result lists from every stage are folded into one incremental RRF fusion
+(``RRFAccumulator``), so chunks appearing in both stages get reinforced
+without re-fusing stage 1's lists.
 """
 
 from collections.abc import AsyncGenerator, Callable
@@ -20,21 +21,25 @@ from lex_db_api.models.text_type import TextType
 
 from ..api.event_emitter import EventEmitter
 from ..api.connectors.openai_provider import LLMProvider
-from ..api.connectors.lex_db_connector import (
-    LexDBConnector,
-    LexChunk,
-    group_chunks_to_articles,
-)
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
+from ..api.connectors.lex_db_connector import LexDBConnector
 from ..api.event_models import ConversationMessage
+from ..api.observability.step_telemetry import increment_step_counter
 from ..prompts_search_synthesis import get_evaluate_and_expand_prompt
-from ..utils.rrf import reciprocal_rank_fusion
-from ..utils.retrieval_helpers import build_retrieval_result
+from ..utils.rrf import RRFAccumulator
+from ..utils.retrieval_helpers import (
+    FusedResult,
+    absorb_stage,
+    build_retrieval_result,
+    set_retrieval_context,
+)
 from ..utils.descriptions import build_search_description
-from .llm_json import parse_json_response
+from .llm_json import read_json_fields
 from .retrieval_cascade import (
     _format_docs,
     _run_relevance_evaluation,
     _set_context_success,
+    _verdict_is_relevant,
 )
 
 
@@ -55,8 +60,9 @@ def retrieval_cascade_fast(
     LLM call decides relevance and, when needed, emits corrective queries
     for a second retrieval pass.
 
-    Cumulative raw result lists from both stages are RRF-fused so chunks
-    appearing in both get reinforced.
+    Raw result lists from both stages are RRF-fused cumulatively so chunks
+    appearing in both get reinforced; each stage's ``tool_result`` reports
+    under ``cumulative`` which chunks it moved into or out of the top k.
 
     Sets context keys:
         - retrieved_chunks: list[LexChunk]
@@ -77,8 +83,8 @@ def retrieval_cascade_fast(
         queries: list[str] = context.get("subqueries", [user_input])
 
         connector = LexDBConnector()
-        # Cumulative pool of raw ranked result lists for RRF
-        chunk_pool: list[list[LexChunk]] = []
+        # Raw ranked result lists of every stage, fused incrementally
+        cumulative = RRFAccumulator(rrf_k)
 
         # ---------------------------------------------------------------- #
         # Stage 1 — simple_retrieval                                        #
@@ -95,34 +101,27 @@ def retrieval_cascade_fast(
             ),
         )
 
-        semantic_chunks = await connector.batch_vector_search(
-            queries=[(q, TextType.QUERY) for q in queries],
-            top_k=top_k_semantic,
+        semantic_chunks, fts_chunks = await connector.batch_hybrid_search_columnar(
+            semantic_queries=[(q, TextType.QUERY) for q in queries],
+            keyword_queries=keywords,
+            top_k_semantic=top_k_semantic,
+            top_k_fts=top_k_fts,
             index_name=index_name,
         )
-        fts_chunks = await connector.batch_fulltext_search(
-            queries=keywords,
-            top_k=top_k_fts,
-            index_name=index_name,
-        )
-
-        # Add raw ranked lists to cumulative pool
-        for slist in semantic_chunks:
-            chunk_pool.append(slist)
-        for slist in fts_chunks:
-            chunk_pool.append(slist)
 
-        stage1_fused = reciprocal_rank_fusion(*chunk_pool, k=rrf_k)[:top_k]
+        stage_diff = absorb_stage(
+            cumulative, [*semantic_chunks, *fts_chunks], top_k=top_k
+        )
+        stage1_fused = FusedResult(cumulative.top_k(top_k), rrf_k)
 
-        yield emitter.tool_result(
-            name="simple_retrieval",
-            result_data=build_retrieval_result(
-                [c for qs in semantic_chunks for c in qs],
-                [c for qs in fts_chunks for c in qs],
-                stage1_fused,
-                rrf_k,
-            ),
+        result_data = build_retrieval_result(
+            ChunkBatch.concat(semantic_chunks),
+            ChunkBatch.concat(fts_chunks),
+            stage1_fused,
+            rrf_k,
         )
+        result_data["cumulative"] = stage_diff
+        yield emitter.tool_result(name="simple_retrieval", result_data=result_data)
 
         # ---------------------------------------------------------------- #
         # Merged eval+expand (one LLM call)                                 #
@@ -160,11 +159,15 @@ def retrieval_cascade_fast(
 
             telemetry = context.get("_current_step_telemetry", {})
 
-            async with llm_provider.observe(telemetry=telemetry):
-                eval_response = await llm_provider.generate(llm_messages)
-
             try:
-                result = parse_json_response(eval_response)
+                # A positive verdict needs no expansion; stop generating there
+                async with llm_provider.observe(telemetry=telemetry):
+                    result, stopped_early = await read_json_fields(
+                        llm_provider.generate_stream(llm_messages),
+                        _verdict_is_relevant,
+                    )
+                increment_step_counter("llm_early_stop", "calls")
+                increment_step_counter("llm_early_stop", "stopped", int(stopped_early))
                 is_relevant = bool(result.get("is_relevant", False))
                 reason = str(result.get("reason", ""))
                 semantic_queries = list(result.get("semantic_queries", []))
@@ -211,32 +214,28 @@ def retrieval_cascade_fast(
             ),
         )
 
-        semantic_chunks = await connector.batch_vector_search(
-            queries=[(q, TextType.QUERY) for q in semantic_queries],
-            top_k=top_k_semantic,
-            index_name=index_name,
-        )
-        fts_chunks = await connector.batch_fulltext_search(
-            queries=keyword_queries,
-            top_k=top_k_fts,
+        semantic_chunks, fts_chunks = await connector.batch_hybrid_search_columnar(
+            semantic_queries=[(q, TextType.QUERY) for q in semantic_queries],
+            keyword_queries=keyword_queries,
+            top_k_semantic=top_k_semantic,
+            top_k_fts=top_k_fts,
             index_name=index_name,
         )
 
-        for slist in semantic_chunks:
-            chunk_pool.append(slist)
-        for slist in fts_chunks:
-            chunk_pool.append(slist)
-
-        fused_chunks = reciprocal_rank_fusion(*chunk_pool, k=rrf_k)[:top_k]
+        stage_diff = absorb_stage(
+            cumulative, [*semantic_chunks, *fts_chunks], top_k=top_k
+        )
+        fused_chunks = FusedResult(cumulative.top_k(top_k), rrf_k)
 
+        result_data = build_retrieval_result(
+            ChunkBatch.concat(semantic_chunks),
+            ChunkBatch.concat(fts_chunks),
+            fused_chunks,
+            rrf_k,
+        )
+        result_data["cumulative"] = stage_diff
         yield emitter.tool_result(
-            name="intermediate_retrieval",
-            result_data=build_retrieval_result(
-                [c for qs in semantic_chunks for c in qs],
-                [c for qs in fts_chunks for c in qs],
-                fused_chunks,
-                rrf_k,
-            ),
+            name="intermediate_retrieval", result_data=result_data
         )
 
         # ---------------------------------------------------------------- #
@@ -260,8 +259,7 @@ def retrieval_cascade_fast(
             return
 
         # --- All stages exhausted ---
-        context["retrieved_chunks"] = fused_chunks
-        context["retrieved_docs"] = group_chunks_to_articles(fused_chunks)
+        set_retrieval_context(context, fused_chunks)
         context["insufficient_context"] = True
         context["insufficient_context_reason"] = (
             reason
@@ -17,16 +17,15 @@ from lex_db_api.models.text_type import TextType
 
 from ..api.event_emitter import EventEmitter
 from ..api.connectors.openai_provider import LLMProvider
-from ..api.connectors.lex_db_connector import (
-    LexDBConnector,
-    group_chunks_to_articles,
-)
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
+from ..api.connectors.lex_db_connector import LexDBConnector
 from ..api.event_models import ConversationMessage
 from ..prompts_search_synthesis import get_intermediate_expansion_prompt
-from ..utils.rrf import reciprocal_rank_fusion
+from ..utils.rrf import reciprocal_rank_fusion_batches
 from ..utils.retrieval_helpers import (
+    FusedResult,
     build_search_result,
-    deduplicate_chunks_to_sources,
+    set_retrieval_context,
 )
 from ..utils.descriptions import build_search_description
 from .llm_json import parse_json_response
@@ -57,6 +56,7 @@ def search_with_expansion(
         - retrieved_chunks: list[LexChunk] — fused chunks, sorted by RRF score
         - retrieved_docs: list[LexArticle] — chunks grouped into articles
         - search_queries: dict — the expanded queries used for the search
+        - fused_result: FusedResult — memoised views of the fused chunks
     """
 
     async def _search_with_expansion(
@@ -114,28 +114,32 @@ def search_with_expansion(
             ),
         )
 
-        semantic_chunks = await connector.batch_vector_search(
-            queries=[(q, TextType.QUERY) for q in semantic_queries],
-            top_k=top_k_semantic,
+        semantic_chunks, fts_chunks = await connector.batch_hybrid_search_columnar(
+            semantic_queries=[(q, TextType.QUERY) for q in semantic_queries],
+            keyword_queries=keyword_queries,
+            top_k_semantic=top_k_semantic,
+            top_k_fts=top_k_fts,
             index_name=index_name,
         )
-        fts_chunks = await connector.batch_fulltext_search(
-            queries=keyword_queries,
-            top_k=top_k_fts,
-            index_name=index_name,
+        # Fuse column-wise; only the top_k fused chunks become LexChunks
+        # Every view below (telemetry, chunks, articles, sources) shares
+        # one grouping pass over the fused batch
+        fused = FusedResult(
+            reciprocal_rank_fusion_batches(
+                *semantic_chunks,
+                *fts_chunks,
+                k=rrf_k,
+                top_k=top_k,
+            ),
+            rrf_k,
         )
-        fused_chunks = reciprocal_rank_fusion(
-            *semantic_chunks,
-            *fts_chunks,
-            k=rrf_k,
-        )[:top_k]
 
         yield emitter.tool_result(
             name="hybrid_search",
             result_data=build_search_result(
-                [c for qs in semantic_chunks for c in qs],
-                [c for qs in fts_chunks for c in qs],
-                fused_chunks,
+                ChunkBatch.concat(semantic_chunks),
+                ChunkBatch.concat(fts_chunks),
+                fused,
                 rrf_k,
             ),
         )
@@ -144,10 +148,9 @@ def search_with_expansion(
         # Step 3 — Deduplicate and write results to context                  #
         # Group by article_id, keep the highest-ranked chunk as highlight.   #
         # ------------------------------------------------------------------ #
-        sources = deduplicate_chunks_to_sources(fused_chunks)
+        sources = fused.sources
 
-        context["retrieved_chunks"] = fused_chunks
-        context["retrieved_docs"] = group_chunks_to_articles(fused_chunks)
+        set_retrieval_context(context, fused)
         context["search_queries"] = {
             "semantic_queries": semantic_queries,
             "keyword_queries": keyword_queries,
@@ -10,6 +10,7 @@ from ..api.connectors.lex_db_connector import (
     LexChunk,
     group_chunks_to_articles,
 )
+from ..utils.retrieval_helpers import FusedResult
 
 # Record format used consistently across all prompts.
 # Each source is rendered as:
@@ -39,7 +40,7 @@ def format_sources_block(articles: list[LexArticle]) -> str:
 
 def build_user_message_with_sources(
     user_input: str,
-    retrieved_chunks: list[LexChunk] | None = None,
+    retrieved_chunks: list[LexChunk] | FusedResult | None = None,
     retrieved_docs: list[LexArticle] | None = None,
     *,
     current_date: str | None = None,
@@ -65,7 +66,8 @@ def build_user_message_with_sources(
     Args:
         user_input: The clean user query.
         current_date: Today's date in Danish format (e.g. "30. juni 2026").
-        retrieved_chunks: Raw chunks from retrieval (sorted + grouped).
+        retrieved_chunks: Raw chunks from retrieval (sorted + grouped), or
+            a FusedResult whose memoised grouping is reused.
         retrieved_docs: Pre-grouped articles (used as-is).
 
     Returns:
@@ -77,7 +79,9 @@ def build_user_message_with_sources(
     if current_date:
         parts.append(f"# Aktuel dato\n{current_date}")
 
-    if retrieved_chunks:
+    if isinstance(retrieved_chunks, FusedResult):
+        articles = retrieved_chunks.prompt_articles
+    elif retrieved_chunks:
         sorted_chunks = sorted(
             retrieved_chunks, key=lambda c: (c.article_id, c.chunk_seq)
         )
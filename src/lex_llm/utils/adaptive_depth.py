@@ -0,0 +1,220 @@
+"""Search depth learned from where fused results actually come from.
+
+Each semantic and full-text list is fetched ``top_k_semantic`` / ``top_k_fts``
+rows deep, but only the rows that make the fused top k matter. The deepest
+such row of a list is its *survivor depth*. :class:`AdaptiveDepth` keeps a
+rolling window of survivor depths per side, query type and index, and asks
+LexDB for a high percentile of them plus a margin instead of the configured
+depth, which stays the ceiling.
+
+A shallow search is widened to the ceiling and run again when its results
+look thin: a truncated list whose last row made the top k, or fewer fused
+chunks than ``top_k`` while some list was truncated. Step telemetry counts
+searches and widenings under ``adaptive_depth`` and records the observed
+depths under ``survivor_depth``::
+
+    {"side": "semantic", "query_type": "query", "index": "article_embeddings_e5",
+     "requested": 18, "depths": [7, 12, 0]}
+
+The RunRecorder copies them into each run's JSONL row, so recorded runs can
+seed a fresh model (:meth:`AdaptiveDepth.from_entries`).
+"""
+
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from lex_db_api.models.text_type import TextType
+
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
+from ..api.observability.step_telemetry import (
+    append_step_entry,
+    increment_step_counter,
+)
+
+# Full-text lists have no query type of their own
+_KEYWORD = "keyword"
+
+
+@dataclass(frozen=True)
+class ResultList:
+    """One search result list and where it came from."""
+
+    side: str
+    query_type: str
+    index: str
+    batch: ChunkBatch
+    requested: int
+
+
+def label_lists(
+    semantic_queries: Sequence[tuple[str, TextType]],
+    n_keyword: int,
+    indexes: Sequence[str],
+    lists: Sequence[ChunkBatch],
+    depth_semantic: int,
+    depth_fts: int,
+) -> list[ResultList]:
+    """Label federated result lists with side, query type, index and depth.
+
+    ``lists`` is per index, its semantic lists then its full-text lists (as
+    in ``FederatedResult.lists``).
+    """
+    per_index = len(semantic_queries) + n_keyword
+    labelled = []
+    for i, index in enumerate(indexes):
+        block = lists[i * per_index : (i + 1) * per_index]
+        for (_, text_type), batch in zip(semantic_queries, block):
+            labelled.append(
+                ResultList("semantic", text_type.value, index, batch, depth_semantic)
+            )
+        for batch in block[len(semantic_queries) :]:
+            labelled.append(ResultList("fulltext", _KEYWORD, index, batch, depth_fts))
+    return labelled
+
+
+def survivor_depth(batch: ChunkBatch, survivors: set[int]) -> int:
+    """1-based rank of the deepest row of ``batch`` in ``survivors`` (0 if none)."""
+    return max(
+        (rank for rank, key in enumerate(batch.keys(), 1) if key in survivors),
+        default=0,
+    )
+
+
+class AdaptiveDepth:
+    """Per-list search depth learned from survivor depths.
+
+    Create one per workflow module (like its LLM provider), so it learns
+    across requests.
+
+    Parameters
+    ----------
+    percentile
+        Percentile of recent survivor depths to cover.
+    margin
+        Rows requested beyond that percentile.
+    min_depth
+        Fewest rows ever requested per list.
+    min_samples
+        Samples needed for a side, query type and index before its depth is
+        lowered from the ceiling.
+    window
+        Recent samples kept per side, query type and index.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        margin: int = 5,
+        min_depth: int = 10,
+        min_samples: int = 20,
+        window: int = 500,
+    ) -> None:
+        self.percentile = percentile
+        self.margin = margin
+        self.min_depth = min_depth
+        self.min_samples = min_samples
+        self.window = window
+        self._samples: dict[tuple[str, str, str], deque[int]] = {}
+
+    @classmethod
+    def from_entries(
+        cls, entries: Iterable[Mapping[str, Any]], **kwargs: Any
+    ) -> "AdaptiveDepth":
+        """A model seeded with logged ``survivor_depth`` telemetry entries."""
+        model = cls(**kwargs)
+        for entry in entries:
+            key = (entry["side"], entry["query_type"], entry["index"])
+            for depth in entry["depths"]:
+                model._record(key, depth)
+        return model
+
+    def _record(self, key: tuple[str, str, str], depth: int) -> None:
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self.window)
+        self._samples[key].append(depth)
+
+    def depth(self, side: str, query_type: str, index: str, ceiling: int) -> int:
+        """Rows to request per list for one side, query type and index."""
+        samples = self._samples.get((side, query_type, index))
+        if samples is None or len(samples) < self.min_samples:
+            return ceiling
+        ordered = sorted(samples)
+        rank = min(
+            len(ordered) - 1, max(0, round(self.percentile / 100 * len(ordered)) - 1)
+        )
+        return min(ceiling, max(self.min_depth, ordered[rank] + self.margin))
+
+    def depths(
+        self,
+        semantic_queries: Sequence[tuple[str, TextType]],
+        indexes: Sequence[str],
+        top_k_semantic: int,
+        top_k_fts: int,
+    ) -> tuple[int, int]:
+        """``(top_k_semantic, top_k_fts)`` for a search of ``indexes``.
+
+        One depth applies to all lists of a side, so it is the deepest
+        needed by any of its query types and indexes.
+        """
+        query_types = {text_type.value for _, text_type in semantic_queries}
+        semantic = max(
+            (
+                self.depth("semantic", query_type, index, top_k_semantic)
+                for query_type in query_types
+                for index in indexes
+            ),
+            default=top_k_semantic,
+        )
+        fulltext = max(
+            (self.depth("fulltext", _KEYWORD, index, top_k_fts) for index in indexes),
+            default=top_k_fts,
+        )
+        return semantic, fulltext
+
+    def is_thin(
+        self, lists: Iterable[ResultList], fused: ChunkBatch, top_k: int
+    ) -> bool:
+        """Whether a shallow search may have cut off chunks of the top k."""
+        survivors = set(fused.keys())
+        for result in lists:
+            if len(result.batch) < result.requested:
+                continue
+            if (
+                len(survivors) < top_k
+                or survivor_depth(result.batch, survivors) >= result.requested
+            ):
+                return True
+        return False
+
+    def observe(
+        self,
+        lists: Iterable[ResultList],
+        fused: ChunkBatch,
+        widened: bool = False,
+    ) -> None:
+        """Record each list's survivor depth and log them to step telemetry.
+
+        ``widened`` marks a search that was run again at full depth.
+        """
+        increment_step_counter("adaptive_depth", "searches")
+        increment_step_counter("adaptive_depth", "widened", int(widened))
+        survivors = set(fused.keys())
+        observed: dict[tuple[str, str, str, int], list[int]] = {}
+        for result in lists:
+            depth = survivor_depth(result.batch, survivors)
+            self._record((result.side, result.query_type, result.index), depth)
+            key = (result.side, result.query_type, result.index, result.requested)
+            observed.setdefault(key, []).append(depth)
+        for (side, query_type, index, requested), depths in observed.items():
+            append_step_entry(
+                "survivor_depth",
+                {
+                    "side": side,
+                    "query_type": query_type,
+                    "index": index,
+                    "requested": requested,
+                    "depths": depths,
+                },
+            )
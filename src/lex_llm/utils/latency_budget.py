@@ -0,0 +1,178 @@
+"""Per-run latency budget for multi-stage retrieval.
+
+A cascade that escalates on every miss can run far past what a user will
+wait. With a :class:`LatencyBudget`, each stage after the first is started
+only if its estimated cost fits in what is left of the budget. The estimate
+is the sum of the stage's phases (query expansion, searches, relevance
+check), each a rolling percentile of recent wall-clock costs kept in a
+:class:`StageCostModel`; phases with too few samples use a prior.
+
+Every decision is appended to the step's ``latency_budget`` telemetry::
+
+    {"stage": "advanced_retrieval", "proceed": false, "estimate_ms": 4210.0,
+     "phases": {"expansion": 2480.0, "search": 530.0, "relevance": 1200.0},
+     "elapsed_ms": 5120.4, "remaining_ms": 2879.6, "budget_ms": 8000.0}
+"""
+
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..api.observability.step_telemetry import append_step_entry
+from .latency_tracker import LatencyTracker
+
+# Typical wall-clock cost of each phase before any has been measured
+DEFAULT_PHASE_COSTS_MS: Mapping[str, float] = {
+    "expansion": 2000.0,
+    "search": 500.0,
+    "pipelined_search": 2500.0,
+    "relevance": 1500.0,
+}
+
+
+class StageCostModel:
+    """Rolling wall-clock costs per ``(stage, phase)``.
+
+    Parameters
+    ----------
+    window
+        Number of recent samples kept per stage and phase.
+    min_samples
+        Samples needed before a phase's own costs replace its prior.
+    priors
+        Estimate (ms) for each phase with fewer than ``min_samples``.
+    """
+
+    def __init__(
+        self,
+        window: int = 100,
+        min_samples: int = 3,
+        priors: Mapping[str, float] = DEFAULT_PHASE_COSTS_MS,
+    ) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self.priors = priors
+        self._trackers: dict[tuple[str, str], LatencyTracker] = {}
+
+    def record(self, stage: str, phase: str, ms: float) -> None:
+        key = (stage, phase)
+        if key not in self._trackers:
+            self._trackers[key] = LatencyTracker(self.window)
+        self._trackers[key].record(ms / 1000)
+
+    @contextmanager
+    def timed(self, stage: str, phase: str) -> Iterator[None]:
+        """Record the wall-clock time of the block, unless it raises."""
+        start = time.perf_counter()
+        yield
+        self.record(stage, phase, (time.perf_counter() - start) * 1000)
+
+    def estimate(
+        self, stage: str, phases: Sequence[str], percentile: float
+    ) -> dict[str, float]:
+        """Estimated cost (ms) of each of ``phases`` of ``stage``."""
+        estimates = {}
+        for phase in phases:
+            tracker = self._trackers.get((stage, phase))
+            seconds = None
+            if tracker is not None and len(tracker) >= self.min_samples:
+                seconds = tracker.percentile(percentile)
+            if seconds is None:
+                estimates[phase] = self.priors.get(phase, 0.0)
+            else:
+                estimates[phase] = round(seconds * 1000, 1)
+        return estimates
+
+
+_SHARED_MODELS: dict[str, StageCostModel] = {}
+
+
+def shared_cost_model(key: str) -> StageCostModel:
+    """The process-wide cost model for ``key`` (e.g. an LLM model name).
+
+    Workflow steps are built per request, so costs must outlive them.
+    """
+    if key not in _SHARED_MODELS:
+        _SHARED_MODELS[key] = StageCostModel()
+    return _SHARED_MODELS[key]
+
+
+@dataclass(frozen=True)
+class BudgetDecision:
+    """Whether the next stage fits in the budget, and the accounting behind it."""
+
+    stage: str
+    proceed: bool
+    phases: dict[str, float]
+    elapsed_ms: float
+    budget_ms: float
+
+    @property
+    def estimate_ms(self) -> float:
+        return round(sum(self.phases.values()), 1)
+
+    @property
+    def remaining_ms(self) -> float:
+        return round(max(0.0, self.budget_ms - self.elapsed_ms), 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "proceed": self.proceed,
+            "estimate_ms": self.estimate_ms,
+            "phases": self.phases,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "remaining_ms": self.remaining_ms,
+            "budget_ms": self.budget_ms,
+        }
+
+
+@dataclass
+class LatencyBudget:
+    """A retrieval step's per-run latency budget.
+
+    Parameters
+    ----------
+    budget_ms
+        Wall-clock time the step may take, from its start.
+    percentile
+        Percentile of recent phase costs used as the estimate; higher
+        skips more often and overruns less.
+    on_exhausted
+        ``"best_so_far"`` answers from the results gathered so far when a
+        stage is skipped; ``"insufficient_context"`` defers instead.
+    costs
+        Cost model to estimate from and record into; ``None`` uses the
+        shared model for the step's LLM.
+    """
+
+    budget_ms: float
+    percentile: float = 90.0
+    on_exhausted: str = "best_so_far"
+    costs: StageCostModel | None = field(default=None, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.on_exhausted not in ("best_so_far", "insufficient_context"):
+            raise ValueError(f"Unknown on_exhausted: {self.on_exhausted!r}")
+
+    def decide(
+        self,
+        stage: str,
+        phases: Sequence[str],
+        elapsed_ms: float,
+        costs: StageCostModel,
+    ) -> BudgetDecision:
+        """Check whether ``stage`` fits in the rest of the budget and log it."""
+        estimates = costs.estimate(stage, phases, self.percentile)
+        remaining = self.budget_ms - elapsed_ms
+        decision = BudgetDecision(
+            stage=stage,
+            proceed=sum(estimates.values()) <= remaining,
+            phases=estimates,
+            elapsed_ms=elapsed_ms,
+            budget_ms=self.budget_ms,
+        )
+        append_step_entry("latency_budget", decision.to_dict())
+        return decision
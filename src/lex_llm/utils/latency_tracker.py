@@ -0,0 +1,24 @@
+"""Rolling latency window shared by hedging and the latency budget."""
+
+from collections import deque
+
+
+class LatencyTracker:
+    """Rolling window of recent request latencies (seconds)."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """Nearest-rank percentile of the window, or ``None`` if empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[rank]
@@ -0,0 +1,237 @@
+"""LLM-free relevance gate from retrieval signal agreement.
+
+When semantic and full-text search independently surface the same
+articles, with a clear fused-score lead and titles that name the query's
+terms, an LLM relevance check rarely disagrees. :class:`RelevanceGate`
+scores those signals for a stage's fused result and decides:
+
+- ``accept`` — confidence at or above ``accept_at``; skip the LLM.
+- ``reject`` — confidence below ``reject_below`` (off by default); escalate
+  without the LLM.
+- ``uncertain`` — anything in between; ask the LLM.
+
+Every decision is logged and appended to the step's ``relevance_gate``
+telemetry, together with the LLM verdict whenever the LLM was asked, so the
+thresholds and weights can be tuned against it. ``shadow=True`` asks the
+LLM every time, to collect that comparison before trusting the gate.
+"""
+
+import logging
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
+from ..api.observability.step_telemetry import append_step_entry
+from .retrieval_helpers import FusedResult
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS: Mapping[str, float] = {
+    "overlap": 0.35,
+    "top_score": 0.2,
+    "margin": 0.1,
+    "title_hits": 0.2,
+    "keyword_hits": 0.15,
+}
+
+# Frequent Danish question words and function words that carry no topic
+_STOPWORDS = frozenset(
+    "hvad hvem hvor hvornår hvordan hvorfor hvilke hvilken hvilket være "
+    "blev bliver have havde eller ikke noget nogle også over under efter "
+    "mellem med som ville kunne skal fortæl forklar gerne".split()
+)
+
+
+def query_terms(texts: Iterable[str], min_length: int = 4) -> set[str]:
+    """Case-folded topic words of the user input and keyword queries."""
+    return {
+        word
+        for text in texts
+        for word in re.findall(r"\w+", text.casefold())
+        if len(word) >= min_length and word not in _STOPWORDS and not word.isdigit()
+    }
+
+
+@dataclass(frozen=True)
+class RelevanceSignals:
+    """Retrieval-side evidence of relevance, each in ``[0, 1]``.
+
+    ``overlap`` is the share of the top articles found by both semantic and
+    full-text search; ``top_score`` the best fused score as a share of the
+    most any chunk could score (first in every list, at the lists' weights); ``margin`` how far the last top article's
+    score falls below the best; ``title_hits`` the share of top articles
+    whose title contains a query term; ``keyword_hits`` the share of query
+    terms found in a top article's title or highlight.
+    """
+
+    overlap: float
+    top_score: float
+    margin: float
+    title_hits: float
+    keyword_hits: float
+
+
+@dataclass(frozen=True)
+class GateDecision:
+    """A gate verdict with the signals and confidence behind it."""
+
+    verdict: str
+    confidence: float
+    signals: RelevanceSignals
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "verdict": self.verdict,
+            "confidence": self.confidence,
+            "signals": {k: round(v, 3) for k, v in asdict(self.signals).items()},
+        }
+
+
+@dataclass
+class RelevanceGate:
+    """Thresholds and signal weights for the relevance gate.
+
+    Parameters
+    ----------
+    accept_at
+        Confidence at which results are accepted without the LLM.
+    reject_below
+        Confidence under which the stage escalates without the LLM;
+        ``None`` never rejects.
+    weights
+        Weight of each :class:`RelevanceSignals` field in the confidence
+        (a weighted mean); missing fields weigh nothing.
+    top_n
+        Number of top fused articles the signals look at.
+    shadow
+        Decide and log, but always ask the LLM and use its verdict.
+    """
+
+    accept_at: float = 0.75
+    reject_below: float | None = None
+    weights: Mapping[str, float] = field(default_factory=lambda: DEFAULT_WEIGHTS)
+    top_n: int = 5
+    shadow: bool = False
+
+    def signals(
+        self,
+        fused: FusedResult,
+        semantic: Sequence[ChunkBatch],
+        fulltext: Sequence[ChunkBatch],
+        terms: set[str],
+        list_weights: Sequence[float] | None = None,
+    ) -> RelevanceSignals:
+        """Measure agreement between the result lists behind ``fused``.
+
+        ``list_weights`` are the fusion weights of the lists behind
+        ``fused``, one per list; without them every list weighs 1.
+        """
+        top = fused.sources[: self.top_n]
+        if not top:
+            return RelevanceSignals(0.0, 0.0, 0.0, 0.0, 0.0)
+
+        semantic_ids = {aid for batch in semantic for aid in batch.article_ids}
+        fulltext_ids = {aid for batch in fulltext for aid in batch.article_ids}
+        both = sum(s.id in semantic_ids and s.id in fulltext_ids for s in top)
+        overlap = both / len(top)
+
+        top_score = margin = 0.0
+        scores = fused.batch.scores
+        if list_weights:
+            total_weight = float(sum(list_weights))
+        else:
+            total_weight = float(len(semantic) + len(fulltext))
+        if scores and total_weight > 0:
+            # Ranked first in every list scores total_weight / (k + 1)
+            top_score = min(1.0, scores[0] * (fused.rrf_k + 1) / total_weight)
+            last = fused.batch.first_row_per_article()[len(top) - 1]
+            margin = 1.0 - scores[last] / scores[0] if scores[0] else 0.0
+
+        titles = [s.title.casefold() for s in top]
+        texts = [f"{s.title} {s.highlight or ''}".casefold() for s in top]
+        title_hits = (
+            sum(any(t in title for t in terms) for title in titles) / len(top)
+            if terms
+            else 0.0
+        )
+        keyword_hits = (
+            sum(any(t in text for text in texts) for t in terms) / len(terms)
+            if terms
+            else 0.0
+        )
+        return RelevanceSignals(overlap, top_score, margin, title_hits, keyword_hits)
+
+    def decide(
+        self,
+        fused: FusedResult,
+        semantic: Sequence[ChunkBatch],
+        fulltext: Sequence[ChunkBatch],
+        terms: set[str],
+        list_weights: Sequence[float] | None = None,
+    ) -> GateDecision:
+        """Score the signals and place them against the thresholds."""
+        signals = self.signals(fused, semantic, fulltext, terms, list_weights)
+        values = asdict(signals)
+        total = sum(self.weights.get(name, 0.0) for name in values)
+        confidence = (
+            sum(self.weights.get(name, 0.0) * v for name, v in values.items()) / total
+            if total
+            else 0.0
+        )
+        if confidence >= self.accept_at:
+            verdict = "accept"
+        elif self.reject_below is not None and confidence < self.reject_below:
+            verdict = "reject"
+        else:
+            verdict = "uncertain"
+        return GateDecision(verdict, round(confidence, 3), signals)
+
+
+def record_gate_decision(
+    stage: str, decision: GateDecision, llm_verdict: bool | None
+) -> None:
+    """Log a decision, with the LLM's verdict if it was asked."""
+    entry = {"stage": stage, **decision.to_dict(), "llm_verdict": llm_verdict}
+    append_step_entry("relevance_gate", entry)
+    _LOGGER.info(
+        "relevance gate %s: %s (confidence %.3f, llm %s)",
+        stage,
+        decision.verdict,
+        decision.confidence,
+        llm_verdict,
+    )
+
+
+def calibrate_accept_at(
+    entries: Iterable[Mapping[str, Any]],
+    precision: float = 0.95,
+    min_support: int = 20,
+) -> float | None:
+    """Lowest ``accept_at`` whose accepts the LLM would have agreed with.
+
+    ``entries`` are logged ``relevance_gate`` telemetry entries; only those
+    with an LLM verdict count. Returns the smallest observed confidence such
+    that at least ``min_support`` entries lie at or above it and at least
+    ``precision`` of them were judged relevant, or ``None`` if none does.
+    """
+    judged = sorted(
+        (
+            (e["confidence"], bool(e["llm_verdict"]))
+            for e in entries
+            if e.get("llm_verdict") is not None
+        ),
+        reverse=True,
+    )
+    best: float | None = None
+    accepted = relevant = 0
+    # Lower the threshold one observed confidence at a time
+    for i, (confidence, verdict) in enumerate(judged):
+        accepted += 1
+        relevant += verdict
+        if i + 1 < len(judged) and judged[i + 1][0] == confidence:
+            continue
+        if accepted >= min_support and relevant / accepted >= precision:
+            best = confidence
+    return best
@@ -1,16 +1,157 @@
 """Shared retrieval result helpers used across workflow tools."""
 
 from collections import OrderedDict
+from collections.abc import Sequence
+from functools import cached_property
 from typing import Any
 
-from ..api.connectors.lex_db_connector import LexChunk
+from ..api.connectors.lex_db_chunk_batch import ChunkBatch
+from ..api.connectors.lex_db_connector import LexArticle, LexChunk
 from ..api.event_models import Source
+from .rrf import RRFAccumulator
+
+
+def _chunk_summaries(
+    chunks: Sequence[LexChunk] | ChunkBatch, rrf_k: int, score_key: str
+) -> list[dict[str, Any]]:
+    """Per-chunk ``tool_result`` entries, read column-wise from a ChunkBatch.
+
+    Fused batches report their true fused scores; other lists report the
+    RRF contribution of each row's rank.
+    """
+    scores: Sequence[float] = ()
+    if isinstance(chunks, ChunkBatch):
+        fields = chunks.fields()
+        scores = chunks.scores
+    else:
+        fields = ((c.article_id, c.chunk_seq, c.title, c.url) for c in chunks)
+    return [
+        {
+            "article_id": article_id,
+            "chunk_seq": chunk_seq,
+            "title": title,
+            "url": url,
+            score_key: round(scores[idx] if scores else 1.0 / (rrf_k + idx + 1), 4),
+        }
+        for idx, (article_id, chunk_seq, title, url) in enumerate(fields)
+    ]
+
+
+class FusedResult:
+    """One fused ranking, grouped once and viewed many ways.
+
+    A retrieval step hands the same fused chunks to several consumers:
+    ``retrieved_chunks``, ``retrieved_docs``, ``search_results``, the
+    ``tool_result`` telemetry and the prompt's source list. The rows are
+    grouped by article in one pass over ``batch``; every view is built
+    from that grouping on first access and memoised.
+
+    Parameters
+    ----------
+    batch
+        Fused chunks in rank order, with fused scores where available.
+    rrf_k
+        RRF constant, for rank-derived scores when ``batch`` has none.
+    """
+
+    def __init__(self, batch: ChunkBatch, rrf_k: int = 60) -> None:
+        self.batch = batch
+        self.rrf_k = rrf_k
+        self._article_rows = batch.rows_by_article()
+
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[LexChunk], rrf_k: int = 60) -> "FusedResult":
+        """Wrap an already-ranked list of chunks."""
+        return cls(ChunkBatch.from_chunks(chunks), rrf_k)
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    @cached_property
+    def chunks(self) -> list[LexChunk]:
+        """The fused chunks, in rank order."""
+        return self.batch.to_chunks()
+
+    @cached_property
+    def articles(self) -> list[LexArticle]:
+        """Chunks grouped into articles, as :func:`group_chunks_to_articles`."""
+        return self.batch.to_articles(self._article_rows)
+
+    @cached_property
+    def prompt_articles(self) -> list[LexArticle]:
+        """Articles ordered by id, as the prompt's source list numbers them."""
+        return sorted(self.articles, key=lambda article: article.id)
+
+    @cached_property
+    def sources(self) -> list[Source]:
+        """Article-level sources, as :func:`deduplicate_chunks_to_sources`."""
+        batch = self.batch
+        return [
+            Source(
+                id=aid,
+                title=batch.title(rows[0]) or "",
+                url=batch.url(rows[0]),
+                highlight=batch.texts[rows[0]],
+            )
+            for aid, rows in self._article_rows.items()
+        ]
+
+    @cached_property
+    def chunk_summaries(self) -> list[dict[str, Any]]:
+        """``top_fused_chunks`` entries for ``tool_result`` events."""
+        return _chunk_summaries(self.batch, self.rrf_k, "rrf_score")
+
+    @cached_property
+    def source_entries(self) -> list[dict[str, Any]]:
+        """Serialisable ``results`` entries for ``tool_result`` events."""
+        return [
+            {"id": s.id, "title": s.title, "url": s.url, "highlight": s.highlight}
+            for s in self.sources
+        ]
+
+
+def set_retrieval_context(
+    context: dict[str, Any],
+    fused: FusedResult,
+    docs: list[LexArticle] | None = None,
+) -> None:
+    """Write a step's fused result into the workflow context.
+
+    Sets ``retrieved_chunks``, ``retrieved_docs`` (``docs`` if given, e.g.
+    hydrated articles) and ``fused_result``.
+    """
+    context["retrieved_chunks"] = fused.chunks
+    context["retrieved_docs"] = docs if docs is not None else fused.articles
+    context["fused_result"] = fused
+
+
+def context_fused_result(
+    context: dict[str, Any], chunks: Sequence[LexChunk]
+) -> FusedResult | None:
+    """The context's :class:`FusedResult` if it still backs ``chunks``.
+
+    A later step may replace ``retrieved_chunks`` without touching
+    ``fused_result``; the views are only reused for the very list they
+    produced.
+    """
+    fused = context.get("fused_result")
+    if isinstance(fused, FusedResult) and fused.chunks is chunks:
+        return fused
+    return None
+
+
+def _fused_summaries(
+    fused_chunks: Sequence[LexChunk] | ChunkBatch | FusedResult, rrf_k: int
+) -> list[dict[str, Any]]:
+    if isinstance(fused_chunks, FusedResult):
+        return fused_chunks.chunk_summaries
+    return _chunk_summaries(fused_chunks, rrf_k, "rrf_score")
 
 
 def build_retrieval_result(
-    semantic_chunks: list[LexChunk],
-    fts_chunks: list[LexChunk],
-    fused_chunks: list[LexChunk],
+    semantic_chunks: Sequence[LexChunk] | ChunkBatch,
+    fts_chunks: Sequence[LexChunk] | ChunkBatch,
+    fused_chunks: Sequence[LexChunk] | ChunkBatch | FusedResult,
     rrf_k: int,
 ) -> dict[str, Any]:
     """Build the base serialisable result dict for tool_result events.
@@ -18,42 +159,63 @@ def build_retrieval_result(
     Returns a dict with ``semantic_chunks``, ``fts_chunks``, and
     ``top_fused_chunks`` keys.  Callers that need article-level deduplication
     should add a ``results`` key by calling :func:`deduplicate_chunks_to_sources`.
+    Accepts ``ChunkBatch`` inputs without materialising their chunks, and
+    reuses a :class:`FusedResult`'s memoised summaries.
+    """
+    return {
+        "semantic_chunks": _chunk_summaries(semantic_chunks, rrf_k, "score"),
+        "fts_chunks": _chunk_summaries(fts_chunks, rrf_k, "score"),
+        "top_fused_chunks": _fused_summaries(fused_chunks, rrf_k),
+    }
+
+
+def build_partial_retrieval_result(
+    fused_chunks: Sequence[LexChunk] | ChunkBatch | FusedResult,
+    rrf_k: int,
+    lists_received: int,
+    lists_total: int,
+) -> dict[str, Any]:
+    """Build an in-progress result dict while per-query results still arrive.
+
+    Only the current ``top_fused_chunks`` are included, with ``partial``
+    set and the number of result lists received so far.
+    """
+    return {
+        "partial": True,
+        "lists_received": lists_received,
+        "lists_total": lists_total,
+        "top_fused_chunks": _fused_summaries(fused_chunks, rrf_k),
+    }
+
+
+def absorb_stage(
+    cumulative: RRFAccumulator,
+    lists: Sequence[ChunkBatch],
+    weights: Sequence[float] | None = None,
+    top_k: int = 10,
+) -> dict[str, Any]:
+    """Add one stage's result lists to a cross-stage fusion.
+
+    Returns a serialisable summary for the stage's ``tool_result``: the
+    lists and distinct chunks fused so far, and the chunks (as
+    ``[article_id, chunk_seq]``) that this stage moved into or out of the
+    cumulative top ``top_k``.
     """
+    before = cumulative.snapshot(top_k)
+    cumulative.extend(lists, weights)
+    diff = cumulative.snapshot(top_k).diff(before)
     return {
-        "semantic_chunks": [
-            {
-                "article_id": chunk.article_id,
-                "chunk_seq": chunk.chunk_seq,
-                "title": chunk.title,
-                "url": chunk.url,
-                "score": round(1.0 / (rrf_k + idx + 1), 4),
-            }
-            for idx, chunk in enumerate(semantic_chunks)
-        ],
-        "fts_chunks": [
-            {
-                "article_id": chunk.article_id,
-                "chunk_seq": chunk.chunk_seq,
-                "title": chunk.title,
-                "url": chunk.url,
-                "score": round(1.0 / (rrf_k + idx + 1), 4),
-            }
-            for idx, chunk in enumerate(fts_chunks)
-        ],
-        "top_fused_chunks": [
-            {
-                "article_id": chunk.article_id,
-                "chunk_seq": chunk.chunk_seq,
-                "title": chunk.title,
-                "url": chunk.url,
-                "rrf_score": round(1.0 / (rrf_k + idx + 1), 4),
-            }
-            for idx, chunk in enumerate(fused_chunks)
-        ],
+        "lists": cumulative.lists,
+        "chunks": len(cumulative),
+        "entered": [list(key) for key in diff.entered],
+        "left": [list(key) for key in diff.left],
+        "moved": diff.moved,
     }
 
 
-def deduplicate_chunks_to_sources(chunks: list[LexChunk]) -> list[Source]:
+def deduplicate_chunks_to_sources(
+    chunks: Sequence[LexChunk] | ChunkBatch | FusedResult,
+) -> list[Source]:
     """Deduplicate chunks by article_id, keeping the best chunk as a highlight.
 
     Because ``chunks`` is already sorted by RRF score (descending), the
@@ -61,6 +223,19 @@ def deduplicate_chunks_to_sources(chunks: list[LexChunk]) -> list[Source]:
     relevant one.  An ``OrderedDict`` preserves insertion order so the
     output list retains the original ranking.
     """
+    if isinstance(chunks, FusedResult):
+        return chunks.sources
+    if isinstance(chunks, ChunkBatch):
+        return [
+            Source(
+                id=chunks.article_ids[row],
+                title=chunks.title(row) or "",
+                url=chunks.url(row),
+                highlight=chunks.texts[row],
+            )
+            for row in chunks.first_row_per_article()
+        ]
+
     best: OrderedDict[int, LexChunk] = OrderedDict()
     for chunk in chunks:
         if chunk.article_id not in best:
@@ -78,9 +253,9 @@ def deduplicate_chunks_to_sources(chunks: list[LexChunk]) -> list[Source]:
 
 
 def build_search_result(
-    semantic_chunks: list[LexChunk],
-    fts_chunks: list[LexChunk],
-    fused_chunks: list[LexChunk],
+    semantic_chunks: Sequence[LexChunk] | ChunkBatch,
+    fts_chunks: Sequence[LexChunk] | ChunkBatch,
+    fused_chunks: Sequence[LexChunk] | ChunkBatch | FusedResult,
     rrf_k: int,
 ) -> dict[str, Any]:
     """Build a serialisable result dict with article-level deduplication.
@@ -90,6 +265,9 @@ def build_search_result(
     ``highlight``.
     """
     base = build_retrieval_result(semantic_chunks, fts_chunks, fused_chunks, rrf_k)
+    if isinstance(fused_chunks, FusedResult):
+        base["results"] = fused_chunks.source_entries
+        return base
     sources = deduplicate_chunks_to_sources(fused_chunks)
     base["results"] = [
         {
@@ -1,11 +1,20 @@
 """Shared retrieval utilities used across workflow tools."""
 
+import heapq
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..api.connectors.lex_db_chunk_batch import _SEQ_BITS, ChunkBatch, unpack_key
 from ..api.connectors.lex_db_connector import LexChunk
 
 
 def reciprocal_rank_fusion(
     *result_lists: list[LexChunk],
     k: int = 60,
+    weights: Sequence[float] | None = None,
 ) -> list[LexChunk]:
     """Merge multiple ranked result lists using Reciprocal Rank Fusion.
 
@@ -17,6 +26,8 @@ def reciprocal_rank_fusion(
         *result_lists: Any number of ranked LexChunk lists (e.g. per-query semantic
             results, per-query FTS results, etc.).
         k: RRF constant (default 60). Higher k dampens the effect of individual ranks.
+        weights: Optional per-list weights (default 1.0 each); a list's
+            contributions are multiplied by its weight.
 
     Returns:
         Deduplicated, fused list of LexChunks ordered by RRF score.
@@ -24,12 +35,225 @@ def reciprocal_rank_fusion(
     rrf_scores: dict[tuple[int, int], float] = {}
     chunk_map: dict[tuple[int, int], LexChunk] = {}
 
-    for results in result_lists:
+    for i, results in enumerate(result_lists):
+        weight = 1.0 if weights is None else weights[i]
         for rank, chunk in enumerate(results):
             key = (chunk.article_id, chunk.chunk_seq)
-            rrf_scores[key] = rrf_scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+            rrf_scores[key] = rrf_scores.get(key, 0.0) + weight / (k + rank + 1)
             chunk_map[key] = chunk
 
     # Sort by RRF score descending
     sorted_keys = sorted(rrf_scores, key=lambda x: rrf_scores[x], reverse=True)
     return [chunk_map[key] for key in sorted_keys]
+
+
+def reciprocal_rank_fusion_batches(
+    *result_batches: ChunkBatch,
+    k: int = 60,
+    weights: Sequence[float] | None = None,
+    top_k: int | None = None,
+) -> ChunkBatch:
+    """Columnar :func:`reciprocal_rank_fusion` over :class:`ChunkBatch` lists.
+
+    Scores and orders chunks exactly like :func:`reciprocal_rank_fusion`,
+    ties included, but fuses with NumPy over packed ``(article_id,
+    chunk_seq)`` keys and returns a ``ChunkBatch`` whose ``scores`` column
+    holds each chunk's fused score. No ``LexChunk`` objects are created.
+
+    With ``top_k``, only the ``top_k`` best chunks are returned; they are
+    picked by partial selection, so only the selected chunks are sorted.
+    """
+    sizes = np.array([len(b) for b in result_batches], dtype=np.int64)
+    total = int(sizes.sum())
+    if total == 0 or top_k == 0:
+        return ChunkBatch.gather(result_batches, ())
+
+    # One entry per (list, rank): packed key, weighted contribution, origin
+    keys = np.concatenate([_packed_keys(b) for b in result_batches])
+    offsets = np.cumsum(sizes) - sizes
+    ranks = np.arange(total, dtype=np.int64) - np.repeat(offsets, sizes)
+    list_weights = (
+        np.ones(len(result_batches))
+        if weights is None
+        else np.asarray(weights, dtype=np.float64)
+    )
+    contributions = np.repeat(list_weights, sizes) / (k + ranks + 1)
+
+    # Sum per key in list order, as the dict loop does, so scores match exactly
+    unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    scores = np.bincount(inverse, weights=contributions, minlength=len(unique))
+    # The last occurrence supplies the row, as in the dict loop
+    last = np.zeros(len(unique), dtype=np.int64)
+    np.maximum.at(last, inverse, np.arange(total, dtype=np.int64))
+
+    candidates = np.arange(len(unique))
+    if top_k is not None and top_k < len(unique):
+        kth = np.partition(scores, len(unique) - top_k)[len(unique) - top_k]
+        # Keep every chunk tied with the k-th, then break ties by first sight
+        candidates = np.flatnonzero(scores >= kth)
+    order = candidates[np.lexsort((first[candidates], -scores[candidates]))]
+    if top_k is not None:
+        order = order[:top_k]
+
+    rows = last[order]
+    origins = np.repeat(np.arange(len(result_batches)), sizes)
+    fused = ChunkBatch.gather(
+        result_batches, zip(origins[rows].tolist(), ranks[rows].tolist())
+    )
+    fused.scores = array("d", scores[order].tolist())
+    return fused
+
+
+def _packed_keys(batch: ChunkBatch) -> np.ndarray:
+    """Vectorised :func:`pack_key` over a batch's id columns."""
+    article_ids = np.asarray(batch.article_ids, dtype=np.int64)
+    chunk_seqs = np.asarray(batch.chunk_seqs, dtype=np.int64)
+    return (article_ids << _SEQ_BITS) | chunk_seqs
+
+
+@dataclass(frozen=True)
+class RRFDiff:
+    """How the top k of an :class:`RRFAccumulator` changed between snapshots.
+
+    ``entered`` and ``left`` hold ``(article_id, chunk_seq)`` pairs in rank
+    order; ``moved`` counts chunks in both whose rank changed.
+    """
+
+    entered: tuple[tuple[int, int], ...]
+    left: tuple[tuple[int, int], ...]
+    moved: int
+    lists_added: int
+
+
+@dataclass(frozen=True)
+class RRFSnapshot:
+    """The top k of an :class:`RRFAccumulator` at one point in time."""
+
+    keys: tuple[int, ...]
+    scores: tuple[float, ...]
+    lists: int
+
+    def diff(self, earlier: "RRFSnapshot") -> RRFDiff:
+        """What changed in the top k since ``earlier``."""
+        before = {key: rank for rank, key in enumerate(earlier.keys)}
+        after = set(self.keys)
+        return RRFDiff(
+            entered=tuple(unpack_key(key) for key in self.keys if key not in before),
+            left=tuple(unpack_key(key) for key in earlier.keys if key not in after),
+            moved=sum(
+                1
+                for rank, key in enumerate(self.keys)
+                if key in before and before[key] != rank
+            ),
+            lists_added=self.lists - earlier.lists,
+        )
+
+
+class RRFAccumulator:
+    """Running RRF fusion over ranked lists added one at a time.
+
+    Adding a list costs one dict update per row, and reading the top k is a
+    partial selection over the distinct chunks seen so far, so fusing stage
+    after stage costs in proportion to the new results only. Lists may be
+    added in any order: ties are broken by first occurrence in
+    ``list_index`` order, so the ranking equals
+    :func:`reciprocal_rank_fusion_batches` over all lists in that order.
+    """
+
+    def __init__(self, k: int = 60) -> None:
+        self.k = k
+        self.scores: dict[int, float] = {}
+        self._first_seen: dict[int, tuple[int, int]] = {}
+        self._rows: dict[int, tuple[int, int]] = {}
+        self._batches: dict[int, ChunkBatch] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct chunks seen."""
+        return len(self.scores)
+
+    @property
+    def lists(self) -> int:
+        """Number of lists added."""
+        return len(self._batches)
+
+    def add(
+        self, batch: ChunkBatch, weight: float = 1.0, list_index: int | None = None
+    ) -> None:
+        """Fold one ranked list into the scores.
+
+        ``list_index`` defaults to one past the highest index added so far.
+        """
+        if list_index is None:
+            list_index = max(self._batches, default=-1) + 1
+        if list_index in self._batches:
+            raise ValueError(f"List {list_index} was already added")
+        self._batches[list_index] = batch
+        scores, first_seen, rows = self.scores, self._first_seen, self._rows
+        for rank, key in enumerate(batch.keys()):
+            scores[key] = scores.get(key, 0.0) + weight / (self.k + rank + 1)
+            position = (list_index, rank)
+            if key not in first_seen or position < first_seen[key]:
+                first_seen[key] = position
+            if key not in rows or position > rows[key]:
+                rows[key] = position
+
+    def extend(
+        self, batches: Iterable[ChunkBatch], weights: Iterable[float] | None = None
+    ) -> None:
+        """Add several lists in order, each with its weight (default 1.0).
+
+        Raises ``ValueError`` if ``weights`` is not one weight per list.
+        """
+        batches = list(batches)
+        weights = [1.0] * len(batches) if weights is None else list(weights)
+        if len(weights) != len(batches):
+            raise ValueError(f"Expected {len(batches)} weights, got {len(weights)}")
+        for batch, weight in zip(batches, weights):
+            self.add(batch, weight)
+
+    def top_keys(self, top_k: int) -> list[int]:
+        """Packed keys of the ``top_k`` best chunks, best first."""
+        scores, first_seen = self.scores, self._first_seen
+        return heapq.nsmallest(
+            top_k, scores, key=lambda key: (-scores[key], first_seen[key])
+        )
+
+    def top_k(self, top_k: int) -> ChunkBatch:
+        """The ``top_k`` best chunks, with their fused scores."""
+        return self.fused(self.top_keys(top_k))
+
+    def fused(self, keys: Sequence[int]) -> ChunkBatch:
+        """A scored batch of the chunks behind ``keys``, in that order."""
+        order = sorted(self._batches)
+        slot = {list_index: i for i, list_index in enumerate(order)}
+        fused = ChunkBatch.gather(
+            [self._batches[i] for i in order],
+            ((slot[self._rows[key][0]], self._rows[key][1]) for key in keys),
+        )
+        fused.scores = array("d", (self.scores[key] for key in keys))
+        return fused
+
+    def snapshot(self, top_k: int) -> RRFSnapshot:
+        """Freeze the current top k, e.g. to :meth:`RRFSnapshot.diff` later."""
+        keys = self.top_keys(top_k)
+        return RRFSnapshot(
+            keys=tuple(keys),
+            scores=tuple(self.scores[key] for key in keys),
+            lists=self.lists,
+        )
+
+    def top_k_settled(self, top_k: int, outstanding: float) -> bool:
+        """Whether lists still to come cannot change the top-k set.
+
+        ``outstanding`` is the total weight of those lists: each can add at
+        most ``weight / (k + 1)`` to any chunk's score.
+        """
+        if outstanding <= 0:
+            return True
+        ranked = self.top_keys(top_k + 1)
+        if len(ranked) < top_k:
+            return False
+        max_gain = outstanding / (self.k + 1)
+        kth = self.scores[ranked[top_k - 1]]
+        runner_up = self.scores[ranked[top_k]] if len(ranked) > top_k else 0.0
+        return kth > runner_up + max_gain
@@ -0,0 +1,112 @@
+"""Speculative work started before it is known to be needed.
+
+A :class:`Speculation` runs a coroutine as a task right away, so its
+latency overlaps whatever decides whether it is needed. The caller then
+either claims its result or cancels it. Both outcomes are recorded under
+``speculation`` in the running step's telemetry, with the share of
+speculative time that was thrown away::
+
+    {"launched": 2, "used": 1, "cancelled": 1,
+     "speculative_ms": 1840.2, "wasted_ms": 610.5, "wasted_ratio": 0.332,
+     "entries": [{"name": "intermediate_retrieval", "outcome": "cancelled",
+                  "elapsed_ms": 610.5}, ...]}
+"""
+
+import asyncio
+import time
+from collections.abc import Coroutine
+from typing import Any, Generic, TypeVar
+
+from ..api.observability.step_telemetry import get_step_telemetry
+
+T = TypeVar("T")
+
+
+class Speculation(Generic[T]):
+    """A coroutine running ahead of the decision that needs it.
+
+    Parameters
+    ----------
+    coro
+        The speculative work; scheduled immediately.
+    name
+        Label for the per-speculation entry in step telemetry.
+    """
+
+    def __init__(self, coro: Coroutine[Any, Any, T], name: str) -> None:
+        self.name = name
+        self._t_start = time.perf_counter()
+        self._t_done: float | None = None
+        self._outcome: str | None = None
+        self._task = asyncio.ensure_future(coro)
+        self._task.add_done_callback(self._on_done)
+        _stats()["launched"] += 1
+
+    def _on_done(self, _: "asyncio.Future[T]") -> None:
+        self._t_done = time.perf_counter()
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Time the work has run (so far, or until it finished)."""
+        end = self._t_done if self._t_done is not None else time.perf_counter()
+        return (end - self._t_start) * 1000
+
+    @property
+    def done(self) -> bool:
+        """Whether the work has finished, failed or been cancelled."""
+        return self._task.done()
+
+    async def result(self) -> T:
+        """Wait for the work and claim its result (none of it is wasted)."""
+        try:
+            return await self._task
+        finally:
+            self._settle("used", wasted=False)
+
+    def cancel(self) -> None:
+        """Abandon the work; all of its time so far counts as wasted.
+
+        A no-op once the result has been claimed or the work cancelled.
+        """
+        if self._outcome is not None:
+            return
+        self._task.cancel()
+        self._settle("cancelled", wasted=True)
+
+    def _settle(self, outcome: str, wasted: bool) -> None:
+        if self._outcome is not None:
+            return
+        self._outcome = outcome
+        elapsed = self.elapsed_ms
+        stats = _stats()
+        stats[outcome] += 1
+        stats["speculative_ms"] = round(stats["speculative_ms"] + elapsed, 2)
+        if wasted:
+            stats["wasted_ms"] = round(stats["wasted_ms"] + elapsed, 2)
+        if stats["speculative_ms"]:
+            stats["wasted_ratio"] = round(
+                stats["wasted_ms"] / stats["speculative_ms"], 3
+            )
+        stats["entries"].append(
+            {"name": self.name, "outcome": outcome, "elapsed_ms": round(elapsed, 2)}
+        )
+
+
+def _stats() -> dict[str, Any]:
+    """The running step's ``speculation`` counters (a scratch dict outside one)."""
+    telemetry = get_step_telemetry()
+    if telemetry is None:
+        telemetry = {}
+    stats: dict[str, Any] = telemetry.setdefault(
+        "speculation",
+        {
+            "launched": 0,
+            "used": 0,
+            "cancelled": 0,
+            "speculative_ms": 0.0,
+            "wasted_ms": 0.0,
+            "wasted_ratio": 0.0,
+            "entries": [],
+        },
+    )
+    return stats
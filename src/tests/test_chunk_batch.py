@@ -0,0 +1,163 @@
+"""Tests for the columnar ChunkBatch and the batch-aware retrieval helpers."""
+
+import pytest
+
+from lex_llm.api.connectors.lex_db_chunk_batch import ChunkBatch, StringTable
+from lex_llm.api.connectors.lex_db_connector import LexChunk, group_chunks_to_articles
+from lex_llm.tools.source_formatting import build_user_message_with_sources
+from lex_llm.utils.retrieval_helpers import (
+    FusedResult,
+    build_search_result,
+    context_fused_result,
+    deduplicate_chunks_to_sources,
+    set_retrieval_context,
+)
+from lex_llm.utils.rrf import (
+    RRFAccumulator,
+    reciprocal_rank_fusion,
+    reciprocal_rank_fusion_batches,
+)
+
+
+def _chunk(article_id: int, chunk_seq: int, title: str | None = None) -> LexChunk:
+    return LexChunk(
+        article_id=article_id,
+        chunk_seq=chunk_seq,
+        chunk_text=f"text {article_id}/{chunk_seq}",
+        title=title or f"Artikel {article_id}",
+        url=f"https://lex.dk/{article_id}" if article_id % 2 else None,
+    )
+
+
+RANKINGS = [
+    [_chunk(1, 0), _chunk(2, 3), _chunk(3, 1), _chunk(1, 2)],
+    [_chunk(2, 3), _chunk(4, 0), _chunk(1, 0)],
+    [_chunk(5, 1), _chunk(3, 1), _chunk(2, 0), _chunk(1, 1)],
+]
+
+
+def test_chunk_batch_round_trips_chunks_and_shares_strings() -> None:
+    strings = StringTable()
+    results = [
+        {
+            "article_id": 7,
+            "chunk_sequence": seq,
+            "chunk_text": f"t{seq}",
+            "title": "Rundetårn",
+            "url": None,
+        }
+        for seq in range(3)
+    ]
+    batch = ChunkBatch.from_retrieval_results(results, strings)
+
+    assert len(batch) == 3
+    # One title stored for three chunks
+    assert len(strings) == 1
+    assert batch[1] == LexChunk(
+        article_id=7, chunk_seq=1, chunk_text="t1", title="Rundetårn"
+    )
+    assert batch[1] is batch[1]
+    assert batch[:2].to_chunks() == batch.to_chunks()[:2]
+
+
+def test_batch_rrf_matches_list_rrf() -> None:
+    batches = [ChunkBatch.from_chunks(r) for r in RANKINGS]
+
+    fused = reciprocal_rank_fusion_batches(*batches, k=60)
+
+    assert fused.to_chunks() == reciprocal_rank_fusion(*RANKINGS, k=60)
+
+
+def test_batch_helpers_match_list_helpers() -> None:
+    fused = reciprocal_rank_fusion(*RANKINGS, k=60)
+    fused_batch = ChunkBatch.from_chunks(fused)
+    semantic = [c for r in RANKINGS[:2] for c in r]
+    fts = RANKINGS[2]
+
+    assert group_chunks_to_articles(fused_batch) == group_chunks_to_articles(fused)
+    assert deduplicate_chunks_to_sources(fused_batch) == deduplicate_chunks_to_sources(
+        fused
+    )
+    assert build_search_result(
+        ChunkBatch.concat([ChunkBatch.from_chunks(r) for r in RANKINGS[:2]]),
+        ChunkBatch.from_chunks(fts),
+        fused_batch,
+        60,
+    ) == build_search_result(semantic, fts, fused, 60)
+
+
+def test_weighted_rrf_scales_each_list() -> None:
+    batches = [ChunkBatch.from_chunks(r) for r in RANKINGS]
+
+    uniform = reciprocal_rank_fusion_batches(*batches, k=60, weights=[2.0] * 3)
+    boosted = reciprocal_rank_fusion(*RANKINGS, k=60, weights=[1.0, 1.0, 10.0])
+
+    assert uniform.to_chunks() == reciprocal_rank_fusion(*RANKINGS, k=60)
+    assert [(c.article_id, c.chunk_seq) for c in boosted[:2]] == [(3, 1), (5, 1)]
+
+
+def test_batch_rrf_returns_fused_scores_and_top_k() -> None:
+    batches = [ChunkBatch.from_chunks(r) for r in RANKINGS]
+
+    fused = reciprocal_rank_fusion_batches(*batches, k=60)
+    top = reciprocal_rank_fusion_batches(*batches, k=60, top_k=3)
+
+    # (2, 3) is ranked 2nd and 1st; (1, 0) is ranked 1st and 3rd
+    assert fused.score(0) == 1 / 62 + 1 / 61
+    assert fused.score(1) == 1 / 61 + 1 / 63
+    assert list(fused.scores) == sorted(fused.scores, reverse=True)
+    assert top == fused[:3]
+    assert list(top.scores) == list(fused.scores)[:3]
+    assert ChunkBatch.from_chunks(RANKINGS[0]).score(0) is None
+
+
+def test_rrf_accumulator_matches_batch_rrf_and_diffs_stages() -> None:
+    batches = [ChunkBatch.from_chunks(r) for r in RANKINGS]
+    accumulator = RRFAccumulator(k=60)
+
+    accumulator.extend(batches[:2])
+    first = accumulator.snapshot(3)
+    accumulator.add(batches[2])
+    diff = accumulator.snapshot(3).diff(first)
+
+    expected = reciprocal_rank_fusion_batches(*batches, k=60)
+    assert accumulator.top_k(3) == expected[:3]
+    assert list(accumulator.top_k(3).scores) == list(expected.scores)[:3]
+    assert (accumulator.lists, len(accumulator)) == (3, len(expected))
+    # The third list lifts (3, 1) above (4, 0)
+    assert diff.entered == ((3, 1),)
+    assert diff.left == ((4, 0),)
+    assert diff.lists_added == 1
+
+
+def test_rrf_accumulator_rejects_mismatched_weights() -> None:
+    batches = [ChunkBatch.from_chunks(r) for r in RANKINGS]
+    accumulator = RRFAccumulator(k=60)
+
+    with pytest.raises(ValueError, match="Expected 3 weights, got 2"):
+        accumulator.extend(batches, weights=[1.0, 0.5])
+    assert accumulator.lists == 0
+
+
+def test_fused_result_views_match_list_helpers() -> None:
+    batches = [ChunkBatch.from_chunks(r) for r in RANKINGS]
+    fused = reciprocal_rank_fusion_batches(*batches, k=60)
+    chunks = fused.to_chunks()
+    view = FusedResult(fused, rrf_k=60)
+
+    assert view.chunks == chunks
+    assert view.articles == group_chunks_to_articles(chunks)
+    assert view.sources == deduplicate_chunks_to_sources(chunks)
+    assert build_search_result([], [], view, 60) == build_search_result(
+        [], [], fused, 60
+    )
+    assert build_user_message_with_sources(
+        "q", view
+    ) == build_user_message_with_sources("q", chunks)
+    # Views are memoised
+    assert view.articles is view.articles
+
+    context: dict = {}
+    set_retrieval_context(context, view)
+    assert context_fused_result(context, context["retrieved_chunks"]) is view
+    assert context_fused_result(context, list(chunks)) is None
@@ -0,0 +1,937 @@
+"""Tests for the async LexDB connector and transport."""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from lex_db_api.models.text_type import TextType
+
+from lex_llm.api.connectors.lex_db_article_cache import (
+    ArticleCache,
+    get_article_cache,
+)
+from lex_llm.api.connectors.lex_db_batcher import MicroBatcher
+from lex_llm.api.connectors.lex_db_benchmark import build_cases, run_benchmark
+from lex_llm.api.connectors.lex_db_cache import RetrievalCache, get_retrieval_cache
+from lex_llm.api.connectors.lex_db_chunk_batch import ChunkBatch, StringTable
+from lex_llm.api.connectors.lex_db_circuit_breaker import CircuitBreakers
+from lex_llm.api.connectors.lex_db_connector import (
+    LexChunk,
+    LexDBConnector,
+    group_chunks_to_articles,
+)
+from lex_llm.api.connectors.lex_db_fallback_index import (
+    FallbackIndex,
+    build_fallback_index,
+)
+from lex_llm.api.connectors.lex_db_hedging import HedgingPolicy
+from lex_llm.api.connectors.lex_db_transport import LexDBTransport
+from lex_llm.api.observability.step_telemetry import set_step_telemetry
+from lex_llm.api.run_deadline import remaining_run_time, set_run_deadline
+
+
+# ── Fake LexDB responses ─────────────────────────────────────────────
+
+
+def _vector_result(article_id: int, chunk_seq: int = 0) -> dict[str, Any]:
+    return {
+        "id_in_index": article_id * 100 + chunk_seq,
+        "source_article_id": str(article_id),
+        "chunk_seq": chunk_seq,
+        "chunk_text": f"vector text {article_id}/{chunk_seq}",
+        "distance": 0.1,
+        "title": f"Artikel {article_id}",
+        "url": f"https://lex.dk/{article_id}",
+    }
+
+
+def _fts_result(article_id: int, chunk_seq: int = 0) -> dict[str, Any]:
+    return {
+        "id": article_id * 100 + chunk_seq,
+        "article_id": article_id,
+        "chunk_sequence": chunk_seq,
+        "chunk_text": f"fts text {article_id}/{chunk_seq}",
+        "score": 1.0,
+        "title": f"Artikel {article_id}",
+        "url": None,
+    }
+
+
+def _fake_lexdb(
+    delay: float = 0.0,
+    fail: bool = False,
+    vector_delay: float = 0.0,
+    requests: list[dict[str, Any]] | None = None,
+    query_delays: dict[str, float] | None = None,
+) -> httpx.MockTransport:
+    """Mock transport answering batch endpoints with one result per query.
+
+    Decoded request bodies are appended to ``requests`` when given. A
+    request containing a query listed in ``query_delays`` waits that long.
+    """
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if requests is not None:
+            requests.append(json.loads(request.content))
+        if delay:
+            await asyncio.sleep(delay)
+        if query_delays:
+            texts = [
+                q[0] if isinstance(q, list) else q
+                for q in json.loads(request.content)["queries"]
+            ]
+            await asyncio.sleep(max(query_delays.get(t, 0.0) for t in texts))
+        if vector_delay and "/vector-search/" in request.url.path:
+            await asyncio.sleep(vector_delay)
+        if fail:
+            raise httpx.ConnectError("LexDB is down", request=request)
+        body = json.loads(request.content)
+        if request.url.path.endswith("/vector-search/indexes/idx/batch"):
+            return httpx.Response(
+                200,
+                json=[
+                    {"results": [_vector_result(i + 1)]}
+                    for i, _ in enumerate(body["queries"])
+                ],
+            )
+        if request.url.path.endswith("/text-search/indexes/idx/batch"):
+            return httpx.Response(
+                200,
+                json=[[_fts_result(i + 10, 1)] for i, _ in enumerate(body["queries"])],
+            )
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def _timeout_enforcing_lexdb(
+    delay: float, requests: list[httpx.Request] | None = None
+) -> httpx.MockTransport:
+    """Mock full-text endpoint taking ``delay`` seconds within the read timeout.
+
+    ``MockTransport`` ignores timeouts, so a request whose read timeout is
+    shorter than ``delay`` raises ``httpx.ReadTimeout`` after that timeout.
+    """
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if requests is not None:
+            requests.append(request)
+        read_timeout = request.extensions["timeout"]["read"]
+        await asyncio.sleep(min(delay, read_timeout))
+        if read_timeout < delay:
+            raise httpx.ReadTimeout("timed out", request=request)
+        queries = json.loads(request.content)["queries"]
+        return httpx.Response(200, json=[[_fts_result(10, 1)] for _ in queries])
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture(autouse=True)
+def _clear_shared_cache() -> None:
+    cache = get_retrieval_cache()
+    if cache is not None:
+        cache.clear()
+    articles = get_article_cache()
+    if articles is not None:
+        articles.clear()
+
+
+def _chunks(n: int) -> ChunkBatch:
+    return ChunkBatch.from_chunks(
+        LexChunk(article_id=i, chunk_seq=0, chunk_text=f"text {i}") for i in range(n)
+    )
+
+
+# ── Tests ────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_batch_vector_search_returns_chunks_per_query() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb())
+    connector = LexDBConnector(transport=transport)
+
+    results = await connector.batch_vector_search(
+        queries=[("rundetårn", TextType.QUERY), ("tårn", TextType.PASSAGE)],
+        top_k=5,
+        index_name="idx",
+    )
+    await transport.aclose()
+
+    assert len(results) == 2
+    assert results[0] == [
+        LexChunk(
+            article_id=1,
+            chunk_seq=0,
+            chunk_text="vector text 1/0",
+            title="Artikel 1",
+            url="https://lex.dk/1",
+        )
+    ]
+    assert results[1][0].article_id == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_fulltext_search_returns_chunks_per_query() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb())
+    connector = LexDBConnector(transport=transport)
+
+    results = await connector.batch_fulltext_search(
+        queries=["rundetårn"], top_k=5, index_name="idx"
+    )
+    await transport.aclose()
+
+    assert len(results) == 1
+    assert results[0][0].article_id == 10
+    assert results[0][0].chunk_seq == 1
+    assert results[0][0].url is None
+
+
+@pytest.mark.asyncio
+async def test_connection_error_returns_empty_lists() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(fail=True))
+    connector = LexDBConnector(transport=transport)
+
+    results = await connector.batch_fulltext_search(
+        queries=["a", "b"], top_k=5, index_name="idx"
+    )
+    await transport.aclose()
+
+    assert results == [[], []]
+
+
+@pytest.mark.asyncio
+async def test_searches_do_not_block_event_loop() -> None:
+    """Concurrent searches must overlap instead of running back to back."""
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(delay=0.1))
+    connector = LexDBConnector(transport=transport)
+
+    t_start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            connector.batch_fulltext_search(queries=[f"q{i}"], index_name="idx")
+            for i in range(5)
+        )
+    )
+    elapsed = time.perf_counter() - t_start
+    await transport.aclose()
+
+    assert elapsed < 0.3, f"searches ran serially ({elapsed:.2f}s)"
+
+
+@pytest.mark.asyncio
+async def test_batch_hybrid_search_runs_both_sides_concurrently() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(delay=0.1))
+    connector = LexDBConnector(transport=transport)
+
+    t_start = time.perf_counter()
+    semantic, fts = await connector.batch_hybrid_search(
+        semantic_queries=[("rundetårn", TextType.QUERY)],
+        keyword_queries=["rundetårn", "tårn"],
+        index_name="idx",
+    )
+    elapsed = time.perf_counter() - t_start
+    await transport.aclose()
+
+    assert [len(qs) for qs in semantic] == [1]
+    assert [len(qs) for qs in fts] == [1, 1]
+    assert elapsed < 0.18, f"hybrid fetch was serial ({elapsed:.2f}s)"
+
+
+@pytest.mark.asyncio
+async def test_batch_hybrid_search_returns_partial_results_on_deadline() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(vector_delay=1.0))
+    connector = LexDBConnector(transport=transport)
+
+    semantic, fts = await connector.batch_hybrid_search(
+        semantic_queries=[("a", TextType.QUERY), ("b", TextType.QUERY)],
+        keyword_queries=["a"],
+        index_name="idx",
+        timeout=0.1,
+    )
+    await transport.aclose()
+
+    assert semantic == [[], []]
+    assert fts[0][0].article_id == 10
+
+
+def test_retrieval_cache_answers_smaller_top_k_from_superset() -> None:
+    cache = RetrievalCache(ttl=60, max_bytes=1_000_000)
+    cache.put(("idx", "query", "tårn"), 50, _chunks(50))
+
+    assert cache.get(("idx", "query", "tårn"), 30) == _chunks(30)
+    assert cache.get(("idx", "query", "tårn"), 60) is None
+    assert cache.get(("idx", "passage", "tårn"), 30) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_retrieval_cache_treats_short_results_as_complete() -> None:
+    cache = RetrievalCache(ttl=60, max_bytes=1_000_000)
+    cache.put(("idx", "fulltext", "sjælden"), 50, _chunks(3))
+
+    assert cache.get(("idx", "fulltext", "sjælden"), 100) == _chunks(3)
+
+
+def test_retrieval_cache_expires_and_evicts() -> None:
+    expired = RetrievalCache(ttl=0.0, max_bytes=1_000_000)
+    expired.put(("idx", "fulltext", "a"), 5, _chunks(5))
+    assert expired.get(("idx", "fulltext", "a"), 5) is None
+    assert len(expired) == 0
+
+    small = RetrievalCache(ttl=60, max_bytes=int(_chunks(5).nbytes * 1.5))
+    small.put(("idx", "fulltext", "a"), 5, _chunks(5))
+    small.put(("idx", "fulltext", "b"), 5, _chunks(5))
+    assert small.get(("idx", "fulltext", "a"), 5) is None
+    assert small.get(("idx", "fulltext", "b"), 5) is not None
+    assert small.nbytes <= small.max_bytes
+    assert small.evictions == 1
+
+
+def test_retrieval_cache_charges_a_shared_string_table_once() -> None:
+    # Per-query batches of one response share their title/url strings
+    strings = StringTable()
+    batches = []
+    for q in range(3):
+        batch = ChunkBatch(strings)
+        for i in range(5):
+            batch.append(i, q, f"text {q}/{i}", f"Artikel {i}", f"https://lex.dk/{i}")
+        batches.append(batch)
+    cache = RetrievalCache(ttl=60, max_bytes=1_000_000)
+    for q, batch in enumerate(batches):
+        cache.put(("idx", "fulltext", str(q)), 5, batch)
+
+    columns = sum(batch.column_nbytes for batch in batches)
+    assert cache.nbytes == columns + strings.nbytes
+
+    cache.invalidate("idx")
+    assert cache.nbytes == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_search_only_fetches_cache_misses() -> None:
+    requests: list[dict[str, Any]] = []
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(requests=requests))
+    connector = LexDBConnector(
+        transport=transport, cache=RetrievalCache(ttl=60, max_bytes=1_000_000)
+    )
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    try:
+        first = await connector.batch_fulltext_search(
+            queries=["a"], top_k=50, index_name="idx"
+        )
+        second = await connector.batch_fulltext_search(
+            queries=["a", "b"], top_k=30, index_name="idx"
+        )
+    finally:
+        set_step_telemetry(None)
+        await transport.aclose()
+
+    assert second[0] == first[0]
+    assert [r["queries"] for r in requests] == [["a"], ["b"]]
+    assert telemetry["lexdb_cache"] == {"hits": 1, "misses": 2}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_request() -> None:
+    requests: list[dict[str, Any]] = []
+    transport = LexDBTransport(
+        "http://lexdb", transport=_fake_lexdb(delay=0.05, requests=requests)
+    )
+    connectors = [
+        LexDBConnector(
+            transport=transport, cache=RetrievalCache(ttl=60, max_bytes=1_000_000)
+        )
+        for _ in range(5)
+    ]
+
+    results = await asyncio.gather(
+        *(
+            c.batch_fulltext_search(queries=["nyhed"], top_k=10, index_name="idx")
+            for c in connectors
+        )
+    )
+    await transport.aclose()
+
+    assert len(requests) == 1
+    assert all(r == results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_request() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(delay=0.1))
+    leader = LexDBConnector(
+        transport=transport, cache=RetrievalCache(ttl=60, max_bytes=1_000_000)
+    )
+    follower = LexDBConnector(
+        transport=transport, cache=RetrievalCache(ttl=60, max_bytes=1_000_000)
+    )
+
+    leader_task = asyncio.create_task(
+        leader.batch_fulltext_search(queries=["nyhed"], index_name="idx")
+    )
+    await asyncio.sleep(0.01)
+    follower_task = asyncio.create_task(
+        follower.batch_fulltext_search(queries=["nyhed"], index_name="idx")
+    )
+    await asyncio.sleep(0.01)
+    leader_task.cancel()
+
+    results = await follower_task
+    await transport.aclose()
+
+    assert leader_task.cancelled()
+    assert results[0][0].article_id == 10
+
+
+@pytest.mark.asyncio
+async def test_shared_request_is_not_bound_to_the_leaders_deadline() -> None:
+    requests: list[httpx.Request] = []
+    transport = LexDBTransport(
+        "http://lexdb", transport=_timeout_enforcing_lexdb(0.2, requests)
+    )
+
+    async def search_within(seconds: float) -> list[list[LexChunk]]:
+        set_run_deadline(seconds)
+        connector = LexDBConnector(transport=transport, cache=RetrievalCache(ttl=0))
+        return await connector.batch_fulltext_search(["nyhed"], index_name="idx")
+
+    # The short-deadline run leads the shared request, the other joins it
+    short = asyncio.create_task(search_within(0.05))
+    await asyncio.sleep(0.01)
+    long = asyncio.create_task(search_within(5.0))
+    short_results, long_results = await asyncio.gather(short, long)
+    await transport.aclose()
+
+    assert len(requests) == 1
+    assert requests[0].extensions["timeout"]["read"] == transport.timeout
+    assert short_results == [[]]
+    assert long_results[0][0].article_id == 10
+
+
+@pytest.mark.asyncio
+async def test_hedging_races_a_duplicate_for_slow_requests() -> None:
+    policy = HedgingPolicy(percentile=90, budget_ratio=1.0, min_samples=3)
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        # Warm-up calls are fast; the first real call stalls, its hedge is fast
+        await asyncio.sleep(1.0 if calls == 4 else 0.01)
+        return f"call {calls}"
+
+    for _ in range(3):
+        await policy.run("/batch", call)
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    try:
+        t0 = time.monotonic()
+        result = await policy.run("/batch", call)
+        elapsed = time.monotonic() - t0
+    finally:
+        set_step_telemetry(None)
+
+    assert result == "call 5"
+    assert elapsed < 0.5
+    assert telemetry["lexdb_hedging"] == {"requests": 1, "hedges": 1, "hedge_wins": 1}
+    assert policy.stats()["hedge_win_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_hedging_respects_budget() -> None:
+    policy = HedgingPolicy(
+        percentile=50, budget_ratio=0.25, min_samples=1, min_delay=0.0
+    )
+
+    async def call() -> None:
+        await asyncio.sleep(0.02)
+
+    await policy.run("/batch", call)
+    await asyncio.gather(*(policy.run("/batch", call) for _ in range(8)))
+
+    # 9 requests at 0.25 tokens each buy at most two hedges
+    assert policy.hedges <= 2
+    assert policy.stats()["hedge_rate"] <= 0.25
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_and_recovers() -> None:
+    requests: list[dict[str, Any]] = []
+    down = LexDBTransport(
+        "http://lexdb", transport=_fake_lexdb(fail=True, requests=requests)
+    )
+    breakers = CircuitBreakers(failure_threshold=2, reset_timeout=0.05)
+    connector = LexDBConnector(
+        transport=down, cache=RetrievalCache(ttl=0), breakers=breakers
+    )
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    try:
+        for _ in range(4):
+            results = await connector.batch_fulltext_search(["q"], index_name="idx")
+            assert results == [[]]
+    finally:
+        set_step_telemetry(None)
+    await down.aclose()
+
+    # Two failures open the circuit; the next two calls never reach LexDB
+    assert len(requests) == 2
+    assert telemetry["lexdb_circuit"] == {"failures": 2, "opened": 1, "rejected": 2}
+
+    await asyncio.sleep(0.06)
+    up = LexDBTransport("http://lexdb", transport=_fake_lexdb())
+    connector = LexDBConnector(
+        transport=up, cache=RetrievalCache(ttl=0), breakers=breakers
+    )
+    results = await connector.batch_fulltext_search(["q"], index_name="idx")
+    await up.aclose()
+
+    assert results[0][0].article_id == 10
+    assert set(breakers.states().values()) == {"closed"}
+
+
+def test_late_failures_do_not_extend_an_open_circuit() -> None:
+    breaker = CircuitBreakers(failure_threshold=1, reset_timeout=0.05).get("/batch")
+    assert breaker.allow() and breaker.allow()
+    assert breaker.record_failure() is True
+    time.sleep(0.03)
+    # The second request was sent before the circuit opened and fails late
+    assert breaker.record_failure() is False
+    time.sleep(0.03)
+
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+
+
+@pytest.mark.asyncio
+async def test_run_deadline_caps_lexdb_calls() -> None:
+    requests: list[dict[str, Any]] = []
+    transport = LexDBTransport(
+        "http://lexdb", transport=_fake_lexdb(delay=1.0, requests=requests)
+    )
+    connector = LexDBConnector(transport=transport, cache=RetrievalCache(ttl=0))
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    set_run_deadline(0.1)
+    try:
+        t0 = time.monotonic()
+        results = await connector.batch_fulltext_search(["q"], index_name="idx")
+        elapsed = time.monotonic() - t0
+        # Once the deadline has passed, LexDB is not called at all
+        await connector.batch_fulltext_search(["other"], index_name="idx")
+    finally:
+        set_run_deadline(None)
+        set_step_telemetry(None)
+    await transport.aclose()
+
+    assert results == [[]]
+    assert elapsed < 0.5
+    assert len(requests) == 1
+    assert telemetry["lexdb_deadline"]["expired"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_run_deadline_expires_while_shared_search_is_in_flight() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(delay=0.3))
+    connector = LexDBConnector(transport=transport, cache=RetrievalCache(ttl=0))
+    follower = LexDBConnector(transport=transport, cache=RetrievalCache(ttl=0))
+    leader = asyncio.create_task(
+        connector.batch_fulltext_search(["q"], index_name="idx")
+    )
+    await asyncio.sleep(0.01)
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    set_run_deadline(0.05)
+    try:
+        t0 = time.monotonic()
+        results = await follower.batch_fulltext_search(["q"], index_name="idx")
+        elapsed = time.monotonic() - t0
+    finally:
+        set_run_deadline(None)
+        set_step_telemetry(None)
+    leader_results = await leader
+    await transport.aclose()
+
+    assert results == [[]]
+    assert elapsed < 0.2
+    assert telemetry["lexdb_deadline"] == {"expired": 1}
+    assert telemetry["lexdb_calls"][0]["error"] == "deadline"
+    assert leader_results[0][0].article_id == 10
+
+
+@pytest.mark.asyncio
+async def test_deadline_capped_timeout_is_not_a_circuit_failure() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_timeout_enforcing_lexdb(0.2))
+    breakers = CircuitBreakers(failure_threshold=1, reset_timeout=60)
+    connector = LexDBConnector(
+        transport=transport, cache=RetrievalCache(ttl=0), breakers=breakers
+    )
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    set_run_deadline(0.05)
+    try:
+        results = await connector.vector_search("q", index_name="idx")
+    finally:
+        set_run_deadline(None)
+        set_step_telemetry(None)
+    await transport.aclose()
+
+    assert results == []
+    assert telemetry["lexdb_calls"][0]["error"] == "ReadTimeout"
+    assert "lexdb_circuit" not in telemetry
+    assert set(breakers.states().values()) == {"closed"}
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_combines_concurrent_runs() -> None:
+    requests: list[dict[str, Any]] = []
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(requests=requests))
+    batcher = MicroBatcher(window=0.02, max_queries=64)
+
+    async def run(queries: list[str], top_k: int) -> list[list[LexChunk]]:
+        connector = LexDBConnector(
+            transport=transport, cache=RetrievalCache(ttl=0), batcher=batcher
+        )
+        return await connector.batch_fulltext_search(
+            queries, top_k=top_k, index_name="idx"
+        )
+
+    first, second = await asyncio.gather(run(["a", "b"], 5), run(["b", "c"], 20))
+    await transport.aclose()
+
+    # One request, deduplicated, at the largest top_k
+    assert requests == [{"queries": ["a", "b", "c"], "top_k": 20}]
+    assert [r[0].article_id for r in first] == [10, 11]
+    assert [r[0].article_id for r in second] == [11, 12]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_flushes_at_size_cap() -> None:
+    requests: list[dict[str, Any]] = []
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(requests=requests))
+    # A long window: only the size cap can trigger the send
+    batcher = MicroBatcher(window=10.0, max_queries=2)
+    connector = LexDBConnector(
+        transport=transport, cache=RetrievalCache(ttl=0), batcher=batcher
+    )
+
+    results = await asyncio.wait_for(
+        connector.batch_fulltext_search(["a", "b"], index_name="idx"), timeout=1.0
+    )
+    await transport.aclose()
+
+    assert len(results) == 2
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("window,max_queries", [(0.02, 64), (10.0, 2)])
+async def test_micro_batcher_sends_outside_the_callers_context(
+    window: float, max_queries: int
+) -> None:
+    deadlines: list[float | None] = []
+
+    async def send(queries: list[str], top_k: int) -> list[ChunkBatch]:
+        deadlines.append(remaining_run_time())
+        return [_chunks(top_k) for _ in queries]
+
+    batcher = MicroBatcher(window=window, max_queries=max_queries)
+
+    async def run(query: str, seconds: float) -> list[ChunkBatch]:
+        set_run_deadline(seconds)
+        return await batcher.submit("idx", [query], 5, send)
+
+    first, second = await asyncio.wait_for(
+        asyncio.gather(run("a", 0.5), run("b", 5.0)), timeout=1.0
+    )
+
+    # Sent once, by the window timer or the size cap, under no run's deadline
+    assert deadlines == [None]
+    assert len(first[0]) == len(second[0]) == 5
+
+
+@pytest.mark.asyncio
+async def test_progressive_search_yields_fast_shards_first() -> None:
+    transport = LexDBTransport(
+        "http://lexdb", transport=_fake_lexdb(query_delays={"slow": 0.2})
+    )
+    connector = LexDBConnector(transport=transport, cache=RetrievalCache(ttl=0))
+
+    arrivals: list[tuple[str, int]] = []
+    t0 = time.monotonic()
+    async for side, start, batches in connector.progressive_hybrid_search(
+        semantic_queries=[("slow", TextType.PASSAGE), ("fast", TextType.QUERY)],
+        keyword_queries=["fast"],
+        index_name="idx",
+    ):
+        assert len(batches) == 1
+        arrivals.append((side, start))
+        if len(arrivals) == 2:
+            assert time.monotonic() - t0 < 0.15
+    await transport.aclose()
+
+    assert arrivals[-1] == ("semantic", 0)
+    assert sorted(arrivals[:2]) == [("fulltext", 0), ("semantic", 1)]
+
+
+def _build_fallback(path: Any, index_name: str | None = None) -> FallbackIndex:
+    articles = [
+        {
+            "id": 1,
+            "title": "Rundetårn",
+            "url": "https://lex.dk/Rundetårn",
+            "xhtml_md": (
+                "Rundetårn er et tårn i København.\n\nDet blev bygget af Christian 4."
+            ),
+        },
+        {"id": 2, "title": "Eiffeltårnet", "url": None, "xhtml_md": "Et tårn i Paris."},
+    ]
+    assert build_fallback_index(articles, path, max_chars=40) == 3
+    return FallbackIndex(path, index_name)
+
+
+def test_fallback_index_ranks_chunks_by_bm25(tmp_path: Any) -> None:
+    index = _build_fallback(tmp_path / "lex.bm25")
+
+    results = index.search("tårn i København", top_k=2)
+    [missing] = index.batch_search(["ukendt"])
+    index.close()
+
+    assert [(c.article_id, c.chunk_seq) for c in results] == [(1, 0), (2, 0)]
+    assert results[0].title == "Rundetårn"
+    assert results[0].url == "https://lex.dk/Rundetårn"
+    assert results[1].url is None
+    assert len(missing) == 0
+
+
+@pytest.mark.asyncio
+async def test_fulltext_search_fails_over_to_fallback_index(tmp_path: Any) -> None:
+    index = _build_fallback(tmp_path / "lex.bm25")
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(fail=True))
+    cache = RetrievalCache()
+    connector = LexDBConnector(transport=transport, cache=cache, fallback=index)
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    try:
+        results = await connector.batch_fulltext_search(
+            ["paris", "christian"], top_k=5, index_name="idx"
+        )
+    finally:
+        set_step_telemetry(None)
+    await transport.aclose()
+    index.close()
+
+    assert [[(c.article_id, c.chunk_seq) for c in r] for r in results] == [
+        [(2, 0)],
+        [(1, 1)],
+    ]
+    assert telemetry["lexdb_fallback"] == {"queries": 2}
+    # Fallback results must not mask LexDB's own results once it recovers
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_fallback_index_only_answers_for_its_own_index(tmp_path: Any) -> None:
+    index = _build_fallback(tmp_path / "lex.bm25", index_name="idx")
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(fail=True))
+    connector = LexDBConnector(
+        transport=transport, cache=RetrievalCache(), fallback=index
+    )
+
+    other = await connector.batch_fulltext_search(["paris"], index_name="other")
+    own = await connector.batch_fulltext_search(["paris"], index_name="idx")
+    await transport.aclose()
+    index.close()
+
+    assert other == [[]]
+    assert [(c.article_id, c.chunk_seq) for c in own[0]] == [(2, 0)]
+
+
+def _fake_articles(
+    requested: list[list[int]], delay: float = 0.0
+) -> httpx.MockTransport:
+    """Mock ``/api/articles`` knowing every id except multiples of 7."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        ids = [int(i) for i in request.url.params["ids"].split(",")]
+        requested.append(ids)
+        if delay:
+            await asyncio.sleep(delay)
+        entries = [
+            {
+                "id": i,
+                "xhtml_md": f"Hele artikel {i}",
+                "rank": 0.0,
+                "title": f"Artikel {i}",
+                "url": f"https://lex.dk/{i}",
+            }
+            for i in ids
+            if i % 7
+        ]
+        return httpx.Response(
+            200, json={"entries": entries, "total": len(entries), "limit": len(ids)}
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_get_articles_pages_ids_and_caches_missing() -> None:
+    requested: list[list[int]] = []
+    transport = LexDBTransport("http://lexdb", transport=_fake_articles(requested))
+    connector = LexDBConnector(transport=transport, articles=ArticleCache())
+
+    first = await connector.get_articles(range(1, 151))
+    second = await connector.get_articles([7, 3, 151])
+    await transport.aclose()
+
+    # 150 ids need two pages; the second call only asks for the unseen id
+    assert sorted(len(ids) for ids in requested) == [1, 50, 100]
+    assert len(first) == 150 - 21
+    assert list(second) == [3, 151]
+    assert second[3].text == "Hele artikel 3"
+
+
+@pytest.mark.asyncio
+async def test_get_articles_stops_waiting_at_the_run_deadline() -> None:
+    requested: list[list[int]] = []
+    transport = LexDBTransport(
+        "http://lexdb", transport=_fake_articles(requested, delay=0.3)
+    )
+    connector = LexDBConnector(transport=transport, articles=ArticleCache())
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    set_run_deadline(0.05)
+    try:
+        t0 = time.monotonic()
+        found = await connector.get_articles([1, 2])
+        elapsed = time.monotonic() - t0
+    finally:
+        set_run_deadline(None)
+        set_step_telemetry(None)
+    await transport.aclose()
+
+    assert found == {}
+    assert elapsed < 0.2
+    assert telemetry["lexdb_calls"][0]["error"] == "deadline"
+
+
+def test_group_chunks_to_articles_uses_hydrated_records() -> None:
+    chunks = [
+        LexChunk(article_id=1, chunk_seq=2, chunk_text="chunk", title=None),
+        LexChunk(article_id=2, chunk_seq=0, chunk_text="other", title="B"),
+    ]
+    records = {
+        1: group_chunks_to_articles(
+            [LexChunk(article_id=1, chunk_seq=0, chunk_text="full", title="A")]
+        )[0]
+    }
+
+    articles = group_chunks_to_articles(chunks, records, full_text=True)
+
+    assert [(a.id, a.title, a.text, a.highlight) for a in articles] == [
+        (1, "A", "full", "chunk"),
+        (2, "B", "other", "other"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_federated_search_returns_at_quorum() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if "/indexes/slow/" in request.url.path:
+            await asyncio.sleep(1.0)
+        if "/vector-search/" in request.url.path:
+            return httpx.Response(
+                200, json=[{"results": [_vector_result(1)]} for _ in body["queries"]]
+            )
+        return httpx.Response(200, json=[[_fts_result(2)] for _ in body["queries"]])
+
+    transport = LexDBTransport("http://lexdb", transport=httpx.MockTransport(handler))
+    connector = LexDBConnector(transport=transport, cache=RetrievalCache(ttl=0))
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    try:
+        t0 = time.monotonic()
+        results = await connector.federated_hybrid_search_columnar(
+            semantic_queries=[("q", TextType.QUERY)],
+            keyword_queries=["q"],
+            index_names=["slow", "fast"],
+            quorum=1,
+        )
+        elapsed = time.monotonic() - t0
+    finally:
+        set_step_telemetry(None)
+    await transport.aclose()
+
+    assert list(results) == ["fast"]
+    semantic, fulltext = results["fast"]
+    assert semantic[0].article_ids[0] == 1
+    assert fulltext[0].article_ids[0] == 2
+    assert elapsed < 0.5
+    assert telemetry["lexdb_federation"] == {"cancelled": 1}
+
+
+@pytest.mark.asyncio
+async def test_batch_search_records_lexdb_call() -> None:
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb())
+    connector = LexDBConnector(transport=transport, cache=RetrievalCache())
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    try:
+        await connector.batch_fulltext_search(["a"], top_k=5, index_name="idx")
+        await connector.batch_fulltext_search(["a", "b"], top_k=5, index_name="idx")
+    finally:
+        set_step_telemetry(None)
+    await transport.aclose()
+
+    first, second = telemetry["lexdb_calls"]
+    assert first["endpoint"] == "text-search/batch"
+    assert first["index"] == "idx"
+    assert (first["queries"], first["top_k"], first["results"]) == (1, 5, 1)
+    assert (first["cache_hits"], first["cache_misses"]) == (0, 1)
+    assert first["response_bytes"] > 0
+    assert first["latency_ms"] >= 0
+    assert (second["cache_hits"], second["cache_misses"]) == (1, 1)
+    assert "error" not in second
+
+
+@pytest.mark.asyncio
+async def test_benchmark_batches_queries_and_reports_percentiles() -> None:
+    requests: list[dict[str, Any]] = []
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(requests=requests))
+    cases = build_cases(["vector-batch", "text-batch"], ["idx"], [1, 2], [5])
+    results = await run_benchmark(transport, cases, ["a", "b", "c"], concurrency=2)
+    await transport.aclose()
+
+    assert [(r.case.endpoint, r.case.batch_size) for r in results] == [
+        ("vector-batch", 1),
+        ("vector-batch", 2),
+        ("text-batch", 1),
+        ("text-batch", 2),
+    ]
+    assert [len(body["queries"]) for body in requests[3:5]] == [2, 1]
+    summary = results[1].summary()
+    assert (summary["requests"], summary["errors"], summary["avg_results"]) == (
+        2,
+        0,
+        1.5,
+    )
+    assert summary["top_k"] == 5
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+
+
+@pytest.mark.asyncio
+async def test_benchmark_sends_embeddings_once_per_query() -> None:
+    requests: list[dict[str, Any]] = []
+    transport = LexDBTransport("http://lexdb", transport=_fake_lexdb(requests=requests))
+    cases = build_cases(["embeddings"], ["idx"], [4], [5])
+    [result] = await run_benchmark(transport, cases, ["a", "b", "c"], rounds=2)
+    await transport.aclose()
+
+    assert requests == [{"num_texts": 4}] * 6
+    assert len(result.latencies) + result.errors == 6
@@ -0,0 +1,79 @@
+"""Tests for the local LexDB stand-in server."""
+
+import random
+import re
+from pathlib import Path
+
+import httpx
+import pytest
+
+from lex_db_api.models.text_type import TextType
+
+from lex_llm.api.connectors.lex_db_cache import RetrievalCache
+from lex_llm.api.connectors.lex_db_circuit_breaker import CircuitBreakers
+from lex_llm.api.connectors.lex_db_connector import LexDBConnector
+from lex_llm.api.connectors.lex_db_standin import (
+    LatencyModel,
+    StandInConfig,
+    create_app,
+    synthetic_corpus,
+)
+from lex_llm.api.connectors.lex_db_transport import LexDBTransport
+
+SPEC = Path(__file__).parents[2] / "openapi" / "lex-db.yaml"
+
+
+def _connector(config: StandInConfig | None = None) -> LexDBConnector:
+    app = create_app(synthetic_corpus(40), config)
+    transport = LexDBTransport("http://standin", transport=httpx.ASGITransport(app=app))
+    return LexDBConnector(
+        transport=transport, cache=RetrievalCache(), breakers=CircuitBreakers()
+    )
+
+
+def test_standin_serves_every_path_in_the_spec() -> None:
+    spec_paths = set(re.findall(r"^  (/\S*):$", SPEC.read_text(), re.MULTILINE))
+    app_paths = {getattr(route, "path", None) for route in create_app([]).routes}
+    assert spec_paths and spec_paths <= app_paths
+
+
+@pytest.mark.asyncio
+async def test_connector_searches_and_hydrates_against_standin() -> None:
+    connector = _connector()
+    title = synthetic_corpus(40)[6]["title"]
+
+    semantic = await connector.batch_vector_search(
+        [(title, TextType.QUERY)], top_k=5, index_name="article_embeddings_e5"
+    )
+    fulltext = await connector.batch_fulltext_search(
+        [title], top_k=5, index_name="article_embeddings_e5"
+    )
+    articles = await connector.get_articles([7, 9999])
+
+    assert len(semantic[0]) == 5
+    assert semantic[0][0].article_id == 7
+    assert fulltext[0][0].article_id == 7
+    assert list(articles) == [7]
+    assert articles[7].title == title
+
+
+@pytest.mark.asyncio
+async def test_standin_injects_errors_and_caps_results() -> None:
+    failing = _connector(StandInConfig(error_rate=1.0))
+    assert await failing.batch_fulltext_search(
+        ["kongen"], top_k=5, index_name="article_embeddings_e5"
+    ) == [[]]
+
+    capped = _connector(StandInConfig(max_results=2))
+    results = await capped.batch_fulltext_search(
+        ["kongen"], top_k=5, index_name="article_embeddings_e5"
+    )
+    assert len(results[0]) == 2
+
+
+def test_latency_model_is_reproducible() -> None:
+    model = LatencyModel(median_ms=20, sigma=0.5, per_query_ms=1, tail_rate=0.1)
+    first = [model.sample(random.Random(3), queries=4) for _ in range(3)]
+    second = [model.sample(random.Random(3), queries=4) for _ in range(3)]
+    assert first == second
+    assert all(s > 0.003 for s in first)
@@ -4,16 +4,20 @@ import asyncio
 import json
 import os
 import tempfile
+from types import SimpleNamespace
 from typing import AsyncGenerator, Any, List
 import pytest
 import pytest_asyncio
 
+from lex_llm.api import orchestrator as orchestrator_module
 from lex_llm.api.orchestrator import Orchestrator
 from lex_llm.api.event_emitter import EventEmitter
 from lex_llm.api.event_models import WorkflowRunRequest, ConversationMessage
 from lex_llm.api.connectors.llm_provider import LLMProvider
 from lex_llm.api.connectors.vllm_load_probe import VLLMLoadProbe
 from lex_llm.api.observability.run_recorder import RunRecorder
+from lex_llm.api.observability.step_telemetry import append_step_entry
+from lex_llm.utils.adaptive_depth import AdaptiveDepth
 
 
 # ── Fake LLM providers ───────────────────────────────────────────────
@@ -41,6 +45,25 @@ class FakeLLM(LLMProvider):
         return out
 
 
+class ClosableLLM(FakeLLM):
+    """FakeLLM that records whether its stream was closed before the end."""
+
+    def __init__(self, model: str = "closable-model"):
+        super().__init__(model=model)
+        self.closed_early = False
+
+    async def generate_stream(
+        self, messages: List[ConversationMessage]
+    ) -> AsyncGenerator[str, None]:
+        finished = False
+        try:
+            async for token in super().generate_stream(messages):
+                yield token
+            finished = True
+        finally:
+            self.closed_early = not finished
+
+
 class FailingPrimaryLLM(LLMProvider):
     """LLM that raises before yielding a first token."""
 
@@ -126,6 +149,46 @@ async def _failing_step(
     yield  # type: ignore  # pragma: no cover
 
 
+async def _lexdb_step(
+    context: dict[str, Any], emitter: EventEmitter
+) -> AsyncGenerator[str | None, None]:
+    """Step that records two LexDB calls, as LexDBConnector does."""
+    for latency, error in ((40.0, None), (10.0, "ConnectError")):
+        append_step_entry(
+            "lexdb_calls",
+            {
+                "endpoint": "text-search/batch",
+                "index": "idx",
+                "queries": 2,
+                "top_k": 50,
+                "results": 3,
+                "cache_hits": 1,
+                "cache_misses": 1,
+                "latency_ms": latency,
+                "response_bytes": 100,
+                "error": error,
+            },
+        )
+    yield None
+
+
+async def _survivor_depth_step(
+    context: dict[str, Any], emitter: EventEmitter
+) -> AsyncGenerator[str | None, None]:
+    """Step that logs survivor depths, as AdaptiveDepth does."""
+    append_step_entry(
+        "survivor_depth",
+        {
+            "side": "semantic",
+            "query_type": "query",
+            "index": "idx",
+            "requested": 50,
+            "depths": [7, 12],
+        },
+    )
+    yield None
+
+
 # ── Fixtures ─────────────────────────────────────────────────────────
 
 
@@ -380,6 +443,82 @@ async def test_fallback_on_primary_error(
     assert calls[0]["output_chars"] > 0, "output_chars must be > 0 for fallback"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("primary_fails", "overloaded"), [(False, False), (False, True), (True, False)]
+)
+async def test_routing_closes_upstream_stream_on_early_stop(
+    primary_fails: bool, overloaded: bool
+) -> None:
+    """Stopping early must close whichever backend streamed, and count its output."""
+    from lex_llm.api.connectors.routing_llm_provider import RoutingLLMProvider
+
+    primary = FailingPrimaryLLM() if primary_fails else ClosableLLM("primary")
+    fallback = ClosableLLM("fallback")
+    provider = RoutingLLMProvider(primary, fallback, FakeProbe(overloaded=overloaded))
+    telemetry: dict[str, Any] = {}
+
+    async with provider.observe(telemetry=telemetry):
+        stream = provider.generate_stream(
+            [ConversationMessage(role="user", content="hello")]
+        )
+        assert await stream.__anext__() == "Hello"
+        await stream.aclose()
+
+    upstream = fallback if primary_fails or overloaded else primary
+    assert isinstance(upstream, ClosableLLM) and upstream.closed_early
+    assert telemetry["llm_calls"][0]["output_chars"] == len("Hello")
+
+
+class _FakeCompletionStream:
+    """Stand-in for a litellm streaming response."""
+
+    def __init__(self, tokens: list[str]) -> None:
+        self.tokens = tokens
+        self.closed = False
+
+    def __aiter__(self) -> "_FakeCompletionStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if not self.tokens:
+            raise StopAsyncIteration
+        delta = SimpleNamespace(content=self.tokens.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider_name", ["openai", "openrouter"])
+async def test_provider_closes_completion_stream_on_early_stop(
+    monkeypatch: pytest.MonkeyPatch, provider_name: str
+) -> None:
+    """A consumer stopping early must close the upstream litellm response."""
+    from lex_llm.api.connectors import openai_provider, openrouter_provider
+
+    upstream = _FakeCompletionStream(["Hello", " world"])
+
+    async def _acompletion(**_: Any) -> _FakeCompletionStream:
+        return upstream
+
+    if provider_name == "openai":
+        monkeypatch.setattr(openai_provider.litellm, "acompletion", _acompletion)
+        provider: LLMProvider = openai_provider.OpenAIProvider()
+    else:
+        monkeypatch.setattr(openrouter_provider.litellm, "acompletion", _acompletion)
+        provider = openrouter_provider.OpenRouterProvider()
+
+    stream = provider.generate_stream(
+        [ConversationMessage(role="user", content="hello")]
+    )
+    assert await stream.__anext__() == "Hello"
+    await stream.aclose()
+
+    assert upstream.closed
+
+
 @pytest.mark.asyncio
 async def test_workflow_metrics_e2e_positive(
     request_fixture: WorkflowRunRequest,
@@ -426,3 +565,45 @@ async def test_run_recorder_writes_row() -> None:
         parsed = json.loads(line)
         assert parsed["run_id"] == "rec-test-1"
         assert parsed["e2e_ms"] == 123.45
+
+
+@pytest.mark.asyncio
+async def test_lexdb_calls_aggregated_into_workflow_metrics(
+    request_fixture: WorkflowRunRequest,
+) -> None:
+    orch = Orchestrator(request_fixture, [(_lexdb_step, "")], workflow_id="lexdb_wf")
+    events = [e async for e in orch.execute()]
+
+    metrics = next(
+        json.loads(ev.strip())["data"] for ev in events if '"workflow_metrics"' in ev
+    )
+    summary = metrics["lexdb_summary"]
+    assert summary["calls"] == 2
+    assert summary["errors"] == 1
+    assert summary["latency_ms"] == 50.0
+    assert summary["max_latency_ms"] == 40.0
+    assert summary["response_bytes"] == 200
+    assert summary["cache_hits"] == 2
+    assert summary["endpoints"] == {
+        "text-search/batch": {"calls": 2, "latency_ms": 50.0}
+    }
+
+
+@pytest.mark.asyncio
+async def test_recorded_row_carries_survivor_depths(
+    request_fixture: WorkflowRunRequest, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rows: list[dict[str, Any]] = []
+
+    class _Recorder:
+        async def submit(self, row: dict[str, Any]) -> None:
+            rows.append(json.loads(json.dumps(row)))
+
+    monkeypatch.setattr(orchestrator_module, "get_recorder", lambda: _Recorder())
+    orch = Orchestrator(request_fixture, [(_survivor_depth_step, "")])
+    [_ async for _ in orch.execute()]
+
+    [row] = rows
+    assert [e["depths"] for e in row["survivor_depth"]] == [[7, 12]]
+    model = AdaptiveDepth.from_entries(row["survivor_depth"], min_samples=2)
+    assert model.depth("semantic", "query", "idx", ceiling=50) == 17
@@ -0,0 +1,182 @@
+"""Tests for progressive retrieval with incremental fusion."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from lex_db_api.models.text_type import TextType
+
+from lex_llm.api.connectors.lex_db_chunk_batch import ChunkBatch
+from lex_llm.api.connectors.lex_db_connector import LexChunk
+from lex_llm.api.event_emitter import EventEmitter
+from lex_llm.tools.progressive_retrieval import (
+    PipelinedResult,
+    ProgressiveResult,
+    pipelined_expansion_retrieval,
+    progressive_hybrid_retrieval,
+)
+from lex_llm.utils.rrf import reciprocal_rank_fusion
+
+
+def _batch(*article_ids: int) -> ChunkBatch:
+    return ChunkBatch.from_chunks(
+        LexChunk(article_id=a, chunk_seq=0, chunk_text=f"text {a}") for a in article_ids
+    )
+
+
+class _FakeConnector:
+    """Yields canned shards in a fixed (out-of-order) arrival sequence."""
+
+    def __init__(self, arrivals: list[tuple[str, int, list[ChunkBatch]]]) -> None:
+        self.arrivals = arrivals
+        self.consumed = 0
+
+    async def progressive_hybrid_search(self, **_: Any) -> Any:
+        for arrival in self.arrivals:
+            self.consumed += 1
+            yield arrival
+
+
+async def _run(
+    connector: _FakeConnector, n_semantic: int, n_keyword: int, **kwargs: Any
+) -> tuple[list[dict[str, Any]], ProgressiveResult]:
+    events: list[dict[str, Any]] = []
+    result: ProgressiveResult | None = None
+    async for item in progressive_hybrid_retrieval(
+        connector,  # type: ignore[arg-type]
+        EventEmitter(conversation_id="c"),
+        {},
+        "advanced_retrieval",
+        [(f"q{i}", TextType.PASSAGE) for i in range(n_semantic)],
+        [f"k{i}" for i in range(n_keyword)],
+        top_k_semantic=10,
+        top_k_fts=10,
+        index_name="idx",
+        **kwargs,
+    ):
+        if isinstance(item, ProgressiveResult):
+            result = item
+        else:
+            events.append(json.loads(item))
+    assert result is not None
+    return events, result
+
+
+@pytest.mark.asyncio
+async def test_progressive_fusion_matches_batch_rrf_in_any_arrival_order() -> None:
+    semantic = [_batch(1, 2, 3), _batch(3, 4)]
+    fulltext = [_batch(5, 1, 2)]
+    connector = _FakeConnector(
+        [
+            ("fulltext", 0, [fulltext[0]]),
+            ("semantic", 1, [semantic[1]]),
+            ("semantic", 0, [semantic[0]]),
+        ]
+    )
+
+    events, result = await _run(connector, 2, 1, top_k=4, rrf_k=60)
+
+    expected = reciprocal_rank_fusion(
+        *(b.to_chunks() for b in semantic + fulltext), k=60
+    )[:4]
+    assert result.fused.to_chunks() == expected
+    assert (result.lists_received, result.stopped_early) == (3, False)
+    partial = [e["data"]["input"] for e in events[:-1]]
+    assert [p["lists_received"] for p in partial] == [1, 2]
+    assert all(p["partial"] for p in partial)
+    assert events[-1]["data"]["input"]["lists_total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_progressive_retrieval_stops_once_top_k_is_settled() -> None:
+    # With rrf_k=0 three lists agreeing on article 1 (score 3 vs 1.5) leave
+    # the last list (worth at most 1) unable to change the top-1
+    connector = _FakeConnector(
+        [("fulltext", i, [_batch(1, 2)]) for i in range(3)]
+        + [("fulltext", 3, [_batch(2, 1)])]
+    )
+
+    _, result = await _run(connector, 0, 4, top_k=1, rrf_k=0)
+
+    assert result.stopped_early
+    assert connector.consumed == 3
+    assert result.fused.to_chunks()[0].article_id == 1
+
+
+@pytest.mark.asyncio
+async def test_progressive_retrieval_early_stop_fraction() -> None:
+    connector = _FakeConnector([("fulltext", i, [_batch(1, 2)]) for i in range(4)])
+
+    _, result = await _run(connector, 0, 4, top_k=2, rrf_k=60, early_stop_fraction=0.5)
+
+    # Half the lists are in after two arrivals and the top-2 did not change
+    assert result.stopped_early
+    assert result.lists_received == 2
+
+
+class _SearchConnector:
+    """Answers each single-query search with a canned list for that query."""
+
+    def __init__(self, lists: dict[str, ChunkBatch]) -> None:
+        self.lists = lists
+        self.searched: list[tuple[str, int]] = []
+        self.chunks_streamed = 0
+
+    async def batch_vector_search_columnar(
+        self, queries: list[tuple[str, TextType]], **_: Any
+    ) -> list[ChunkBatch]:
+        self.searched.append((queries[0][0], self.chunks_streamed))
+        return [self.lists[queries[0][0]]]
+
+    async def batch_fulltext_search_columnar(
+        self, queries: list[str], **_: Any
+    ) -> list[ChunkBatch]:
+        self.searched.append((queries[0], self.chunks_streamed))
+        return [self.lists[queries[0]]]
+
+
+@pytest.mark.asyncio
+async def test_pipelined_expansion_searches_each_element_as_it_closes() -> None:
+    lists = {"p0": _batch(1, 2, 3), "p1": _batch(3, 4), "k0": _batch(5, 1, 2)}
+    connector = _SearchConnector(lists)
+    reply = '{"passages": ["p0", "p1"], "keyword_queries": ["k0"]}'
+
+    async def _expansion() -> Any:
+        for i in range(0, len(reply), 4):
+            await asyncio.sleep(0)
+            connector.chunks_streamed += 1
+            yield reply[i : i + 4]
+
+    result: PipelinedResult | None = None
+    async for item in pipelined_expansion_retrieval(
+        connector,  # type: ignore[arg-type]
+        EventEmitter(conversation_id="c"),
+        {},
+        "advanced_retrieval",
+        _expansion(),
+        semantic_field="passages",
+        keyword_field="keyword_queries",
+        text_type=TextType.PASSAGE,
+        fallback_semantic=["interpretation"],
+        fallback_keywords=["fallback"],
+        top_k=4,
+        top_k_semantic=10,
+        top_k_fts=10,
+        rrf_k=60,
+        index_name="idx",
+    ):
+        if isinstance(item, PipelinedResult):
+            result = item
+
+    assert result is not None
+    # The passages went out while the rest of the reply was still streaming
+    assert [query for query, _ in connector.searched] == ["p0", "p1", "k0"]
+    assert all(seen < connector.chunks_streamed for _, seen in connector.searched[:2])
+    assert result.dispatched_while_generating == 3
+    expected = reciprocal_rank_fusion(
+        *(lists[q].to_chunks() for q in ["p0", "p1", "k0"]), k=60
+    )[:4]
+    assert result.fused.to_chunks() == expected
+    assert (result.semantic_queries, result.keyword_queries) == (["p0", "p1"], ["k0"])
@@ -0,0 +1,416 @@
+"""Tests for the retrieval cascade step."""
+
+import asyncio
+import importlib
+import json
+from typing import Any
+
+import pytest
+
+from lex_llm.api.connectors.lex_db_chunk_batch import ChunkBatch
+from lex_llm.api.connectors.lex_db_connector import LexChunk
+from lex_llm.api.event_emitter import EventEmitter
+from lex_llm.api.observability.step_telemetry import set_step_telemetry
+from lex_llm.tools.federated_retrieval import FederatedResult
+from lex_llm.tools.llm_json import StreamingJSONObject
+from lex_llm.utils.adaptive_depth import AdaptiveDepth
+from lex_llm.utils.latency_budget import LatencyBudget, StageCostModel
+from lex_llm.utils.relevance_gate import RelevanceGate, calibrate_accept_at
+from lex_llm.utils.retrieval_helpers import FusedResult
+from lex_llm.utils.rrf import RRFAccumulator
+
+# The package re-exports the step factory under the module's name
+cascade_module = importlib.import_module("lex_llm.tools.retrieval_cascade")
+
+
+def _batch(*article_ids: int) -> ChunkBatch:
+    return ChunkBatch.from_chunks(
+        LexChunk(article_id=a, chunk_seq=0, chunk_text=f"text {a}", title=f"A{a}")
+        for a in article_ids
+    )
+
+
+class _ScriptedLLM:
+    """Answers each prompt kind with a canned JSON reply after ``delay``."""
+
+    def __init__(self, relevant: list[bool], delay: float = 0.0) -> None:
+        self.relevant = list(relevant)
+        self.delay = delay
+        self.calls: list[str] = []
+        # Streams the consumer closed before the reply was complete
+        self.streams_cut = 0
+
+    async def generate(self, messages: list[Any]) -> str:
+        prompt = "\n".join(m.content for m in messages)
+        if "suggested_query_refinement" in prompt:
+            kind = "relevance"
+            reply: dict[str, Any] = {
+                "is_relevant": self.relevant.pop(0),
+                "reason": "",
+                "suggested_query_refinement": "",
+            }
+        elif "passages" in prompt and "semantic_queries" in prompt:
+            kind = "wide"
+            reply = {
+                "semantic_queries": ["s"],
+                "keyword_queries": ["k", "q"],
+                "passages": ["p"],
+            }
+        elif "passages" in prompt:
+            kind = "advanced"
+            reply = {"passages": ["p"], "keyword_queries": ["k"]}
+        else:
+            kind = "intermediate"
+            reply = {"semantic_queries": ["s"], "keyword_queries": ["k"]}
+        self.calls.append(kind)
+        await asyncio.sleep(self.delay)
+        return json.dumps(reply)
+
+    async def generate_stream(self, messages: list[Any]) -> Any:
+        """Streams the reply a few characters at a time."""
+        text = await self.generate(messages)
+        pieces = [text[i : i + 8] for i in range(0, len(text), 8)]
+        for i, piece in enumerate(pieces):
+            try:
+                yield piece
+            except GeneratorExit:
+                self.streams_cut += i + 1 < len(pieces)
+                raise
+
+
+@pytest.fixture
+def searches(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """Replace LexDB with canned results; records each search's keywords."""
+    calls: list[list[str]] = []
+
+    async def _fake_retrieval(
+        connector: Any, semantic_queries: Any, keyword_queries: list[str], **_: Any
+    ) -> FederatedResult:
+        calls.append(keyword_queries)
+        fused = _batch(1, 2, 3)
+        return FederatedResult([fused], [fused], fused, ["idx"], [fused], [1.0])
+
+    monkeypatch.setattr(cascade_module, "LexDBConnector", lambda: object())
+    monkeypatch.setattr(cascade_module, "federated_hybrid_retrieval", _fake_retrieval)
+    return calls
+
+
+async def _run_cascade(llm: _ScriptedLLM, **kwargs: Any) -> dict[str, Any]:
+    step, _ = cascade_module.retrieval_cascade(llm, index_name="idx", **kwargs)
+    context: dict[str, Any] = {"user_input": "q", "keywords": ["q"]}
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    try:
+        async for _ in step(context, EventEmitter(conversation_id="c")):
+            pass
+    finally:
+        set_step_telemetry(None)
+    context["_telemetry"] = telemetry
+    return context
+
+
+@pytest.mark.asyncio
+async def test_speculative_expansion_is_cancelled_when_stage1_is_relevant(
+    searches: list[list[str]],
+) -> None:
+    llm = _ScriptedLLM(relevant=[True], delay=0.01)
+
+    context = await _run_cascade(llm, speculative=True, speculative_search=True)
+
+    speculation = context["_telemetry"]["speculation"]
+    assert context["insufficient_context"] is False
+    assert (speculation["launched"], speculation["cancelled"]) == (1, 1)
+    assert speculation["wasted_ratio"] == 1.0
+    # Only the stage-1 search ran; the speculative one never got that far
+    assert searches == [["q"]]
+
+
+@pytest.mark.asyncio
+async def test_speculative_expansion_is_used_when_stage1_misses(
+    searches: list[list[str]],
+) -> None:
+    llm = _ScriptedLLM(relevant=[False, True])
+
+    context = await _run_cascade(llm, speculative=True, speculative_search=True)
+
+    speculation = context["_telemetry"]["speculation"]
+    assert (speculation["used"], speculation["wasted_ms"]) == (1, 0.0)
+    assert sorted(llm.calls) == ["intermediate", "relevance", "relevance"]
+    # The stage-2 search ran once, ahead of its verdict
+    assert searches == [["q"], ["k"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("event", ["tool_call", "tool_result"])
+async def test_speculation_is_cancelled_when_the_step_is_closed_early(
+    searches: list[list[str]], event: str
+) -> None:
+    llm = _ScriptedLLM(relevant=[False], delay=0.01)
+    budget = LatencyBudget(budget_ms=60_000.0, costs=StageCostModel())
+    step, _ = cascade_module.retrieval_cascade(
+        llm, index_name="idx", speculative=True, latency_budget=budget
+    )
+    context: dict[str, Any] = {"user_input": "q", "keywords": ["q"]}
+    telemetry: dict[str, Any] = {}
+    set_step_telemetry(telemetry)
+    try:
+        events = step(context, EventEmitter(conversation_id="c"))
+        # Stop at the stage-2 budget check, before the speculation is claimed
+        async for raw in events:
+            parsed = json.loads(raw) if raw else {}
+            if (parsed.get("event"), parsed.get("data", {}).get("name")) == (
+                event,
+                "latency_budget",
+            ):
+                break
+        await events.aclose()
+    finally:
+        set_step_telemetry(None)
+
+    speculation = telemetry["speculation"]
+    assert (speculation["launched"], speculation["cancelled"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_relevance_gate_accepts_agreeing_results_without_the_llm(
+    searches: list[list[str]],
+) -> None:
+    llm = _ScriptedLLM(relevant=[])
+    gate = RelevanceGate(accept_at=0.9, weights={"overlap": 1.0})
+
+    context = await _run_cascade(llm, relevance_gate=gate)
+
+    assert llm.calls == []
+    assert context["insufficient_context"] is False
+    [entry] = context["_telemetry"]["relevance_gate"]
+    assert (entry["verdict"], entry["llm_verdict"]) == ("accept", None)
+
+
+@pytest.mark.asyncio
+async def test_relevance_gate_in_shadow_mode_logs_the_llm_verdict(
+    searches: list[list[str]],
+) -> None:
+    llm = _ScriptedLLM(relevant=[False, False, False])
+    gate = RelevanceGate(accept_at=0.9, weights={"overlap": 1.0}, shadow=True)
+
+    context = await _run_cascade(llm, relevance_gate=gate)
+
+    entries = context["_telemetry"]["relevance_gate"]
+    assert [e["llm_verdict"] for e in entries] == [False, False, False]
+    assert all(e["verdict"] == "accept" for e in entries)
+    assert context["insufficient_context"] is True
+
+
+def test_relevance_gate_top_score_uses_the_list_weights() -> None:
+    semantic, fulltext = [_batch(1, 2)], [_batch(2, 1)]
+    accumulator = RRFAccumulator(60)
+    accumulator.extend([*semantic, *fulltext], [2.0, 1.0])
+    fused = FusedResult(accumulator.top_k(2), 60)
+    gate = RelevanceGate()
+
+    weighted = gate.signals(fused, semantic, fulltext, set(), [2.0, 1.0])
+    unweighted = gate.signals(fused, semantic, fulltext, set())
+
+    # Article 1 leads the weight-2 list and is second in the other, out of
+    # the 3 / (k + 1) for leading both
+    assert weighted.top_score == pytest.approx((2 + 61 / 62) / 3)
+    assert unweighted.top_score == 1.0
+
+
+def test_calibrate_accept_at_meets_precision() -> None:
+    entries = [{"confidence": c / 10, "llm_verdict": c >= 6} for c in range(10)] + [
+        {"confidence": 0.9, "llm_verdict": None}
+    ]
+
+    assert calibrate_accept_at(entries, precision=1.0, min_support=3) == 0.6
+    assert calibrate_accept_at(entries, precision=0.8, min_support=3) == 0.5
+    assert calibrate_accept_at(entries, precision=1.0, min_support=5) is None
+
+
+def test_streaming_json_object_yields_members_as_they_close() -> None:
+    reader = StreamingJSONObject()
+    text = '```json\n{"is_relevant": true, "reason": "a, \\"b\\" {c}", "n": [1, 2]}'
+    seen = []
+    for char in text:
+        reader.feed(char)
+        seen.append(dict(reader.fields))
+
+    assert {"is_relevant": True} in seen
+    assert reader.complete
+    assert reader.fields == {"is_relevant": True, "reason": 'a, "b" {c}', "n": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_relevance_evaluation_stops_streaming_at_a_positive_verdict(
+    searches: list[list[str]],
+) -> None:
+    llm = _ScriptedLLM(relevant=[True])
+
+    context = await _run_cascade(llm)
+
+    assert context["insufficient_context"] is False
+    assert llm.streams_cut == 1
+    assert context["_telemetry"]["llm_early_stop"] == {"calls": 1, "stopped": 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("on_exhausted", "insufficient"),
+    [("best_so_far", False), ("insufficient_context", True)],
+)
+async def test_latency_budget_skips_stages_it_cannot_afford(
+    searches: list[list[str]], on_exhausted: str, insufficient: bool
+) -> None:
+    llm = _ScriptedLLM(relevant=[False])
+    budget = LatencyBudget(
+        budget_ms=1000.0, on_exhausted=on_exhausted, costs=StageCostModel()
+    )
+
+    context = await _run_cascade(llm, latency_budget=budget)
+
+    # The default estimate for stage 2 alone exceeds the whole budget
+    assert llm.calls == ["relevance"]
+    assert context["insufficient_context"] is insufficient
+    assert [c.article_id for c in context["retrieved_chunks"]] == [1, 2, 3]
+    [decision] = context["_telemetry"]["latency_budget"]
+    assert (decision["stage"], decision["proceed"]) == ("intermediate_retrieval", False)
+    assert decision["estimate_ms"] > decision["remaining_ms"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("speculative_search", [False, True])
+async def test_speculative_expansion_records_its_full_cost(
+    searches: list[list[str]],
+    monkeypatch: pytest.MonkeyPatch,
+    speculative_search: bool,
+) -> None:
+    async def _slow_retrieval(*_: Any, **__: Any) -> FederatedResult:
+        await asyncio.sleep(0.03)
+        fused = _batch(1, 2, 3)
+        return FederatedResult([fused], [fused], fused, ["idx"], [fused], [1.0])
+
+    monkeypatch.setattr(cascade_module, "federated_hybrid_retrieval", _slow_retrieval)
+    llm = _ScriptedLLM(relevant=[False, True], delay=0.05)
+    costs = StageCostModel(min_samples=1)
+    budget = LatencyBudget(budget_ms=60_000.0, costs=costs)
+
+    await _run_cascade(
+        llm,
+        speculative=True,
+        speculative_search=speculative_search,
+        latency_budget=budget,
+    )
+
+    # Stage 1's relevance check hid the expansion's latency, not its cost;
+    # a prefetched search is not re-timed as a free one
+    estimate = costs.estimate("intermediate_retrieval", ["expansion", "search"], 0.0)
+    assert estimate["expansion"] >= 40.0
+    assert estimate["search"] >= 25.0
+
+
+@pytest.mark.asyncio
+async def test_relevance_cost_counts_only_llm_checks(
+    searches: list[list[str]],
+) -> None:
+    llm = _ScriptedLLM(relevant=[])
+    costs = StageCostModel(min_samples=1)
+    budget = LatencyBudget(budget_ms=60_000.0, costs=costs)
+    gate = RelevanceGate(accept_at=0.9, weights={"overlap": 1.0})
+
+    await _run_cascade(llm, relevance_gate=gate, latency_budget=budget)
+
+    # The gate decided without the LLM, so there is no relevance sample
+    assert costs.estimate("simple_retrieval", ["relevance"], 0.0) == {
+        "relevance": costs.priors["relevance"]
+    }
+
+
+def test_stage_cost_model_estimates_from_recent_costs() -> None:
+    costs = StageCostModel(min_samples=3, priors={"search": 500.0})
+    for ms in (100.0, 200.0):
+        costs.record("s", "search", ms)
+    assert costs.estimate("s", ["search", "relevance"], 90.0) == {
+        "search": 500.0,
+        "relevance": 0.0,
+    }
+
+    costs.record("s", "search", 300.0)
+    assert costs.estimate("s", ["search"], 50.0) == {"search": 200.0}
+
+
+@pytest.mark.asyncio
+async def test_wide_mode_makes_one_search_round_and_one_decision(
+    searches: list[list[str]],
+) -> None:
+    llm = _ScriptedLLM(relevant=[False])
+
+    context = await _run_cascade(llm, wide=True)
+
+    assert llm.calls == ["wide", "relevance"]
+    # Raw and generated keyword queries, deduplicated, in a single search
+    assert searches == [["q", "k"]]
+    assert context["insufficient_context"] is True
+    assert [c.article_id for c in context["retrieved_chunks"]] == [1, 2, 3]
+
+
+def test_wide_mode_rejects_a_latency_budget() -> None:
+    with pytest.raises(ValueError, match="budget"):
+        cascade_module.retrieval_cascade(
+            _ScriptedLLM(relevant=[]),
+            index_name="idx",
+            wide=True,
+            latency_budget=LatencyBudget(budget_ms=1000.0),
+        )
+
+
+def test_adaptive_depth_covers_recent_survivor_depths() -> None:
+    entries = [
+        {"side": "fulltext", "query_type": "keyword", "index": "idx", "depths": d}
+        for d in ([1, 2, 3, 4, 5], list(range(6, 21)))
+    ]
+    depth = AdaptiveDepth.from_entries(entries, margin=5, min_depth=10)
+
+    # The 95th percentile of depths 1..20 is 19
+    assert depth.depth("fulltext", "keyword", "idx", ceiling=50) == 24
+    assert depth.depth("fulltext", "keyword", "idx", ceiling=20) == 20
+    assert depth.depth("fulltext", "keyword", "other", ceiling=50) == 50
+
+
+@pytest.mark.asyncio
+async def test_adaptive_depth_widens_a_thin_search(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    requested: list[tuple[int, int]] = []
+
+    async def _fake_retrieval(
+        connector: Any,
+        semantic_queries: Any,
+        keyword_queries: list[str],
+        *,
+        top_k_semantic: int,
+        top_k_fts: int,
+        **_: Any,
+    ) -> FederatedResult:
+        requested.append((top_k_semantic, top_k_fts))
+        semantic = _batch(*range(1, top_k_semantic + 1))
+        fulltext = _batch(*range(1, top_k_fts + 1))
+        # The last row of each truncated list makes the top k
+        fused = _batch(top_k_semantic, top_k_fts)
+        return FederatedResult(
+            [semantic], [fulltext], fused, ["idx"], [semantic, fulltext], [1.0, 1.0]
+        )
+
+    monkeypatch.setattr(cascade_module, "LexDBConnector", lambda: object())
+    monkeypatch.setattr(cascade_module, "federated_hybrid_retrieval", _fake_retrieval)
+    entries = [
+        {"side": side, "query_type": query_type, "index": "idx", "depths": [3]}
+        for side, query_type in [("semantic", "query"), ("fulltext", "keyword")]
+    ]
+    # Learned depth 3 is raised to min_depth
+    depth = AdaptiveDepth.from_entries(entries, margin=0, min_depth=10, min_samples=1)
+
+    context = await _run_cascade(_ScriptedLLM(relevant=[True]), adaptive_depth=depth)
+
+    assert requested == [(10, 10), (50, 50)]
+    assert context["_telemetry"]["adaptive_depth"] == {"searches": 1, "widened": 1}
+    assert [e["requested"] for e in context["_telemetry"]["survivor_depth"]] == [50, 50]